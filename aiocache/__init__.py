@@ -1,12 +1,13 @@
 from .log import logger
 from .backends.memory import SimpleMemoryCache
+from .backends.tiered import TieredCache
 from .factory import caches
 from .settings import settings
 from .decorators import cached, cached_stampede, multi_cached
 from ._version import __version__
 
 
-__cache_types = [SimpleMemoryCache]
+__cache_types = [SimpleMemoryCache, TieredCache]
 
 try:
     import aioredis
@@ -0,0 +1,109 @@
+import asyncio
+import weakref
+
+
+_current_task = getattr(asyncio, "current_task", None) or asyncio.Task.current_task
+
+
+def _uncancel(task):
+    uncancel = getattr(task, "uncancel", None)
+    if uncancel is not None:
+        uncancel()
+
+
+class _Deadline:
+    """
+    Cancellation deadline for the current task. Instead of wrapping the coroutine in a new
+    task like ``asyncio.wait_for`` does, it schedules a single ``loop.call_at`` that cancels
+    the running task once the deadline is reached and converts that cancellation into an
+    :class:`asyncio.TimeoutError`.
+
+    Deadlines nest: a deadline entered while another one is active for the same task is
+    capped by the enclosing one, so nested calls only get the remaining budget and no extra
+    timer is scheduled when the enclosing deadline is tighter.
+
+    The same instance can be entered multiple times. Each exit discounts the time spent
+    inside from ``timeout`` so consecutive blocks share a single budget::
+
+        budget = _Deadline(5)
+        async with budget:
+            await cache.get("key")
+        ...
+        async with budget:  # only what is left from the 5 seconds
+            await cache.set("key", "value")
+
+    A timeout of 0 or None doesn't add any limit but still honours the enclosing deadline.
+    """
+
+    _ACTIVE = weakref.WeakKeyDictionary()
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.when = None
+        self._unbounded = timeout == 0 or timeout is None
+        self._expired = False
+        self._task = None
+        self._loop = None
+        self._handle = None
+        self._parent = None
+        self._start = None
+
+    @property
+    def expired(self):
+        if self._expired:
+            return True
+        return self._parent is not None and self._parent.expired
+
+    async def __aenter__(self):
+        self._loop = asyncio.get_event_loop()
+        self._task = _current_task(loop=self._loop)
+        if self._task is None:
+            raise RuntimeError("Deadline can only be used inside a task")
+
+        self._expired = False
+        self._parent = _Deadline._ACTIVE.get(self._task)
+        self._start = self._loop.time()
+        self.when = None if self._unbounded else self._start + max(self.timeout, 0)
+        parent_when = self._parent.when if self._parent is not None else None
+
+        if parent_when is not None and (self.when is None or parent_when <= self.when):
+            self.when = parent_when
+        elif self.when is not None:
+            self._handle = self._loop.call_at(self.when, self._expire)
+
+        _Deadline._ACTIVE[self._task] = self
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        if self._parent is not None:
+            _Deadline._ACTIVE[self._task] = self._parent
+        else:
+            _Deadline._ACTIVE.pop(self._task, None)
+
+        task = self._task
+        if not self._unbounded:
+            self.timeout -= self._loop.time() - self._start
+        self._task = None
+
+        if exc_type is asyncio.CancelledError and self.expired:
+            _uncancel(task)
+            raise asyncio.TimeoutError from None
+
+        if self._expired:
+            # The deadline fired right when the block was finishing so the cancellation
+            # is still pending, consume it here instead of letting it leak to the caller.
+            try:
+                await asyncio.sleep(0)
+            except asyncio.CancelledError:
+                _uncancel(task)
+
+        return False
+
+    def _expire(self):
+        self._handle = None
+        self._expired = True
+        self._task.cancel()
@@ -0,0 +1,65 @@
+MARK = "\x00ac"
+_SEP = "\x00"
+_BSEP = _SEP.encode()
+
+
+def wrap(payload, mark=MARK, **meta):
+    """
+    Prepends a small header with metadata to a serialized value::
+
+        \\x00ac:soft=1500000000.25\\x00<serialized value>
+
+    The type of the serialized value (str or bytes) is kept so it works with any serializer
+    and backend. Other payloads, i.e. objects passed through by ``NullSerializer``, are wrapped
+    in a dict so they keep working with backends that serialize them again::
+
+        {"\\x00ac": {"soft": 1500000000.25}, "payload": <value>}
+
+    :param payload: str or bytes returned by the serializer, or any other object
+    :param mark: str identifying the envelope. Caches wrapping values that other caches store
+        use a different one so the inner caches pass their envelope through
+    :param meta: float fields to store in the envelope
+    :returns: same type as payload if it's str or bytes, dict otherwise
+    """
+    if not isinstance(payload, (str, bytes)):
+        return {mark: {name: float(value) for name, value in meta.items()}, "payload": payload}
+    header = "{}:{}{}".format(
+        mark, ",".join("{}={!r}".format(name, float(value)) for name, value in meta.items()),
+        _SEP)
+    if isinstance(payload, bytes):
+        return header.encode() + payload
+    return header + payload
+
+
+def unwrap(raw, mark=MARK):
+    """
+    :param raw: value as returned by the backend
+    :param mark: str identifying the envelope, the same passed to :func:`wrap`
+    :returns: tuple with the payload and a dict with the envelope fields. The dict is empty
+        if the value has no envelope.
+    """
+    if isinstance(raw, str):
+        prefix, sep = mark + ":", _SEP
+    elif isinstance(raw, bytes):
+        prefix, sep = (mark + ":").encode(), _BSEP
+    elif isinstance(raw, dict) and mark in raw:
+        return raw["payload"], raw[mark]
+    else:
+        return raw, {}
+
+    if not raw.startswith(prefix):
+        return raw, {}
+
+    end = raw.find(sep, len(prefix))
+    if end == -1:
+        return raw, {}
+
+    header = raw[len(prefix):end]
+    if isinstance(header, bytes):
+        header = header.decode()
+    meta = {}
+    for field in header.split(","):
+        if field:
+            name, _, value = field.partition("=")
+            meta[name] = float(value)
+    return raw[end + len(sep):], meta
@@ -0,0 +1,116 @@
+import asyncio
+
+from aiocache.log import logger
+from aiocache._deadline import _Deadline
+
+
+class _WriteBuffer:
+    """
+    Buffers the ``set``, ``delete`` and ``increment`` calls of a cache, merging the ones for
+    the same key: the last ``set`` or ``delete`` wins and increments are summed on top of it.
+
+    The buffer is flushed with a single ``_pipeline`` call of the cache ``interval`` seconds
+    after the first write is buffered. Once it holds ``max_size`` keys, writes for new keys
+    flush it themselves before being buffered, so callers are slowed down instead of the
+    buffer growing without bounds. Flushes run one at a time and in order, each one covered
+    by the cache timeout.
+    """
+
+    def __init__(self, cache, interval, max_size):
+        self._cache = cache
+        self.interval = interval
+        self.max_size = max_size
+        self._writes = {}
+        self._flushing = {}
+        self._lock = asyncio.Lock()
+        self._flusher = None
+
+    def __contains__(self, key):
+        return key in self._writes or key in self._flushing
+
+    def __len__(self):
+        return len(self._writes)
+
+    async def set(self, key, value, ttl):
+        await self._reserve(key)
+        self._put(key, ("set", value, ttl), 0)
+
+    async def delete(self, key):
+        await self._reserve(key)
+        self._put(key, ("delete",), 0)
+
+    async def increment(self, key, delta):
+        await self._reserve(key)
+        base, pending = self._writes.get(key, (None, 0))
+        self._put(key, base, pending + delta)
+
+    async def _reserve(self, key):
+        # Other writes may fill the buffer again while flushing, check until there's room
+        while key not in self._writes and len(self._writes) >= self.max_size:
+            await self.flush()
+
+    def _put(self, key, base, delta):
+        self._writes[key] = (base, delta)
+        if self._flusher is None:
+            self._flusher = asyncio.ensure_future(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.interval)
+        self._flusher = None
+        await self.flush()
+
+    async def flush(self):
+        """
+        Sends the buffered writes to the backend. Errors are logged, the writes that failed
+        are lost.
+        """
+        async with self._lock:
+            writes, self._writes = self._writes, {}
+            if not writes:
+                return
+
+            self._flushing = writes
+            ops = self._ops(writes)
+            try:
+                async with _Deadline(self._cache.timeout):
+                    results = await self._cache._pipeline(ops)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Couldn't flush %d buffered writes", len(writes))
+                return
+            finally:
+                self._flushing = {}
+
+        for (cmd, args), result in zip(ops, results):
+            if isinstance(result, Exception):
+                logger.error("Couldn't flush buffered %s: %s", cmd, result)
+
+    @staticmethod
+    def _ops(writes):
+        pairs, ttl_pairs, ttls, deletes, increments = [], [], [], [], []
+        for key, (base, delta) in writes.items():
+            if base is not None and base[0] == "delete":
+                deletes.append(("delete", (key,)))
+            elif base is not None:
+                _, value, ttl = base
+                if ttl:
+                    ttl_pairs.append((key, value))
+                    ttls.append(ttl)
+                else:
+                    pairs.append((key, value))
+            if delta:
+                increments.append(("increment", (key, delta)))
+
+        ops = []
+        if pairs:
+            ops.append(("multi_set", (pairs, None)))
+        if ttl_pairs:
+            ops.append(("multi_set", (ttl_pairs, ttls)))
+        return ops + deletes + increments
+
+    async def close(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush()
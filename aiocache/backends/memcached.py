@@ -1,7 +1,57 @@
 import asyncio
 import aiomcache
 
-from aiocache.base import BaseCache
+from aiocache.base import BaseCache, _per_key_ttls
+
+
+_NOT_FOUND = object()
+
+
+def _exptime(ttl):
+    ttl = ttl or 0
+    if not isinstance(ttl, int):
+        raise TypeError("memcached doesn't support float ttl")
+    return str(ttl).encode()
+
+
+def _storage_command(command, key, value, ttl):
+    value = str.encode(value) if isinstance(value, str) else value
+    header = b" ".join([command, key, b"0", _exptime(ttl), str(len(value)).encode()])
+    return header + b"\r\n" + value + b"\r\n"
+
+
+async def _read_line(stream):
+    line = await stream.readline()
+    if not line.endswith(b"\r\n"):
+        raise aiomcache.exceptions.ClientException("connection closed", line)
+    line = line[:-2]
+    if line == b"ERROR" or line.startswith(b"SERVER_ERROR"):
+        raise aiomcache.exceptions.ClientException("pipeline command failed", line)
+    return line
+
+
+async def _read_ttl(stream):
+    line = await _read_line(stream)
+    if line == b"EN":
+        return None
+    for flag in line.split()[1:]:
+        if flag.startswith(b"t"):
+            ttl = int(flag[1:])
+            return 0 if ttl == -1 else ttl
+    raise aiomcache.exceptions.ClientException("ttl failed", line)
+
+
+async def _read_values(stream, encoding):
+    values = {}
+    line = await _read_line(stream)
+    while line != b"END":
+        terms = line.split()
+        if terms[0] != b"VALUE":
+            raise aiomcache.exceptions.ClientException("get failed", line)
+        value = (await stream.readexactly(int(terms[3]) + 2))[:-2]
+        values[terms[1]] = value if encoding is None else value.decode(encoding)
+        line = await _read_line(stream)
+    return values
 
 
 class MemcachedBackend:
@@ -32,6 +82,14 @@ class MemcachedBackend:
                 values.append(value.decode(encoding))
         return values
 
+    async def _get_touch(self, key, ttl, encoding="utf-8", _conn=None):
+        return await self._run_pipelined("get_touch", key, ttl, encoding)
+
+    async def _multi_get_touch(self, keys, ttl, encoding="utf-8", _conn=None):
+        if not keys:
+            return []
+        return await self._run_pipelined("multi_get_touch", keys, ttl, encoding)
+
     async def _set(self, key, value, ttl=0, _conn=None):
         value = str.encode(value) if isinstance(value, str) else value
         try:
@@ -41,9 +99,9 @@ class MemcachedBackend:
 
     async def _multi_set(self, pairs, ttl=0, _conn=None):
         tasks = []
-        for key, value in pairs:
+        for (key, value), key_ttl in zip(pairs, _per_key_ttls(ttl)):
             value = str.encode(value) if isinstance(value, str) else value
-            tasks.append(self.client.set(key, value, exptime=ttl or 0))
+            tasks.append(self.client.set(key, value, exptime=key_ttl or 0))
 
         try:
             await asyncio.gather(*tasks)
@@ -85,6 +143,12 @@ class MemcachedBackend:
     async def _expire(self, key, ttl, _conn=None):
         return await self.client.touch(key, ttl)
 
+    async def _ttl(self, key, _conn=None):
+        return await self._run_pipelined("ttl", key)
+
+    async def _multi_ttl(self, keys, _conn=None):
+        return await self._run_pipelined("multi_ttl", keys)
+
     async def _delete(self, key, _conn=None):
         return 1 if await self.client.delete(key) else 0
 
@@ -102,6 +166,140 @@ class MemcachedBackend:
                 return value.decode(encoding)
         return value
 
+    async def _pipeline(self, ops, _conn=None):
+        commands, readers, results = [], [], []
+        for cmd, args in ops:
+            try:
+                command, reader = getattr(self, "_pipe_" + cmd)(*args)
+            except Exception as e:
+                results.append(e)
+                readers.append(None)
+            else:
+                results.append(None)
+                commands.append(command)
+                readers.append(reader)
+
+        if commands:
+            conn = await self.client._pool.acquire()
+            try:
+                conn.writer.write(b"".join(commands))
+                await conn.writer.drain()
+                for i, reader in enumerate(readers):
+                    if reader is None:
+                        continue
+                    try:
+                        results[i] = await reader(conn.reader)
+                    except (ValueError, TypeError) as e:
+                        results[i] = e
+            except Exception as e:
+                conn.reader.set_exception(e)
+                raise
+            finally:
+                self.client._pool.release(conn)
+
+        for i, ((_, args), result) in enumerate(zip(ops, results)):
+            if result is _NOT_FOUND:
+                key, delta = args
+                await self._set(key, str(delta).encode())
+                results[i] = delta
+        return results
+
+    async def _run_pipelined(self, cmd, *args):
+        result, = await self._pipeline([(cmd, args)])
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _pipe_get(self, key, encoding="utf-8"):
+        async def reader(stream):
+            return (await _read_values(stream, encoding)).get(key)
+
+        return b"get " + key + b"\r\n", reader
+
+    def _pipe_multi_get(self, keys, encoding="utf-8"):
+        async def reader(stream):
+            values = await _read_values(stream, encoding)
+            return [values.get(key) for key in keys]
+
+        return b"get " + b" ".join(keys) + b"\r\n", reader
+
+    def _pipe_get_touch(self, key, ttl, encoding="utf-8"):
+        async def reader(stream):
+            return (await _read_values(stream, encoding)).get(key)
+
+        return b"gat " + _exptime(ttl) + b" " + key + b"\r\n", reader
+
+    def _pipe_multi_get_touch(self, keys, ttl, encoding="utf-8"):
+        async def reader(stream):
+            values = await _read_values(stream, encoding)
+            return [values.get(key) for key in keys]
+
+        return b"gat " + _exptime(ttl) + b" " + b" ".join(keys) + b"\r\n", reader
+
+    def _pipe_ttl(self, key):
+        return b"mg " + key + b" t\r\n", _read_ttl
+
+    def _pipe_multi_ttl(self, keys):
+        async def reader(stream):
+            return [await _read_ttl(stream) for _ in keys]
+
+        return b"".join(b"mg " + key + b" t\r\n" for key in keys), reader
+
+    def _pipe_set(self, key, value, ttl=0):
+        async def reader(stream):
+            return await _read_line(stream) == b"STORED"
+
+        return _storage_command(b"set", key, value, ttl), reader
+
+    def _pipe_multi_set(self, pairs, ttl=0):
+        async def reader(stream):
+            for _ in pairs:
+                await _read_line(stream)
+            return True
+
+        return b"".join(
+            _storage_command(b"set", key, value, key_ttl)
+            for (key, value), key_ttl in zip(pairs, _per_key_ttls(ttl))), reader
+
+    def _pipe_add(self, key, value, ttl=0):
+        async def reader(stream):
+            if await _read_line(stream) != b"STORED":
+                raise ValueError(
+                    "Key {} already exists, use .set to update the value".format(key))
+            return True
+
+        return _storage_command(b"add", key, value, ttl), reader
+
+    def _pipe_exists(self, key):
+        async def reader(stream):
+            return await _read_line(stream) == b"STORED"
+
+        return _storage_command(b"append", key, b"", 0), reader
+
+    def _pipe_increment(self, key, delta):
+        async def reader(stream):
+            line = await _read_line(stream)
+            if line == b"NOT_FOUND":
+                return _NOT_FOUND
+            if not line.isdigit():
+                raise TypeError("Value is not an integer")
+            return int(line)
+
+        command = b"incr" if delta > 0 else b"decr"
+        return b" ".join([command, key, str(abs(delta)).encode()]) + b"\r\n", reader
+
+    def _pipe_expire(self, key, ttl):
+        async def reader(stream):
+            return await _read_line(stream) == b"TOUCHED"
+
+        return b" ".join([b"touch", key, str(ttl).encode()]) + b"\r\n", reader
+
+    def _pipe_delete(self, key):
+        async def reader(stream):
+            return 1 if await _read_line(stream) == b"DELETED" else 0
+
+        return b"delete " + key + b"\r\n", reader
+
     async def _redlock_release(self, key, _):
         # Not ideal, should check the value coincides first but this would introduce
         # race conditions
@@ -125,16 +323,25 @@ class MemcachedCache(MemcachedBackend, BaseCache):
         the backend. Default is None
     :param timeout: int or float in seconds specifying maximum timeout for the operations to last.
         By default its 5.
+    :param ttl_jitter: float fraction to randomly spread the ttls of the written keys. Default
+        is None.
+    :param circuit_breaker: :class:`aiocache.breaker.CircuitBreaker` to fail fast while the
+        backend is unhealthy. Default is None.
+    :param max_key_length: int max length in bytes of the keys, longer ones are shortened with
+        a digest. Default is 250, the memcached limit.
     :param endpoint: str with the endpoint to connect to. Default is 127.0.0.1.
     :param port: int with the port to connect to. Default is 11211.
     :param pool_size: int size for memcached connections pool. Default is 2.
     """
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+    MAX_KEY_LENGTH = 250
+
+    def __init__(self, max_key_length=MAX_KEY_LENGTH, **kwargs):
+        super().__init__(max_key_length=max_key_length, **kwargs)
 
     def _build_key(self, key, namespace=None):
         ns_key = super()._build_key(key, namespace=namespace).replace(' ', '_')
-        return str.encode(ns_key)
+        # Non ascii chars may take more than one byte
+        return self._normalize_key(str.encode(ns_key))
 
     def __repr__(self):  # pragma: no cover
         return "MemcachedCache ({}:{})".format(self.endpoint, self.port)
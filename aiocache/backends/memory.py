@@ -1,6 +1,6 @@
 import asyncio
 
-from aiocache.base import BaseCache
+from aiocache.base import BaseCache, _per_key_ttls
 
 
 class SimpleMemoryBackend:
@@ -20,16 +20,23 @@ class SimpleMemoryBackend:
     async def _multi_get(self, keys, encoding="utf-8", _conn=None):
         return [SimpleMemoryBackend._cache.get(key) for key in keys]
 
+    async def _get_touch(self, key, ttl, encoding="utf-8", _conn=None):
+        value = SimpleMemoryBackend._cache.get(key)
+        if value is not None:
+            self.__expire(key, ttl)
+        return value
+
+    async def _multi_get_touch(self, keys, ttl, encoding="utf-8", _conn=None):
+        return [await self._get_touch(key, ttl) for key in keys]
+
     async def _set(self, key, value, ttl=None, _conn=None):
         SimpleMemoryBackend._cache[key] = value
-        if ttl:
-            loop = asyncio.get_event_loop()
-            SimpleMemoryBackend._handlers[key] = loop.call_later(ttl, self.__delete, key)
+        self.__expire(key, ttl)
         return True
 
     async def _multi_set(self, pairs, ttl=None, _conn=None):
-        for key, value in pairs:
-            await self._set(key, value, ttl=ttl)
+        for (key, value), key_ttl in zip(pairs, _per_key_ttls(ttl)):
+            await self._set(key, value, ttl=key_ttl)
         return True
 
     async def _add(self, key, value, ttl=None, _conn=None):
@@ -55,16 +62,22 @@ class SimpleMemoryBackend:
 
     async def _expire(self, key, ttl, _conn=None):
         if key in SimpleMemoryBackend._cache:
-            handle = SimpleMemoryBackend._handlers.pop(key, None)
-            if handle:
-                handle.cancel()
-            if ttl:
-                loop = asyncio.get_event_loop()
-                SimpleMemoryBackend._handlers[key] = loop.call_later(ttl, self.__delete, key)
+            self.__expire(key, ttl)
             return True
 
         return False
 
+    async def _ttl(self, key, _conn=None):
+        if key not in SimpleMemoryBackend._cache:
+            return None
+        handle = SimpleMemoryBackend._handlers.get(key)
+        if handle is None:
+            return 0
+        return max(handle.when() - asyncio.get_event_loop().time(), 0)
+
+    async def _multi_ttl(self, keys, _conn=None):
+        return [await self._ttl(key) for key in keys]
+
     async def _delete(self, key, _conn=None):
         return self.__delete(key)
 
@@ -87,9 +100,18 @@ class SimpleMemoryBackend:
             return 1
         return 0
 
+    @classmethod
+    def __expire(cls, key, ttl):
+        handle = cls._handlers.pop(key, None)
+        if handle:
+            handle.cancel()
+        if ttl:
+            loop = asyncio.get_event_loop()
+            cls._handlers[key] = loop.call_later(ttl, cls.__delete, key)
+
     @classmethod
     def __delete(cls, key):
-        if cls._cache.pop(key, None):
+        if cls._cache.pop(key, None) is not None:
             handle = cls._handlers.pop(key, None)
             if handle:
                 handle.cancel()
@@ -112,6 +134,12 @@ class SimpleMemoryCache(SimpleMemoryBackend, BaseCache):
         the backend. Default is None.
     :param timeout: int or float in seconds specifying maximum timeout for the operations to last.
         By default its 5.
+    :param ttl_jitter: float fraction to randomly spread the ttls of the written keys. Default
+        is None.
+    :param circuit_breaker: :class:`aiocache.breaker.CircuitBreaker` to fail fast while the
+        backend is unhealthy. Default is None.
+    :param max_key_length: int max length of the keys, longer ones are shortened with a
+        digest. Default is None.
     """
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -1,10 +1,12 @@
 import asyncio
 import itertools
 import functools
+import collections
 
 import aioredis
 
-from aiocache.base import BaseCache
+from aiocache.base import BaseCache, _per_key_ttls
+from aiocache.log import logger
 
 
 def conn(func):
@@ -18,6 +20,74 @@ def conn(func):
     return wrapper
 
 
+def _expire_command(redis, key, ttl):
+    if isinstance(ttl, float):
+        return redis.pexpire(key, timeout=int(ttl * 1000))
+    return redis.expire(key, timeout=ttl)
+
+
+def _seconds(pttl):
+    if pttl == -2:
+        return None
+    if pttl == -1:
+        return 0
+    return pttl / 1000
+
+
+def _identity(value):
+    return value
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+async def _reply_error_as_type_error(future):
+    try:
+        return await future
+    except aioredis.errors.ReplyError:
+        raise TypeError("Value is not an integer") from None
+
+
+class _NearCache:
+    """
+    Bounded LRU dict keeping raw values read from redis. ``generation`` is increased on every
+    invalidation so values read while one was received are not stored.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.generation = 0
+        self._values = collections.OrderedDict()
+
+    def get(self, key, encoding):
+        entry = self._values.get(key)
+        if entry is None or entry[0] != encoding:
+            return None
+        self._values.move_to_end(key)
+        return entry[1]
+
+    def put(self, key, value, encoding, generation):
+        if value is None or generation != self.generation:
+            return
+        self._values[key] = (encoding, value)
+        self._values.move_to_end(key)
+        if len(self._values) > self.max_size:
+            self._values.popitem(last=False)
+
+    def forget(self, keys):
+        self.generation += 1
+        for key in keys:
+            self._values.pop(key, None)
+
+    def clear(self):
+        self.generation += 1
+        self._values.clear()
+
+    def __len__(self):
+        return len(self._values)
+
+
 class RedisBackend:
 
     RELEASE_SCRIPT = (
@@ -28,22 +98,41 @@ class RedisBackend:
         " end"
     )
 
+    INVALIDATE_CHANNEL = "__redis__:invalidate"
+    NEAR_CACHE_TRACKING = "tracking"
+    NEAR_CACHE_KEYSPACE = "keyspace"
+    NEAR_CACHE_RETRY = 5
+
+    _WRITE_CMDS = {"add", "set", "multi_set", "delete", "increment", "expire"}
+
     pools = {}
 
     def __init__(
             self, endpoint="127.0.0.1", port=6379, db=0, password=None,
-            pool_min_size=1, pool_max_size=10, loop=None, **kwargs):
+            pool_min_size=1, pool_max_size=10, loop=None, near_cache=None,
+            near_cache_invalidation=NEAR_CACHE_TRACKING, **kwargs):
         super().__init__(**kwargs)
+        if near_cache_invalidation not in (self.NEAR_CACHE_TRACKING, self.NEAR_CACHE_KEYSPACE):
+            raise ValueError(
+                "Unknown near cache invalidation {}".format(near_cache_invalidation))
         self.endpoint = endpoint
         self.port = port
         self.db = db
         self.password = password
         self.pool_min_size = pool_min_size
         self.pool_max_size = pool_max_size
+        self.near_cache_invalidation = near_cache_invalidation
         self._pool_lock = asyncio.Lock()
         self._loop = loop or asyncio.get_event_loop()
         self._pool = None
 
+        self._near = _NearCache(near_cache) if near_cache else None
+        self._near_lock = asyncio.Lock()
+        self._near_prefix = None
+        self._near_listener = None
+        self._near_conns = []
+        self._near_retry_at = 0
+
     async def acquire_conn(self):
         with await self._connect():
             pass
@@ -52,22 +141,67 @@ class RedisBackend:
     async def release_conn(self, _conn):
         self._pool.release(_conn)
 
-    @conn
     async def _get(self, key, encoding="utf-8", _conn=None):
-        return await _conn.get(key, encoding=encoding)
+        if not await self._near_ready(key):
+            return await self.__get(key, encoding=encoding, _conn=_conn)
+
+        value = self._near.get(key, encoding)
+        if value is None:
+            generation = self._near.generation
+            value = await self.__get(key, encoding=encoding, _conn=_conn)
+            self._near.put(key, value, encoding, generation)
+        return value
 
     @conn
+    async def __get(self, key, encoding="utf-8", _conn=None):
+        return await _conn.get(key, encoding=encoding)
+
     async def _multi_get(self, keys, encoding="utf-8", _conn=None):
+        if not keys or not await self._near_ready(*keys):
+            return await self.__multi_get(keys, encoding=encoding, _conn=_conn)
+
+        values = [self._near.get(key, encoding) for key in keys]
+        missing = [i for i, value in enumerate(values) if value is None]
+        if missing:
+            generation = self._near.generation
+            found = await self.__multi_get(
+                [keys[i] for i in missing], encoding=encoding, _conn=_conn)
+            for i, value in zip(missing, found):
+                values[i] = value
+                self._near.put(keys[i], value, encoding, generation)
+        return values
+
+    @conn
+    async def __multi_get(self, keys, encoding="utf-8", _conn=None):
         return await _conn.mget(*keys, encoding=encoding)
 
+    @conn
+    async def _get_touch(self, key, ttl, encoding="utf-8", _conn=None):
+        pipe = _conn.pipeline()
+        value = pipe.get(key, encoding=encoding)
+        _expire_command(pipe, key, ttl)
+        await pipe.execute()
+        return await value
+
+    @conn
+    async def _multi_get_touch(self, keys, ttl, encoding="utf-8", _conn=None):
+        pipe = _conn.pipeline()
+        values = pipe.mget(*keys, encoding=encoding)
+        for key in keys:
+            _expire_command(pipe, key, ttl)
+        await pipe.execute()
+        return await values
+
     @conn
     async def _set(self, key, value, ttl=None, _conn=None):
+        self._near_forget([key])
         if ttl is None:
             return await _conn.set(key, value)
         return await _conn.setex(key, ttl, value)
 
     @conn
     async def _multi_set(self, pairs, ttl=None, _conn=None):
+        self._near_forget([key for key, _ in pairs])
         ttl = ttl or 0
 
         flattened = list(itertools.chain.from_iterable(
@@ -83,12 +217,13 @@ class RedisBackend:
     async def __multi_set_ttl(self, conn, flattened, ttl):
         redis = conn.multi_exec()
         redis.mset(*flattened)
-        for key in flattened[::2]:
-            redis.expire(key, timeout=ttl)
+        for key, key_ttl in zip(flattened[::2], _per_key_ttls(ttl)):
+            _expire_command(redis, key, key_ttl)
         await redis.execute()
 
     @conn
     async def _add(self, key, value, ttl=None, _conn=None):
+        self._near_forget([key])
         expx = {"expire": ttl}
         if isinstance(ttl, float):
             expx = {"pexpire": int(ttl * 1000)}
@@ -105,6 +240,7 @@ class RedisBackend:
 
     @conn
     async def _increment(self, key, delta, _conn=None):
+        self._near_forget([key])
         try:
             return await _conn.incrby(key, delta)
         except aioredis.errors.ReplyError:
@@ -112,16 +248,31 @@ class RedisBackend:
 
     @conn
     async def _expire(self, key, ttl, _conn=None):
+        self._near_forget([key])
         if ttl == 0:
             return await _conn.persist(key)
         return await _conn.expire(key, ttl)
 
+    @conn
+    async def _ttl(self, key, _conn=None):
+        return _seconds(await _conn.pttl(key))
+
+    @conn
+    async def _multi_ttl(self, keys, _conn=None):
+        pipe = _conn.pipeline()
+        futures = [pipe.pttl(key) for key in keys]
+        await pipe.execute()
+        return [_seconds(await future) for future in futures]
+
     @conn
     async def _delete(self, key, _conn=None):
+        self._near_forget([key])
         return await _conn.delete(key)
 
     @conn
     async def _clear(self, namespace=None, _conn=None):
+        if self._near is not None:
+            self._near.clear()
         if namespace:
             keys = await _conn.keys("{}:*".format(namespace))
             await _conn.delete(*keys)
@@ -135,6 +286,80 @@ class RedisBackend:
             kwargs["encoding"] = encoding
         return await getattr(_conn, command)(*args, **kwargs)
 
+    @conn
+    async def _pipeline(self, ops, _conn=None):
+        for cmd, args in ops:
+            if cmd == "multi_set":
+                self._near_forget([key for key, _ in args[0]])
+            elif cmd in self._WRITE_CMDS:
+                self._near_forget([args[0]])
+
+        pipe = _conn.pipeline()
+        queued = [getattr(self, "_pipe_" + cmd)(pipe, *args) for cmd, args in ops]
+        await pipe.execute(return_exceptions=True)
+
+        results = []
+        for future, callback in queued:
+            try:
+                results.append(callback(await future))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _pipe_get(self, pipe, key, encoding="utf-8"):
+        return pipe.get(key, encoding=encoding), _identity
+
+    def _pipe_multi_get(self, pipe, keys, encoding="utf-8"):
+        return pipe.mget(*keys, encoding=encoding), _identity
+
+    def _pipe_set(self, pipe, key, value, ttl=None):
+        if ttl is None:
+            return pipe.set(key, value), _identity
+        return pipe.setex(key, ttl, value), _identity
+
+    def _pipe_multi_set(self, pipe, pairs, ttl=None):
+        futures = [pipe.mset(*itertools.chain.from_iterable(pairs))]
+        if ttl:
+            futures.extend(
+                _expire_command(pipe, key, key_ttl)
+                for (key, _), key_ttl in zip(pairs, _per_key_ttls(ttl)))
+        return asyncio.gather(*futures), lambda ret: True
+
+    def _pipe_add(self, pipe, key, value, ttl=None):
+        expx = {"expire": ttl}
+        if isinstance(ttl, float):
+            expx = {"pexpire": int(ttl * 1000)}
+
+        def check(was_set):
+            if not was_set:
+                raise ValueError(
+                    "Key {} already exists, use .set to update the value".format(key))
+            return was_set
+
+        return pipe.set(key, value, exist=pipe.SET_IF_NOT_EXIST, **expx), check
+
+    def _pipe_exists(self, pipe, key):
+        return pipe.exists(key), lambda exists: exists > 0
+
+    def _pipe_increment(self, pipe, key, delta):
+        return _reply_error_as_type_error(pipe.incrby(key, delta)), _identity
+
+    def _pipe_expire(self, pipe, key, ttl):
+        if ttl == 0:
+            return pipe.persist(key), _identity
+        return pipe.expire(key, ttl), _identity
+
+    def _pipe_delete(self, pipe, key):
+        return pipe.delete(key), _identity
+
+    def _pipe_ttl(self, pipe, key):
+        return pipe.pttl(key), _seconds
+
+    def _pipe_multi_ttl(self, pipe, keys):
+        return (
+            asyncio.gather(*[pipe.pttl(key) for key in keys]),
+            lambda pttls: [_seconds(pttl) for pttl in pttls])
+
     async def _redlock_release(self, key, value):
         return await self._raw(
             "eval",
@@ -143,9 +368,90 @@ class RedisBackend:
             [value])
 
     async def _close(self, *args, **kwargs):
+        await self._near_stop()
         if self._pool is not None:
             await self._pool.clear()
 
+    def _near_forget(self, keys):
+        if self._near is not None:
+            self._near.forget(keys)
+
+    async def _near_ready(self, *keys):
+        """
+        Returns True if the near cache can be used for the keys. The invalidation listener is
+        started the first time, the near cache is bypassed while it's not running.
+        """
+        if self._near is None:
+            return False
+        if self._near_listener is None or self._near_listener.done():
+            if self._loop.time() < self._near_retry_at:
+                return False
+            async with self._near_lock:
+                if self._near_listener is None or self._near_listener.done():
+                    try:
+                        await self._near_start()
+                    except Exception:
+                        logger.exception("Couldn't start near cache invalidation")
+                        self._near_retry_at = self._loop.time() + self.NEAR_CACHE_RETRY
+                        await self._near_stop()
+                        return False
+        return all(key.startswith(self._near_prefix) for key in keys)
+
+    async def _near_start(self):
+        await self._near_stop()
+        self._near_prefix = self._build_key("")
+        subscriber = await self._near_connection()
+
+        if self.near_cache_invalidation == self.NEAR_CACHE_TRACKING:
+            client_id = await subscriber.execute("CLIENT", "ID")
+            channel, = await subscriber.subscribe(self.INVALIDATE_CHANNEL)
+            tracker = await self._near_connection()
+            prefix = ["PREFIX", self._near_prefix] if self._near_prefix else []
+            await tracker.execute(
+                "CLIENT", "TRACKING", "on", "REDIRECT", client_id, "BCAST", *prefix)
+        else:
+            channel, = await subscriber.psubscribe(
+                "__keyspace@{}__:{}*".format(self.db, self._near_prefix))
+
+        self._near.clear()
+        self._near_listener = asyncio.ensure_future(self._near_listen(channel), loop=self._loop)
+
+    async def _near_connection(self):
+        connection = await aioredis.create_redis(
+            (self.endpoint, self.port), db=self.db, password=self.password,
+            encoding="utf-8", loop=self._loop)
+        self._near_conns.append(connection)
+        return connection
+
+    async def _near_listen(self, channel):
+        keyspace = "__keyspace@{}__:".format(self.db)
+        try:
+            while await channel.wait_message():
+                message = await channel.get()
+                if channel.is_pattern:
+                    self._near.forget([_decode(message[0])[len(keyspace):]])
+                elif message is None:
+                    self._near.clear()
+                elif isinstance(message, list):
+                    self._near.forget([_decode(key) for key in message])
+                else:
+                    self._near.forget([_decode(message)])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Near cache invalidation stopped")
+        finally:
+            self._near.clear()
+
+    async def _near_stop(self):
+        if self._near_listener is not None:
+            self._near_listener.cancel()
+            self._near_listener = None
+        for connection in self._near_conns:
+            connection.close()
+            await connection.wait_closed()
+        self._near_conns = []
+
     async def _connect(self):
         async with self._pool_lock:
             if self._pool is None:
@@ -175,22 +481,37 @@ class RedisCache(RedisBackend, BaseCache):
         the backend. Default is None.
     :param timeout: int or float in seconds specifying maximum timeout for the operations to last.
         By default its 5.
+    :param ttl_jitter: float fraction to randomly spread the ttls of the written keys. Default
+        is None.
+    :param circuit_breaker: :class:`aiocache.breaker.CircuitBreaker` to fail fast while the
+        backend is unhealthy. Default is None.
+    :param max_key_length: int max length of the keys, longer ones are shortened with a
+        digest. Default is None.
     :param endpoint: str with the endpoint to connect to. Default is "127.0.0.1".
     :param port: int with the port to connect to. Default is 6379.
     :param db: int indicating database to use. Default is 0.
     :param password: str indicating password to use. Default is None.
     :param pool_min_size: int minimum pool size for the redis connections pool. Default is 1
     :param pool_max_size: int maximum pool size for the redis connections pool. Default is 10
+    :param near_cache: int max number of values to keep in a local dict in front of redis for
+        the keys in the cache namespace. Default is None which disables it.
+    :param near_cache_invalidation: str how the local values get invalidated when the keys
+        change in redis. ``"tracking"`` uses the redis 6 client side caching (``CLIENT
+        TRACKING`` in broadcasting mode redirected to a pub/sub connection) and ``"keyspace"``
+        subscribes to the keyspace notifications, which need to be enabled in the server
+        (``notify-keyspace-events`` with at least ``Kgx$``). Default is ``"tracking"``.
     """
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
     def _build_key(self, key, namespace=None):
         if namespace is not None:
-            return "{}{}{}".format(namespace, ":" if namespace else "", key)
+            return self._normalize_key(
+                "{}{}{}".format(namespace, ":" if namespace else "", key))
         if self.namespace is not None:
-            return "{}{}{}".format(self.namespace, ":" if self.namespace else "", key)
-        return key
+            return self._normalize_key(
+                "{}{}{}".format(self.namespace, ":" if self.namespace else "", key))
+        return self._normalize_key(key)
 
     def __repr__(self):  # pragma: no cover
         return "RedisCache ({}:{})".format(self.endpoint, self.port)
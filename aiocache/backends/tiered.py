@@ -0,0 +1,244 @@
+import asyncio
+
+from aiocache import _envelope
+from aiocache.base import BaseCache
+from aiocache.serializers import NullSerializer
+
+
+_MISSING = object()
+
+
+class _TieredSerializer(NullSerializer):
+    """
+    Passes values to the tiers as they are except ``None``, stored as a marker because
+    backends report missing keys as ``None``.
+    """
+
+    NONE = "\x00aiocache-none"
+
+    @classmethod
+    def dumps(cls, value):
+        return cls.NONE if value is None else value
+
+    @classmethod
+    def loads(cls, value):
+        if isinstance(value, str) and value == cls.NONE:
+            return None
+        return value
+
+
+class TieredBackend:
+    """
+    Composes an ordered list of caches, from the fastest to the slowest one. Values are passed
+    to the tiers as they are, each tier serializes and namespaces them with its own config.
+    """
+
+    WRITE_THROUGH = "through"
+    WRITE_AROUND = "around"
+
+    def __init__(self, tiers=None, ttls=None, write_policy=WRITE_THROUGH, **kwargs):
+        super().__init__(**kwargs)
+        if not tiers:
+            raise ValueError("TieredCache needs at least one tier")
+        if write_policy not in (self.WRITE_THROUGH, self.WRITE_AROUND):
+            raise ValueError("Unknown write policy {}".format(write_policy))
+        self.tiers = list(tiers)
+        self.ttls = list(ttls) if ttls is not None else [None] * len(self.tiers)
+        if len(self.ttls) != len(self.tiers):
+            raise ValueError("ttls needs one ttl per tier")
+        self.write_policy = write_policy
+        self.hits = [0] * len(self.tiers)
+        self.misses = 0
+
+    def _tier_ttl(self, index, ttl):
+        return self.ttls[index] if ttl is None else ttl
+
+    async def _get(self, key, encoding="utf-8", _conn=None):
+        for index, tier in enumerate(self.tiers):
+            value = await tier.get(key, default=_MISSING)
+            if value is not _MISSING:
+                self.hits[index] += 1
+                await self._backfill(index, [(key, value)])
+                return value
+        self.misses += 1
+        return None
+
+    async def _multi_get(self, keys, encoding="utf-8", _conn=None):
+        values = [None] * len(keys)
+        missing = list(range(len(keys)))
+        for index, tier in enumerate(self.tiers):
+            if not missing:
+                break
+            found = await tier.multi_get([keys[i] for i in missing], default=_MISSING)
+            pairs = []
+            still_missing = []
+            for i, value in zip(missing, found):
+                if value is _MISSING:
+                    still_missing.append(i)
+                    continue
+                values[i] = value
+                pairs.append((keys[i], value))
+            self.hits[index] += len(pairs)
+            await self._backfill(index, pairs)
+            missing = still_missing
+        self.misses += len(missing)
+        return values
+
+    async def _get_touch(self, key, ttl, encoding="utf-8", _conn=None):
+        value = await self._get(key, encoding=encoding)
+        if value is not None:
+            await self._touch([key], ttl)
+        return value
+
+    async def _multi_get_touch(self, keys, ttl, encoding="utf-8", _conn=None):
+        values = await self._multi_get(keys, encoding=encoding)
+        await self._touch([key for key, value in zip(keys, values) if value is not None], ttl)
+        return values
+
+    async def _touch(self, keys, ttl):
+        await asyncio.gather(*[tier.expire(key, ttl) for tier in self.tiers for key in keys])
+
+    async def _backfill(self, index, pairs):
+        if index == 0 or not pairs:
+            return
+        await asyncio.gather(*[
+            tier.multi_set(pairs, ttl=self.ttls[upper])
+            for upper, tier in enumerate(self.tiers[:index])])
+
+    async def _set(self, key, value, ttl=None, _conn=None):
+        if self.write_policy == self.WRITE_AROUND:
+            await self.tiers[-1].set(key, value, ttl=self._tier_ttl(-1, ttl))
+            await self._invalidate([key])
+        else:
+            await asyncio.gather(*[
+                tier.set(key, value, ttl=self._tier_ttl(index, ttl))
+                for index, tier in enumerate(self.tiers)])
+        return True
+
+    async def _multi_set(self, pairs, ttl=None, _conn=None):
+        if self.write_policy == self.WRITE_AROUND:
+            await self.tiers[-1].multi_set(pairs, ttl=self._tier_ttl(-1, ttl))
+            await self._invalidate([key for key, _ in pairs])
+        else:
+            await asyncio.gather(*[
+                tier.multi_set(pairs, ttl=self._tier_ttl(index, ttl))
+                for index, tier in enumerate(self.tiers)])
+        return True
+
+    async def _add(self, key, value, ttl=None, _conn=None):
+        await self.tiers[-1].add(key, value, ttl=self._tier_ttl(-1, ttl))
+        if self.write_policy == self.WRITE_AROUND:
+            await self._invalidate([key])
+        else:
+            await asyncio.gather(*[
+                tier.set(key, value, ttl=self._tier_ttl(index, ttl))
+                for index, tier in enumerate(self.tiers[:-1])])
+        return True
+
+    async def _invalidate(self, keys):
+        await asyncio.gather(*[
+            tier.delete(key) for tier in self.tiers[:-1] for key in keys])
+
+    async def _exists(self, key, _conn=None):
+        for tier in self.tiers:
+            if await tier.exists(key):
+                return True
+        return False
+
+    async def _increment(self, key, delta, _conn=None):
+        value = await self.tiers[-1].increment(key, delta)
+        await self._invalidate([key])
+        return value
+
+    async def _expire(self, key, ttl, _conn=None):
+        results = await asyncio.gather(*[tier.expire(key, ttl) for tier in self.tiers])
+        return any(results)
+
+    async def _ttl(self, key, _conn=None):
+        for tier in self.tiers:
+            ttl = await tier.ttl(key)
+            if ttl is not None:
+                return ttl
+        return None
+
+    async def _multi_ttl(self, keys, _conn=None):
+        ttls = [None] * len(keys)
+        missing = list(range(len(keys)))
+        for tier in self.tiers:
+            if not missing:
+                break
+            found = await tier.multi_ttl([keys[i] for i in missing])
+            for i, ttl in zip(missing, found):
+                ttls[i] = ttl
+            missing = [i for i in missing if ttls[i] is None]
+        return ttls
+
+    async def _delete(self, key, _conn=None):
+        results = await asyncio.gather(*[tier.delete(key) for tier in self.tiers])
+        return int(any(results))
+
+    async def _clear(self, namespace=None, _conn=None):
+        await asyncio.gather(*[tier.clear(namespace=namespace) for tier in self.tiers])
+        return True
+
+    async def _raw(self, command, *args, encoding="utf-8", _conn=None, **kwargs):
+        return await self.tiers[-1].raw(command, *args, **kwargs)
+
+    async def _redlock_release(self, key, value):
+        tier = self.tiers[-1]
+        return await tier._redlock_release(tier._build_key(key), value)
+
+    async def _close(self, *args, **kwargs):
+        await asyncio.gather(*[tier.close() for tier in self.tiers])
+
+
+class TieredCache(TieredBackend, BaseCache):
+    """
+    Multi level cache composing an ordered list of caches, from the fastest to the slowest one,
+    i.e. ``TieredCache([SimpleMemoryCache(), RedisCache()], ttls=[10, 600])``.
+
+    Reads go through the tiers in order and a hit in a lower tier is stored back in the upper
+    ones with their ttl. ``multi_get`` only asks each tier for the keys still missing. The hits
+    of each tier are counted in the ``hits`` list attribute and the keys not found in any tier
+    in ``misses``.
+
+    With the ``"through"`` write policy writes go to all tiers. With ``"around"`` they only go
+    to the last tier and the key is deleted from the upper ones, which get it back on the next
+    read. ``add`` and ``increment`` are always done in the last tier, ``raw`` is sent to it too.
+
+    With ``touch_on_read`` the keys found are expired with that ttl in every tier after being
+    read. Stale values (``soft_ttl``) and early expiration (``compute_time``) are handled by
+    the tiered cache, the tiers store the value together with that metadata. Values other
+    than str or bytes are stored in a dict then, so the tiers need a serializer keeping dicts
+    (i.e. ``JsonSerializer``, ``PickleSerializer`` or ``NullSerializer``).
+
+    Config options are:
+
+    :param tiers: list of :class:`aiocache.base.BaseCache` instances ordered from the
+        fastest to the slowest.
+    :param ttls: list with the ttl for each tier. Used when writing without ttl and when
+        back-filling. Default is None for all tiers.
+    :param write_policy: str ``"through"`` or ``"around"``. Default is ``"through"``.
+    :param serializer: obj derived from :class:`aiocache.serializers.StringSerializer`.
+        Default passes the values to the tiers as they are, like
+        :class:`aiocache.serializers.NullSerializer`, but stores ``None`` as a marker so
+        cached ``None`` results aren't reported as missing.
+    :param plugins: list of :class:`aiocache.plugins.BasePlugin` derived classes.
+    :param namespace: string to use as default prefix for the key used in all operations of
+        the backend. Default is None.
+    :param timeout: int or float in seconds specifying maximum timeout for the operations to last.
+        By default its 5.
+    :param circuit_breaker: :class:`aiocache.breaker.CircuitBreaker` to fail fast while the
+        backend is unhealthy. Default is None.
+    :param max_key_length: int max length of the keys, longer ones are shortened with a
+        digest. Default is None.
+    """
+
+    # Different from the tiers one so they store the envelope of the tiered cache as it is
+    _envelope_mark = _envelope.MARK + "t"
+
+    def __init__(self, tiers=None, serializer=None, **kwargs):
+        super().__init__(tiers=tiers, serializer=serializer or _TieredSerializer(), **kwargs)
+
+    def __repr__(self):  # pragma: no cover
+        return "TieredCache ({})".format(", ".join(repr(tier) for tier in self.tiers))
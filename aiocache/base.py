@@ -1,10 +1,20 @@
 import os
+import sys
+import math
 import time
-import functools
+import random
 import asyncio
+import hashlib
+import logging
+import itertools
+import functools
+import collections
 
-from aiocache import serializers
+from aiocache import serializers, _envelope
 from aiocache._lock import _RedLock
+from aiocache._deadline import _Deadline
+from aiocache._write_behind import _WriteBuffer
+from aiocache.lazy import LazyValue
 from aiocache.log import logger
 
 
@@ -29,6 +39,10 @@ class API:
         I.e if you have a function ``get(self, key)``, if its decorated with this decorator, you
         will be able to call it with ``await get(self, "my_key", timeout=4)``.
 
+        The timeout is implemented as a cancellation deadline on the current task instead of
+        spawning a new one per call. Calls nested inside an active deadline (another command,
+        a decorator call, etc.) only get the remaining budget.
+
         Use 0 or None to disable the timeout.
         """
         NOT_SET = "NOT_SET"
@@ -38,7 +52,8 @@ class API:
             timeout = self.timeout if timeout == NOT_SET else timeout
             if timeout == 0 or timeout is None:
                 return await func(self, *args, **kwargs)
-            return await asyncio.wait_for(func(self, *args, **kwargs), timeout)
+            async with _Deadline(timeout):
+                return await func(self, *args, **kwargs)
 
         return _timeout
 
@@ -46,23 +61,47 @@ class API:
     def aiocache_enabled(cls, fake_return=None):
         """
         Use this decorator to be able to fake the return of the function by setting the
-        ``AIOCACHE_DISABLE`` environment variable
+        ``AIOCACHE_DISABLE`` environment variable. If ``fake_return`` is callable, it is
+        called with the arguments of the function to build the value.
         """
+        fake_return_fn = (
+            fake_return if callable(fake_return) else lambda *args, **kwargs: fake_return)
+
         def enabled(func):
             @functools.wraps(func)
             async def _enabled(*args, **kwargs):
                 if os.getenv('AIOCACHE_DISABLE') == "1":
-                    return fake_return
+                    return fake_return_fn(*args, **kwargs)
                 return await func(*args, **kwargs)
 
             return _enabled
         return enabled
 
+    @classmethod
+    def circuit_breaker(cls, fallback=None):
+        """
+        Use this decorator to route the command through the ``circuit_breaker`` of the cache
+        if it has one. While the circuit is open the command is not executed and ``fallback``
+        is returned instead. If ``fallback`` is callable, it is called with the arguments of
+        the command to build the value.
+        """
+        fallback_fn = fallback if callable(fallback) else lambda *args, **kwargs: fallback
+
+        def breaker(func):
+            @functools.wraps(func)
+            async def _circuit_breaker(self, *args, **kwargs):
+                if self.circuit_breaker is None:
+                    return await func(self, *args, **kwargs)
+                return await self.circuit_breaker.call(self, func, fallback_fn, *args, **kwargs)
+
+            return _circuit_breaker
+        return breaker
+
     @classmethod
     def plugins(cls, func):
         @functools.wraps(func)
         async def _plugins(self, *args, **kwargs):
-            start = time.time()
+            start = time.perf_counter()
             for plugin in self.plugins:
                 await getattr(plugin, "pre_{}".format(func.__name__))(self, *args, **kwargs)
 
@@ -71,12 +110,37 @@ class API:
             for plugin in self.plugins:
                 await getattr(
                     plugin, "post_{}".format(func.__name__))(
-                        self, *args, took=time.time() - start, ret=ret, **kwargs)
+                        self, *args, took=time.perf_counter() - start, ret=ret, **kwargs)
             return ret
 
         return _plugins
 
 
+_KEY_DIGEST_LENGTH = 32
+
+
+def _key_digest(data):
+    if hasattr(hashlib, "blake2b"):
+        return hashlib.blake2b(data, digest_size=_KEY_DIGEST_LENGTH // 2).hexdigest()
+    # python 3.5
+    return hashlib.sha256(data).hexdigest()[:_KEY_DIGEST_LENGTH]
+
+
+def _get_fallback(self, key, default=None, *args, **kwargs):
+    return default
+
+
+def _multi_get_fallback(self, keys, loads_fn=None, namespace=None, default=None, **kwargs):
+    return [default] * len(keys)
+
+
+def _multi_ttl_fallback(self, keys, *args, **kwargs):
+    return [None] * len(keys)
+
+
+_Loader = collections.namedtuple("_Loader", "key namespace loader ttl soft_ttl expires")
+
+
 class BaseCache:
     """
     Base class that agregates the common logic for the different caches that may exist. Cache
@@ -90,13 +154,53 @@ class BaseCache:
         the backend. Default is None
     :param timeout: int or float in seconds specifying maximum timeout for the operations to last.
         By default its 5. Use 0 or None if you want to disable it.
+    :param ttl_jitter: float fraction used to randomly spread the ttls of ``add``, ``set`` and
+        ``multi_set`` so keys written together don't expire at the same time. I.e 0.1 stores
+        each key with a ttl within +-10% of the given one. Int ttls are kept as ints. Default is
+        None which disables it.
+    :param touch_on_read: int or float seconds. If set, ``get`` and ``multi_get`` reset the ttl
+        of the keys found to this value (sliding expiration) in the same round trip. Probabilistic
+        early expiration (``compute_time``) is ignored for these caches. Default is None which
+        disables it.
+    :param circuit_breaker: :class:`aiocache.breaker.CircuitBreaker` instance. When its
+        circuit is open commands don't reach the backend: ``get`` and ``multi_get`` return
+        default, ``exists`` False, ``ttl`` None and writes are dropped returning False (0 for
+        ``delete`` and None for ``increment``). Default is None which disables it.
+    :param write_behind: int or float seconds. If set, ``set``, ``delete`` and ``increment``
+        are buffered in memory and sent to the backend in a single round trip that many
+        seconds after the first buffered write. Writes to the same key are merged, keeping the
+        last value or the sum of the increments. Commands reading or writing a buffered key
+        flush the buffer first and :meth:`close` drains it. Default is None which disables it.
+    :param write_behind_max_size: int max number of keys to buffer. Writes for new keys flush
+        the buffer before being buffered once it's full. Default is 1000.
+    :param max_key_length: int max length of the keys sent to the backend, namespace included.
+        Longer keys keep their first characters and the rest is replaced by a blake2b digest of
+        the whole key so the result is exactly this long. Applies to every command, pipelines
+        and locks. Default is None which disables it.
+    :param max_loaders: int max number of loaders registered with :meth:`register_loader`
+        to keep. The least recently registered or used ones are dropped first. Default is
+        10000.
     """
 
+    _envelope_mark = _envelope.MARK
+
     def __init__(
             self, serializer=None, plugins=None,
-            namespace=None, timeout=5):
+            namespace=None, timeout=5, ttl_jitter=None, touch_on_read=None,
+            circuit_breaker=None, write_behind=None, write_behind_max_size=1000,
+            max_key_length=None, max_loaders=10000):
+        if max_key_length is not None and max_key_length <= _KEY_DIGEST_LENGTH:
+            raise ValueError(
+                "max_key_length must be greater than {}".format(_KEY_DIGEST_LENGTH))
         self.timeout = timeout
+        self.max_key_length = max_key_length
+        self.max_loaders = max_loaders
         self.namespace = namespace
+        self.ttl_jitter = ttl_jitter
+        self.touch_on_read = touch_on_read
+        self.circuit_breaker = circuit_breaker
+        self._write_buffer = (
+            _WriteBuffer(self, write_behind, write_behind_max_size) if write_behind else None)
 
         self._serializer = None
         self.serializer = serializer or serializers.StringSerializer()
@@ -104,6 +208,9 @@ class BaseCache:
         self._plugins = None
         self.plugins = plugins or []
 
+        self._loaders = collections.OrderedDict()
+        self._refreshing = {}
+
     @property
     def serializer(self):
         return self._serializer
@@ -122,6 +229,7 @@ class BaseCache:
 
     @API.register
     @API.aiocache_enabled(fake_return=True)
+    @API.circuit_breaker(fallback=False)
     @API.timeout
     @API.plugins
     async def add(self, key, value, ttl=None, dumps_fn=None, namespace=None, _conn=None):
@@ -143,88 +251,153 @@ class BaseCache:
             - ValueError if key already exists
             - :class:`asyncio.TimeoutError` if it lasts more than self.timeout
         """
-        start = time.time()
+        start = time.perf_counter()
         dumps = dumps_fn or self._serializer.dumps
         ns_key = self._build_key(key, namespace=namespace)
 
-        await self._add(ns_key, dumps(value), ttl, _conn=_conn)
+        value, = await self._serialize("add", dumps, [value])
+        await self._sync_writes(ns_key)
+        await self._add(ns_key, value, self._jitter(ttl), _conn=_conn)
 
-        logger.debug("ADD %s %s (%.4f)s", ns_key, True, time.time() - start)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("ADD %s %s (%.4f)s", ns_key, True, time.perf_counter() - start)
         return True
 
     async def _add(self, key, value, ttl, _conn=None):
         raise NotImplementedError()
 
     @API.register
-    @API.aiocache_enabled()
+    @API.aiocache_enabled(fake_return=_get_fallback)
+    @API.circuit_breaker(fallback=_get_fallback)
     @API.timeout
     @API.plugins
-    async def get(self, key, default=None, loads_fn=None, namespace=None, _conn=None):
+    async def get(
+            self, key, default=None, loads_fn=None, namespace=None, lazy=False, _conn=None):
         """
-        Get a value from the cache. Returns default if not found.
+        Get a value from the cache. Returns default if not found. Falsy values like ``0``,
+        ``""`` or a serialized ``None`` are returned as they are, only missing keys return
+        default. Pass your own sentinel object as default to tell misses apart from them.
+
+        With ``lazy=True`` the value found is returned as a :class:`aiocache.lazy.LazyValue`
+        that deserializes it on first access and gives the serialized value in its ``raw``
+        attribute.
 
         :param key: str
         :param default: obj to return when key is not found
         :param loads_fn: callable alternative to use as loads function
         :param namespace: str alternative namespace to use
+        :param lazy: bool to defer deserializing the value. Default is False
         :param timeout: int or float in seconds specifying maximum timeout
             for the operations to last
         :returns: obj loaded
         :raises: :class:`asyncio.TimeoutError` if it lasts more than self.timeout
         """
-        start = time.time()
+        start = time.perf_counter()
         loads = loads_fn or self._serializer.loads
         ns_key = self._build_key(key, namespace=namespace)
 
-        value = loads(await self._get(ns_key, encoding=self.serializer.encoding, _conn=_conn))
-
-        logger.debug("GET %s %s (%.4f)s", ns_key, value is not None, time.time() - start)
-        return value or default
+        await self._sync_writes(ns_key)
+        if self.touch_on_read:
+            value = await self._get_touch(
+                ns_key, self.touch_on_read, encoding=self.serializer.encoding, _conn=_conn)
+        else:
+            value = await self._get(ns_key, encoding=self.serializer.encoding, _conn=_conn)
+        value = self._unwrap(ns_key, value)
+        found = value is not None
+        if not found:
+            value = default
+        elif lazy:
+            value = LazyValue(value, loads)
+        else:
+            value, = await self._serialize("get", loads, [value], loading=True)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("GET %s %s (%.4f)s", ns_key, found, time.perf_counter() - start)
+        return value
 
     async def _get(self, key, encoding, _conn=None):
         raise NotImplementedError()
 
+    async def _get_touch(self, key, ttl, encoding, _conn=None):
+        raise NotImplementedError()
+
     @API.register
-    @API.aiocache_enabled(fake_return=[])
+    @API.aiocache_enabled(fake_return=_multi_get_fallback)
+    @API.circuit_breaker(fallback=_multi_get_fallback)
     @API.timeout
     @API.plugins
-    async def multi_get(self, keys, loads_fn=None, namespace=None, _conn=None):
+    async def multi_get(
+            self, keys, loads_fn=None, namespace=None, default=None, lazy=False, _conn=None):
         """
-        Get multiple values from the cache, values not found are Nones.
+        Get multiple values from the cache, values not found are set to default.
 
         :param keys: list of str
         :param loads_fn: callable alternative to use as loads function
         :param namespace: str alternative namespace to use
+        :param default: obj to return for the keys not found. Default is None
+        :param lazy: bool to return the values found as :class:`aiocache.lazy.LazyValue`
+            like :meth:`get`. Default is False
         :param timeout: int or float in seconds specifying maximum timeout
             for the operations to last
         :returns: list of objs
         :raises: :class:`asyncio.TimeoutError` if it lasts more than self.timeout
         """
-        start = time.time()
+        start = time.perf_counter()
         loads = loads_fn or self._serializer.loads
+        loads_many = None if loads_fn else _batch_fn(self._serializer, "loads_many", "loads")
 
         ns_keys = [self._build_key(key, namespace=namespace) for key in keys]
-        values = [loads(value) for value in await self._multi_get(
-            ns_keys, encoding=self.serializer.encoding, _conn=_conn)]
-
-        logger.debug(
-            "MULTI_GET %s %d (%.4f)s",
-            ns_keys,
-            len([value for value in values if value is not None]),
-            time.time() - start)
+        await self._sync_writes(*ns_keys)
+        if self.touch_on_read:
+            values = await self._multi_get_touch(
+                ns_keys, self.touch_on_read, encoding=self.serializer.encoding, _conn=_conn)
+        else:
+            values = await self._multi_get(
+                ns_keys, encoding=self.serializer.encoding, _conn=_conn)
+        values = [self._unwrap(ns_key, value) for ns_key, value in zip(ns_keys, values)]
+        if lazy:
+            values = [default if value is None else LazyValue(value, loads) for value in values]
+        else:
+            loaded = iter(await self._serialize(
+                "multi_get", loads, [value for value in values if value is not None],
+                loading=True, many=loads_many))
+            values = [default if value is None else next(loaded) for value in values]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "MULTI_GET %s %d (%.4f)s",
+                ns_keys,
+                len([value for value in values if value is not default]),
+                time.perf_counter() - start)
         return values
 
     async def _multi_get(self, keys, encoding, _conn=None):
         raise NotImplementedError()
 
+    async def _multi_get_touch(self, keys, ttl, encoding, _conn=None):
+        raise NotImplementedError()
+
     @API.register
     @API.aiocache_enabled(fake_return=True)
+    @API.circuit_breaker(fallback=False)
     @API.timeout
     @API.plugins
-    async def set(self, key, value, ttl=None, dumps_fn=None, namespace=None, _conn=None):
+    async def set(
+            self, key, value, ttl=None, dumps_fn=None, namespace=None, soft_ttl=None,
+            compute_time=None, _conn=None):
         """
         Stores the value in the given key with ttl if specified
 
+        If ``soft_ttl`` is passed, the value is considered stale after that many seconds but
+        it keeps being returned by ``get`` until ``ttl`` expires. The first ``get`` of a stale
+        value schedules a background refresh using the loader registered with
+        :meth:`register_loader` for that key, if any.
+
+        If ``compute_time`` is passed together with ``ttl``, reads apply probabilistic early
+        expiration (XFetch): ``get`` reports the key as missing before ``ttl`` expires with a
+        probability that grows as expiration gets closer and with the time the value took to
+        compute, so recomputations of hot keys are spread instead of happening all at once.
+
         :param key: str
         :param value: obj
         :param ttl: int the expiration time in seconds. Due to memcached
@@ -232,18 +405,28 @@ class BaseCache:
             need miliseconds, redis and memory support float ttls
         :param dumps_fn: callable alternative to use as dumps function
         :param namespace: str alternative namespace to use
+        :param soft_ttl: int or float seconds after which the value is considered stale
+        :param compute_time: int or float seconds it took to compute the value. Scale it
+            to make early expiration more (> 1) or less (< 1) eager
         :param timeout: int or float in seconds specifying maximum timeout
             for the operations to last
         :returns: True
         :raises: :class:`asyncio.TimeoutError` if it lasts more than self.timeout
         """
-        start = time.time()
+        start = time.perf_counter()
         dumps = dumps_fn or self._serializer.dumps
         ns_key = self._build_key(key, namespace=namespace)
 
-        await self._set(ns_key, dumps(value), ttl, _conn=_conn)
+        ttl = self._jitter(ttl)
+        value, = await self._serialize("set", dumps, [value])
+        value = self._wrap(value, ttl, soft_ttl, compute_time)
+        if self._write_buffer is not None:
+            await self._write_buffer.set(ns_key, value, ttl)
+        else:
+            await self._set(ns_key, value, ttl, _conn=_conn)
 
-        logger.debug("SET %s %d (%.4f)s", ns_key, True, time.time() - start)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("SET %s %d (%.4f)s", ns_key, True, time.perf_counter() - start)
         return True
 
     async def _set(self, key, value, ttl, _conn=None):
@@ -251,9 +434,12 @@ class BaseCache:
 
     @API.register
     @API.aiocache_enabled(fake_return=True)
+    @API.circuit_breaker(fallback=False)
     @API.timeout
     @API.plugins
-    async def multi_set(self, pairs, ttl=None, dumps_fn=None, namespace=None, _conn=None):
+    async def multi_set(
+            self, pairs, ttl=None, dumps_fn=None, namespace=None, compute_time=None,
+            _conn=None):
         """
         Stores multiple values in the given keys.
 
@@ -263,32 +449,46 @@ class BaseCache:
             need miliseconds, redis and memory support float ttls
         :param dumps_fn: callable alternative to use as dumps function
         :param namespace: str alternative namespace to use
+        :param compute_time: int or float seconds it took to compute the values, enables
+            probabilistic early expiration like in :meth:`set`
         :param timeout: int or float in seconds specifying maximum timeout
             for the operations to last
         :returns: True
         :raises: :class:`asyncio.TimeoutError` if it lasts more than self.timeout
         """
-        start = time.time()
+        start = time.perf_counter()
         dumps = dumps_fn or self._serializer.dumps
+        dumps_many = None if dumps_fn else _batch_fn(self._serializer, "dumps_many", "dumps")
 
         tmp_pairs = []
-        for key, value in pairs:
-            tmp_pairs.append((self._build_key(key, namespace=namespace), dumps(value)))
-
+        ttl = self._jitter_many(ttl, len(pairs))
+        values = await self._serialize(
+            "multi_set", dumps, [value for _, value in pairs], many=dumps_many)
+        for (key, _), value, key_ttl in zip(pairs, values, _per_key_ttls(ttl)):
+            tmp_pairs.append((
+                self._build_key(key, namespace=namespace),
+                self._wrap(value, key_ttl, compute_time=compute_time)))
+
+        await self._sync_writes(*[key for key, _ in tmp_pairs])
         await self._multi_set(tmp_pairs, ttl, _conn=_conn)
 
-        logger.debug(
-            "MULTI_SET %s %d (%.4f)s",
-            [key for key, value in tmp_pairs],
-            len(pairs),
-            time.time() - start)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "MULTI_SET %s %d (%.4f)s",
+                [key for key, value in tmp_pairs],
+                len(pairs),
+                time.perf_counter() - start)
         return True
 
     async def _multi_set(self, pairs, ttl, _conn=None):
+        """
+        :param ttl: int or float ttl for all the keys or list with the ttl of each key
+        """
         raise NotImplementedError()
 
     @API.register
     @API.aiocache_enabled(fake_return=0)
+    @API.circuit_breaker(fallback=0)
     @API.timeout
     @API.plugins
     async def delete(self, key, namespace=None, _conn=None):
@@ -299,13 +499,18 @@ class BaseCache:
         :param namespace: str alternative namespace to use
         :param timeout: int or float in seconds specifying maximum timeout
             for the operations to last
-        :returns: int number of deleted keys
+        :returns: int number of deleted keys. Always 1 when buffered with ``write_behind``
         :raises: :class:`asyncio.TimeoutError` if it lasts more than self.timeout
         """
-        start = time.time()
+        start = time.perf_counter()
         ns_key = self._build_key(key, namespace=namespace)
+        self._loaders.pop(ns_key, None)
+        if self._write_buffer is not None:
+            await self._write_buffer.delete(ns_key)
+            return 1
         ret = await self._delete(ns_key, _conn=_conn)
-        logger.debug("DELETE %s %d (%.4f)s", ns_key, ret, time.time() - start)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("DELETE %s %d (%.4f)s", ns_key, ret, time.perf_counter() - start)
         return ret
 
     async def _delete(self, key, _conn=None):
@@ -313,6 +518,7 @@ class BaseCache:
 
     @API.register
     @API.aiocache_enabled(fake_return=False)
+    @API.circuit_breaker(fallback=False)
     @API.timeout
     @API.plugins
     async def exists(self, key, namespace=None, _conn=None):
@@ -326,10 +532,12 @@ class BaseCache:
         :returns: True if key exists otherwise False
         :raises: :class:`asyncio.TimeoutError` if it lasts more than self.timeout
         """
-        start = time.time()
+        start = time.perf_counter()
         ns_key = self._build_key(key, namespace=namespace)
+        await self._sync_writes(ns_key)
         ret = await self._exists(ns_key, _conn=_conn)
-        logger.debug("EXISTS %s %d (%.4f)s", ns_key, ret, time.time() - start)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("EXISTS %s %d (%.4f)s", ns_key, ret, time.perf_counter() - start)
         return ret
 
     async def _exists(self, key, _conn=None):
@@ -337,6 +545,7 @@ class BaseCache:
 
     @API.register
     @API.aiocache_enabled(fake_return=1)
+    @API.circuit_breaker()
     @API.timeout
     @API.plugins
     async def increment(self, key, delta=1, namespace=None, _conn=None):
@@ -349,14 +558,20 @@ class BaseCache:
         :param namespace: str alternative namespace to use
         :param timeout: int or float in seconds specifying maximum timeout
             for the operations to last
-        :returns: Value of the key once incremented. -1 if key is not found.
+        :returns: Value of the key once incremented. -1 if key is not found. None when
+            buffered with ``write_behind``
         :raises: :class:`asyncio.TimeoutError` if it lasts more than self.timeout
         :raises: :class:`TypeError` if value is not incrementable
         """
-        start = time.time()
+        start = time.perf_counter()
         ns_key = self._build_key(key, namespace=namespace)
+        if self._write_buffer is not None:
+            await self._write_buffer.increment(ns_key, delta)
+            return None
         ret = await self._increment(ns_key, delta, _conn=_conn)
-        logger.debug("INCREMENT %s %d (%.4f)s", ns_key, ret, time.time() - start)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "INCREMENT %s %d (%.4f)s", ns_key, ret, time.perf_counter() - start)
         return ret
 
     async def _increment(self, key, delta, _conn=None):
@@ -364,6 +579,7 @@ class BaseCache:
 
     @API.register
     @API.aiocache_enabled(fake_return=False)
+    @API.circuit_breaker(fallback=False)
     @API.timeout
     @API.plugins
     async def expire(self, key, ttl, namespace=None, _conn=None):
@@ -377,17 +593,75 @@ class BaseCache:
             for the operations to last
         :returns: True if set, False if key is not found
         """
-        start = time.time()
+        start = time.perf_counter()
         ns_key = self._build_key(key, namespace=namespace)
+        await self._sync_writes(ns_key)
         ret = await self._expire(ns_key, ttl, _conn=_conn)
-        logger.debug("EXPIRE %s %d (%.4f)s", ns_key, ret, time.time() - start)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("EXPIRE %s %d (%.4f)s", ns_key, ret, time.perf_counter() - start)
         return ret
 
     async def _expire(self, key, ttl, _conn=None):
         raise NotImplementedError()
 
+    @API.register
+    @API.aiocache_enabled()
+    @API.circuit_breaker()
+    @API.timeout
+    @API.plugins
+    async def ttl(self, key, namespace=None, _conn=None):
+        """
+        Get the remaining time to live of the given key.
+
+        :param key: str key to check
+        :param namespace: str alternative namespace to use
+        :param timeout: int or float in seconds specifying maximum timeout
+            for the operations to last
+        :returns: int or float seconds until the key expires, 0 if the key doesn't expire
+            and None if the key is not found
+        :raises: :class:`asyncio.TimeoutError` if it lasts more than self.timeout
+        """
+        start = time.perf_counter()
+        ns_key = self._build_key(key, namespace=namespace)
+        await self._sync_writes(ns_key)
+        ret = await self._ttl(ns_key, _conn=_conn)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("TTL %s %s (%.4f)s", ns_key, ret, time.perf_counter() - start)
+        return ret
+
+    async def _ttl(self, key, _conn=None):
+        raise NotImplementedError()
+
+    @API.register
+    @API.aiocache_enabled(fake_return=_multi_ttl_fallback)
+    @API.circuit_breaker(fallback=_multi_ttl_fallback)
+    @API.timeout
+    @API.plugins
+    async def multi_ttl(self, keys, namespace=None, _conn=None):
+        """
+        Get the remaining time to live of multiple keys.
+
+        :param keys: list of str
+        :param namespace: str alternative namespace to use
+        :param timeout: int or float in seconds specifying maximum timeout
+            for the operations to last
+        :returns: list with the remaining ttl of each key like in :meth:`ttl`
+        :raises: :class:`asyncio.TimeoutError` if it lasts more than self.timeout
+        """
+        start = time.perf_counter()
+        ns_keys = [self._build_key(key, namespace=namespace) for key in keys]
+        await self._sync_writes(*ns_keys)
+        ret = await self._multi_ttl(ns_keys, _conn=_conn)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("MULTI_TTL %s %s (%.4f)s", ns_keys, ret, time.perf_counter() - start)
+        return ret
+
+    async def _multi_ttl(self, keys, _conn=None):
+        raise NotImplementedError()
+
     @API.register
     @API.aiocache_enabled(fake_return=True)
+    @API.circuit_breaker(fallback=False)
     @API.timeout
     @API.plugins
     async def clear(self, namespace=None, _conn=None):
@@ -401,9 +675,11 @@ class BaseCache:
         :returns: True
         :raises: :class:`asyncio.TimeoutError` if it lasts more than self.timeout
         """
-        start = time.time()
+        start = time.perf_counter()
+        await self._flush_writes()
         ret = await self._clear(namespace, _conn=_conn)
-        logger.debug("CLEAR %s %d (%.4f)s", namespace, ret, time.time() - start)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("CLEAR %s %d (%.4f)s", namespace, ret, time.perf_counter() - start)
         return ret
 
     async def _clear(self, namespace, _conn=None):
@@ -411,6 +687,7 @@ class BaseCache:
 
     @API.register
     @API.aiocache_enabled()
+    @API.circuit_breaker()
     @API.timeout
     @API.plugins
     async def raw(self, command, *args, _conn=None, **kwargs):
@@ -427,10 +704,12 @@ class BaseCache:
         :returns: whatever the underlying client returns
         :raises: :class:`asyncio.TimeoutError` if it lasts more than self.timeout
         """
-        start = time.time()
+        start = time.perf_counter()
+        await self._flush_writes()
         ret = await self._raw(
             command, *args, encoding=self.serializer.encoding, _conn=_conn, **kwargs)
-        logger.debug("%s (%.4f)s", command, time.time() - start)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s (%.4f)s", command, time.perf_counter() - start)
         return ret
 
     async def _raw(self, command, *args, **kwargs):
@@ -441,24 +720,220 @@ class BaseCache:
         """
         Perform any resource clean up necessary to exit the program safely.
         After closing, cmd execution is still possible but you will have to
-        close again before exiting.
+        close again before exiting. Writes buffered with ``write_behind`` are flushed.
 
         :raises: :class:`asyncio.TimeoutError` if it lasts more than self.timeout
         """
-        start = time.time()
+        start = time.perf_counter()
+        if self._write_buffer is not None:
+            await self._write_buffer.close()
         ret = await self._close(*args, _conn=_conn, **kwargs)
-        logger.debug("CLOSE (%.4f)s", time.time() - start)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("CLOSE (%.4f)s", time.perf_counter() - start)
         return ret
 
     async def _close(self, *args, **kwargs):
         pass
 
+    def pipeline(self):
+        """
+        Returns a context manager that queues commands and executes all of them in a single
+        round trip to the backend when exiting::
+
+            async with cache.pipeline() as p:
+                value = p.get("a")
+                exists = p.exists("b")
+                p.increment("c")
+            print(value.result(), exists.result())
+
+        Queued commands return futures that are resolved once the pipeline is executed.
+        Serialization and namespacing are applied per command like with the normal commands,
+        plugins are not called. The whole execution is covered by ``self.timeout``.
+
+        Supported commands are ``add``, ``get``, ``multi_get``, ``set``, ``multi_set``,
+        ``delete``, ``exists``, ``increment``, ``expire``, ``ttl`` and ``multi_ttl``.
+        """
+        return _Pipeline(self)
+
+    async def _sync_writes(self, *ns_keys):
+        if self._write_buffer is not None and any(key in self._write_buffer for key in ns_keys):
+            await self._write_buffer.flush()
+
+    async def _flush_writes(self):
+        if self._write_buffer is not None:
+            await self._write_buffer.flush()
+
+    def register_loader(self, key, loader, ttl=None, soft_ttl=None, namespace=None):
+        """
+        Registers the coroutine function used to refresh the given key in the background
+        once its value is stale (see ``soft_ttl`` in :meth:`set`). The refreshed value is
+        stored with ``set`` using the given ``ttl`` and ``soft_ttl``. Only one refresh per key
+        runs at a time.
+
+        The loader is dropped once ``ttl`` passes without the key being refreshed or read
+        (extended by ``touch_on_read``), when the key is deleted or when more than
+        ``max_loaders`` are registered.
+
+        :param key: str
+        :param loader: coroutine function without arguments returning the new value
+        :param ttl: int the expiration time in seconds for the refreshed value
+        :param soft_ttl: int or float seconds after which the refreshed value is stale
+        :param namespace: str alternative namespace to use
+        """
+        ns_key = self._build_key(key, namespace=namespace)
+        expires = time.monotonic() + ttl if ttl else None
+        self._loaders.pop(ns_key, None)
+        self._loaders[ns_key] = _Loader(key, namespace, loader, ttl, soft_ttl, expires)
+        self._prune_loaders()
+
+    def unregister_loader(self, key, namespace=None):
+        self._loaders.pop(self._build_key(key, namespace=namespace), None)
+
+    def _prune_loaders(self):
+        # Oldest first, expired loaders behind a live one are dropped once they get in front
+        now = time.monotonic()
+        while self._loaders:
+            ns_key, entry = next(iter(self._loaders.items()))
+            if len(self._loaders) <= self.max_loaders and (
+                    entry.expires is None or entry.expires > now):
+                return
+            del self._loaders[ns_key]
+
+    def _use_loader(self, ns_key):
+        entry = self._loaders.get(ns_key)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if entry.expires is not None and entry.expires <= now:
+            del self._loaders[ns_key]
+            return None
+        if self.touch_on_read:
+            entry = entry._replace(expires=max(entry.expires or 0, now + self.touch_on_read))
+            self._loaders[ns_key] = entry
+        self._loaders.move_to_end(ns_key)
+        return entry
+
+    def _jitter(self, ttl):
+        if not self.ttl_jitter or not ttl:
+            return ttl
+        jittered = ttl * (1 + random.uniform(-self.ttl_jitter, self.ttl_jitter))
+        if isinstance(ttl, int):
+            return max(1, int(round(jittered)))
+        return jittered
+
+    def _jitter_many(self, ttl, count):
+        if not self.ttl_jitter or not ttl:
+            return ttl
+        return [self._jitter(ttl) for _ in range(count)]
+
+    async def _serialize(self, command, fn, values, loading=False, many=None):
+        """
+        Applies ``fn``, the dumps or loads function, to all the values or calls ``many`` with
+        all of them if passed (``dumps_many`` or ``loads_many`` of the serializer). If the
+        serializer has an ``offload_threshold`` and the values are at least that big, it's done
+        in the serializer ``executor`` instead of blocking the loop. The time the loop was
+        blocked is reported to the ``serialized`` plugin hook.
+        """
+        many = many or functools.partial(_apply, fn)
+        start = time.perf_counter()
+        offloaded = False
+        threshold = getattr(self._serializer, "offload_threshold", None)
+        if threshold is not None and values:
+            sizeof = _payload_size if loading else getattr(
+                self._serializer, "sizeof", sys.getsizeof)
+            offloaded = sum(map(sizeof, values)) >= threshold
+
+        if offloaded:
+            future = asyncio.get_event_loop().run_in_executor(
+                getattr(self._serializer, "executor", None), many, values)
+            took = time.perf_counter() - start
+            values = await future
+        else:
+            values = many(values)
+            took = time.perf_counter() - start
+
+        for plugin in self.plugins:
+            await plugin.serialized(self, command, took=took, offloaded=offloaded)
+        return values
+
+    def _wrap(self, value, ttl, soft_ttl=None, compute_time=None):
+        meta = {}
+        if soft_ttl is not None:
+            meta["soft"] = time.time() + soft_ttl
+        if compute_time is not None and ttl:
+            meta["exp"] = time.time() + ttl
+            meta["ct"] = compute_time
+        return _envelope.wrap(value, mark=self._envelope_mark, **meta) if meta else value
+
+    def _unwrap(self, ns_key, value):
+        value, meta = _envelope.unwrap(value, mark=self._envelope_mark)
+        if not meta:
+            return value
+
+        now = time.time()
+        # The stored expiry doesn't move when touch_on_read extends the ttl of the key
+        exp = None if self.touch_on_read else meta.get("exp")
+        # XFetch: now - delta * beta * ln(rand) >= expiry, rand in (0, 1]
+        if exp is not None and now - meta["ct"] * math.log(1 - random.random()) >= exp:
+            return None
+        soft = meta.get("soft")
+        if soft is not None:
+            entry = self._use_loader(ns_key)
+            if entry is not None and soft <= now:
+                self._schedule_refresh(ns_key, entry)
+        return value
+
+    def _schedule_refresh(self, ns_key, entry):
+        if ns_key in self._refreshing:
+            return
+        task = asyncio.ensure_future(self._refresh(entry))
+        self._refreshing[ns_key] = task
+        task.add_done_callback(functools.partial(self._refreshed, ns_key))
+
+    async def _refresh(self, entry):
+        value = await entry.loader()
+        await self.set(
+            entry.key, value, ttl=entry.ttl, soft_ttl=entry.soft_ttl, namespace=entry.namespace)
+        # Extends the loader to the new ttl of the key
+        self.register_loader(
+            entry.key, entry.loader, ttl=entry.ttl, soft_ttl=entry.soft_ttl,
+            namespace=entry.namespace)
+
+    def _refreshed(self, ns_key, task):
+        self._refreshing.pop(ns_key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                "Couldn't refresh %s, unexpected error", ns_key, exc_info=task.exception())
+
+    async def _pipeline(self, ops, _conn=None):
+        results = []
+        for cmd, args in ops:
+            try:
+                results.append(await getattr(self, "_" + cmd)(*args, _conn=_conn))
+            except Exception as e:
+                results.append(e)
+        return results
+
     def _build_key(self, key, namespace=None):
         if namespace is not None:
-            return "{}{}".format(namespace, key)
+            return self._normalize_key("{}{}".format(namespace, key))
         if self.namespace is not None:
-            return "{}{}".format(self.namespace, key)
-        return key
+            return self._normalize_key("{}{}".format(self.namespace, key))
+        return self._normalize_key(key)
+
+    def _normalize_key(self, key):
+        """
+        Replaces the tail of the keys longer than ``max_key_length`` with a digest of the whole
+        key, keeping the prefix readable. Works with str and bytes keys.
+        """
+        if self.max_key_length is None or not isinstance(key, (str, bytes)) or \
+                len(key) <= self.max_key_length:
+            return key
+        if isinstance(key, str):
+            digest = _key_digest(key.encode())
+            return "{}#{}".format(key[:self.max_key_length - _KEY_DIGEST_LENGTH - 1], digest)
+        digest = _key_digest(key).encode()
+        return key[:self.max_key_length - _KEY_DIGEST_LENGTH - 1] + b"#" + digest
 
     def _redlock(self, key, lease):
         return _RedLock(self, key, lease)
@@ -476,6 +951,47 @@ class BaseCache:
         pass
 
 
+def _apply(fn, values):
+    return [fn(value) for value in values]
+
+
+def _batch_fn(serializer, name, single_name):
+    """
+    Returns the ``dumps_many`` or ``loads_many`` of the serializer, or None if it doesn't have
+    it or if ``dumps``/``loads`` is overridden after it, i.e. by a subclass, which the batched
+    version wouldn't use.
+    """
+    attrs = getattr(serializer, "__dict__", {})
+    if name in attrs:
+        return attrs[name]
+    if single_name in attrs or not _batch_matches(type(serializer), name, single_name):
+        return None
+    return getattr(serializer, name)
+
+
+@functools.lru_cache(maxsize=128)
+def _batch_matches(cls, name, single_name):
+    owners = {}
+    for klass in cls.__mro__:
+        for attr in (name, single_name):
+            if attr in vars(klass):
+                owners.setdefault(attr, klass)
+    if name not in owners:
+        return False
+    return issubclass(owners[name], owners[single_name])
+
+
+def _payload_size(value):
+    return len(value) if isinstance(value, (str, bytes)) else 0
+
+
+def _per_key_ttls(ttl):
+    """
+    Iterates over per key ttls, ``ttl`` can be a single ttl for all the keys or a list.
+    """
+    return ttl if isinstance(ttl, list) else itertools.repeat(ttl)
+
+
 class _Conn:
 
     def __init__(self, cache):
@@ -503,3 +1019,128 @@ class _Conn:
 
 for cmd in API.CMDS:
     setattr(_Conn, cmd.__name__, _Conn._inject_conn(cmd.__name__))
+
+
+class _Pipeline:
+
+    def __init__(self, cache):
+        self._cache = cache
+        self._ops = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            for _, _, _, future in self._ops:
+                future.cancel()
+            self._ops = []
+            return
+        await self.execute()
+
+    def _queue(self, cmd, args, callback=None):
+        future = asyncio.get_event_loop().create_future()
+        self._ops.append((cmd, args, callback, future))
+        return future
+
+    def add(self, key, value, ttl=None, dumps_fn=None, namespace=None):
+        dumps = dumps_fn or self._cache.serializer.dumps
+        ns_key = self._cache._build_key(key, namespace=namespace)
+        return self._queue("add", (ns_key, dumps(value), self._cache._jitter(ttl)))
+
+    def get(self, key, default=None, loads_fn=None, namespace=None):
+        loads = loads_fn or self._cache.serializer.loads
+        ns_key = self._cache._build_key(key, namespace=namespace)
+        return self._queue(
+            "get", (ns_key, self._cache.serializer.encoding),
+            lambda value: self._loads(ns_key, value, loads, default))
+
+    def multi_get(self, keys, loads_fn=None, namespace=None, default=None):
+        loads = loads_fn or self._cache.serializer.loads
+        ns_keys = [self._cache._build_key(key, namespace=namespace) for key in keys]
+        return self._queue(
+            "multi_get", (ns_keys, self._cache.serializer.encoding),
+            lambda values: [
+                self._loads(ns_key, value, loads, default)
+                for ns_key, value in zip(ns_keys, values)])
+
+    def _loads(self, ns_key, value, loads, default):
+        value = self._cache._unwrap(ns_key, value)
+        return default if value is None else loads(value)
+
+    def set(
+            self, key, value, ttl=None, dumps_fn=None, namespace=None, soft_ttl=None,
+            compute_time=None):
+        dumps = dumps_fn or self._cache.serializer.dumps
+        ns_key = self._cache._build_key(key, namespace=namespace)
+        ttl = self._cache._jitter(ttl)
+        value = self._cache._wrap(dumps(value), ttl, soft_ttl, compute_time)
+        return self._queue("set", (ns_key, value, ttl), lambda ret: True)
+
+    def multi_set(self, pairs, ttl=None, dumps_fn=None, namespace=None, compute_time=None):
+        dumps = dumps_fn or self._cache.serializer.dumps
+        ttl = self._cache._jitter_many(ttl, len(pairs))
+        ns_pairs = [
+            (
+                self._cache._build_key(key, namespace=namespace),
+                self._cache._wrap(dumps(value), key_ttl, compute_time=compute_time))
+            for (key, value), key_ttl in zip(pairs, _per_key_ttls(ttl))]
+        return self._queue("multi_set", (ns_pairs, ttl), lambda ret: True)
+
+    def delete(self, key, namespace=None):
+        return self._queue("delete", (self._cache._build_key(key, namespace=namespace),))
+
+    def exists(self, key, namespace=None):
+        return self._queue("exists", (self._cache._build_key(key, namespace=namespace),))
+
+    def increment(self, key, delta=1, namespace=None):
+        return self._queue(
+            "increment", (self._cache._build_key(key, namespace=namespace), delta))
+
+    def expire(self, key, ttl, namespace=None):
+        return self._queue("expire", (self._cache._build_key(key, namespace=namespace), ttl))
+
+    def ttl(self, key, namespace=None):
+        return self._queue("ttl", (self._cache._build_key(key, namespace=namespace),))
+
+    def multi_ttl(self, keys, namespace=None):
+        return self._queue(
+            "multi_ttl", ([self._cache._build_key(key, namespace=namespace) for key in keys],))
+
+    async def execute(self):
+        """
+        Executes the queued commands in a single round trip and resolves their futures. Errors
+        are set in the future of the command that failed.
+
+        :returns: list with the results of the commands in the order they were queued
+        :raises: :class:`asyncio.TimeoutError` if it lasts more than the cache timeout
+        """
+        ops, self._ops = self._ops, []
+        if not ops:
+            return []
+
+        await self._cache._flush_writes()
+        try:
+            async with _Deadline(self._cache.timeout):
+                results = await self._cache._pipeline([(cmd, args) for cmd, args, _, _ in ops])
+        except asyncio.CancelledError:
+            for _, _, _, future in ops:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, _, _, future in ops:
+                future.set_exception(e)
+            raise
+
+        for (_, _, callback, future), result in zip(ops, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+                continue
+            try:
+                future.set_result(callback(result) if callback else result)
+            except Exception as e:
+                future.set_exception(e)
+
+        return [
+            future.exception() or future.result()
+            for _, _, _, future in ops]
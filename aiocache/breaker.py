@@ -0,0 +1,138 @@
+"""
+This module implements a circuit breaker you can attach to your cache instance with the
+``circuit_breaker`` option so a degraded backend doesn't make every command wait for the whole
+timeout.
+"""
+
+import time
+import asyncio
+
+from aiocache.log import logger
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_TRANSITIONS = {OPEN: "opened", HALF_OPEN: "half_opened", CLOSED: "closed"}
+
+
+class CircuitBreaker:
+    """
+    Stops calling the backend after ``failure_threshold`` consecutive failures (exceptions or
+    timeouts) happening within ``window`` seconds. While open, commands fail fast without
+    reaching the backend: reads behave like misses and writes are dropped. After
+    ``recovery_timeout`` seconds up to ``half_open_max_calls`` commands are let through to
+    probe the backend, the circuit closes again if they succeed and opens again otherwise.
+
+    State transitions call the ``circuit_opened``, ``circuit_half_opened`` and
+    ``circuit_closed`` hooks of the cache plugins with the cache as argument and are counted in
+    the ``counters`` dict attribute together with the ``failures`` and the ``rejected`` calls.
+
+    :param failure_threshold: int consecutive failures needed to open the circuit. Default is 5.
+    :param window: int or float seconds the consecutive failures have to happen in. Default
+        is 10.
+    :param recovery_timeout: int or float seconds to wait before probing the backend again once
+        open. Default is 30.
+    :param half_open_max_calls: int number of concurrent probe calls allowed. Default is 1.
+    :param exclude: tuple of exception classes that don't count as failures because the
+        backend did answer. Default is ``(ValueError, TypeError)``, raised by ``add`` on
+        existing keys and ``increment`` on non integer values.
+    """
+
+    def __init__(
+            self, failure_threshold=5, window=10, recovery_timeout=30,
+            half_open_max_calls=1, exclude=(ValueError, TypeError)):
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.exclude = exclude
+
+        self.state = CLOSED
+        self.counters = {
+            "opened": 0, "half_opened": 0, "closed": 0, "failures": 0, "rejected": 0}
+
+        self._failures = 0
+        self._first_failure = None
+        self._opened_at = None
+        self._probes = 0
+
+    async def call(self, client, func, fallback, *args, **kwargs):
+        """
+        Calls ``func(client, *args, **kwargs)`` if the circuit allows it, otherwise returns
+        ``fallback(client, *args, **kwargs)``.
+        """
+        if not await self._acquire(client):
+            self.counters["rejected"] += 1
+            return fallback(client, *args, **kwargs)
+
+        probe = self.state == HALF_OPEN
+        try:
+            ret = await func(client, *args, **kwargs)
+        except asyncio.CancelledError:
+            self._release(probe)
+            raise
+        except self.exclude:
+            self._release(probe)
+            await self._succeeded(client, probe)
+            raise
+        except Exception:
+            self._release(probe)
+            await self._failed(client)
+            raise
+
+        self._release(probe)
+        await self._succeeded(client, probe)
+        return ret
+
+    async def _acquire(self, client):
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.recovery_timeout:
+                return False
+            await self._transition(client, HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_max_calls:
+                return False
+            self._probes += 1
+        return True
+
+    def _release(self, probe):
+        if probe and self._probes:
+            self._probes -= 1
+
+    async def _succeeded(self, client, probe):
+        self._failures = 0
+        self._first_failure = None
+        if probe and self.state == HALF_OPEN:
+            await self._transition(client, CLOSED)
+
+    async def _failed(self, client):
+        self.counters["failures"] += 1
+        if self.state == HALF_OPEN:
+            await self._transition(client, OPEN)
+            return
+        if self.state == OPEN:
+            return
+
+        now = time.monotonic()
+        if self._first_failure is None or now - self._first_failure > self.window:
+            self._failures = 0
+            self._first_failure = now
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            await self._transition(client, OPEN)
+
+    async def _transition(self, client, state):
+        self.state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            self._failures = 0
+            self._first_failure = None
+            logger.warning("Circuit opened for %s", client)
+
+        transition = _TRANSITIONS[state]
+        self.counters[transition] += 1
+        for plugin in client.plugins:
+            await getattr(plugin, "circuit_{}".format(transition))(client)
@@ -1,12 +1,17 @@
+import time
 import asyncio
 import inspect
 import functools
 
 from aiocache.log import logger
 from aiocache import SimpleMemoryCache, caches
+from aiocache._deadline import _Deadline
 from aiocache.serializers import JsonSerializer
 
 
+_MISSING = object()
+
+
 class cached:
     """
     Caches the functions return value into a key generated with module_name, function_name and args.
@@ -15,14 +20,44 @@ class cached:
     An example would be endpoint and port for the RedisCache. You can send those args as
     kwargs and they will be propagated accordingly.
 
-    Each call will use the same connection through all the cache calls. If you expect high
-    concurrency for the function you are decorating, it will be safer if you set high pool sizes
-    (in case of using memcached or redis).
+    The cache commands take a connection from the cache pool only for their own round trip,
+    no connection is held while the decorated function runs, so concurrent calls share the
+    pool of the cache (in case of using memcached or redis) and the cache is never closed
+    by the decorator.
+
+    The ``get`` and ``set`` calls done for a single function call share the timeout of the cache,
+    the time spent executing the decorated function is not discounted from it.
+
+    Pass ``ttl_jitter`` to spread the ttl of the stored results (see
+    :class:`aiocache.base.BaseCache`).
+
+    Return values are cached even if they are falsy. ``None`` results are considered negative
+    results and can be stored with a different ``negative_ttl``.
+
+    With ``single_flight=True``, concurrent calls within the process that miss the same key
+    are coalesced: only the first one calls the function and stores the result, the rest
+    wait for it and receive the same result (or exception) without touching the cache.
 
     :param ttl: int seconds to store the function call. Default is None which means no expiration.
+    :param negative_ttl: int seconds to store ``None`` results. Default is None which means
+        using ``ttl``.
+    :param single_flight: bool to coalesce concurrent calls for the same key. Default is False.
+    :param soft_ttl: int or float seconds after which a cached result is stale. Stale results
+        are still returned (until ``ttl`` expires) while the function is called again in the
+        background to refresh them. Default is None which disables it.
+    :param xfetch_beta: float enabling probabilistic early expiration (XFetch) when ``ttl`` is
+        set. The time each call takes is stored with the result and reads recompute it before
+        ``ttl`` expires with a probability that grows as expiration approaches. Values above
+        1 favour earlier recomputations. Default is None which disables it.
+    :param refresh_ahead: :class:`aiocache.refresh.RefreshAhead` instance. Results read often
+        enough are recomputed in the background before their ``ttl`` expires and cold ones
+        are left to expire. Default is None which disables it.
     :param key: str value to set as key for the function return. Takes precedence over
-        key_from_attr param. If key and key_from_attr are not passed, it will use module_name
-        + function_name + args + kwargs
+        key_builder and key_from_attr params. If none of them are passed, it will use
+        module_name + function_name + args + kwargs
+    :param key_builder: Callable returning the key for a call. Receives the decorated function
+        and a dict with all the args of the call by name, defaults included. Takes precedence
+        over key_from_attr param.
     :param key_from_attr: str arg or kwarg name from the function to use as a key.
     :param cache: cache class to use when calling the ``set``/``get`` operations.
         Default is ``aiocache.SimpleMemoryCache``.
@@ -39,14 +74,23 @@ class cached:
 
     def __init__(
             self, ttl=None, key=None, key_from_attr=None, cache=SimpleMemoryCache,
-            serializer=JsonSerializer, plugins=None, alias=None, noself=False, **kwargs):
+            serializer=JsonSerializer, plugins=None, alias=None, noself=False,
+            negative_ttl=None, single_flight=False, soft_ttl=None, xfetch_beta=None,
+            refresh_ahead=None, key_builder=None, **kwargs):
         self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.single_flight = single_flight
+        self.soft_ttl = soft_ttl
+        self.xfetch_beta = xfetch_beta
+        self.refresh_ahead = refresh_ahead
         self.key = key
+        self.key_builder = key_builder
         self.key_from_attr = key_from_attr
         self.noself = noself
         self.alias = alias
         self.cache = None
-        self._conn = None
+        self._flights = {}
+        self._layout = None
 
         self._cache = cache
         self._serializer = serializer
@@ -55,7 +99,7 @@ class cached:
 
     @property
     def conn(self):
-        return self._conn
+        return self.cache
 
     def __call__(self, f):
 
@@ -65,6 +109,7 @@ class cached:
             self.cache = _get_cache(
                 cache=self._cache, serializer=self._serializer,
                 plugins=self._plugins, **self._kwargs)
+        self._layout = _ArgsLayout(f)
 
         @functools.wraps(f)
         async def wrapper(*args, **kwargs):
@@ -72,47 +117,112 @@ class cached:
         return wrapper
 
     async def decorator(self, f, *args, **kwargs):
-        self._conn = self.cache.get_connection()
+        budget = _Deadline(self.cache.timeout)
 
-        async with self._conn:
-            key = self.get_cache_key(f, args, kwargs)
+        key = self.get_cache_key(f, args, kwargs)
+        if key in self._flights:
+            return await asyncio.shield(self._flights[key])
 
+        async with budget:
             value = await self.get_from_cache(key)
-            if value is not None:
-                return value
-
-            result = await f(*args, **kwargs)
+        if value is not _MISSING:
+            return value
 
-            await self.set_in_cache(key, result)
+        if not self.single_flight:
+            return await self._call(key, f, args, kwargs, budget)
+        if key not in self._flights:
+            # The flight lasts until the result is stored so the callers arriving meanwhile
+            # wait for it instead of missing again
+            self._take_off(key, self._call(key, f, args, kwargs, budget))
+        return await asyncio.shield(self._flights[key])
+
+    async def _call(self, key, f, args, kwargs, budget):
+        start = time.perf_counter()
+        result = await f(*args, **kwargs)
+        compute_time = time.perf_counter() - start
+
+        if self.soft_ttl is not None:
+            self._register_loader(key, f, args, kwargs)
+        async with budget:
+            await self.set_in_cache(key, result, compute_time=compute_time)
+        self._track_refresh(key, f, args, kwargs, result)
 
         return result
 
+    def _register_loader(self, key, f, args, kwargs):
+        self.cache.register_loader(
+            key, functools.partial(f, *args, **kwargs),
+            ttl=self.ttl, soft_ttl=self.soft_ttl)
+
+    def _track_refresh(self, key, f, args, kwargs, value):
+        if self.refresh_ahead is not None:
+            self.refresh_ahead.track(
+                (self, key), functools.partial(self._refresh_ahead, key, f, args, kwargs),
+                self._set_kwargs(value)["ttl"])
+
+    async def _refresh_ahead(self, key, f, args, kwargs):
+        start = time.perf_counter()
+        result = await f(*args, **kwargs)
+        compute_time = time.perf_counter() - start
+        await self.cache.set(key, result, **self._set_kwargs(result, compute_time))
+        self._track_refresh(key, f, args, kwargs, result)
+
+    def _take_off(self, key, coro):
+        task = asyncio.ensure_future(coro)
+        self._flights[key] = task
+        task.add_done_callback(functools.partial(self._land, key))
+        return task
+
+    def _land(self, key, task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case all the callers were cancelled
+            task.exception()
+
     def get_cache_key(self, f, args, kwargs):
         if self.key:
             return self.key
 
-        args_dict = _get_args_dict(f, args, kwargs)
-        cache_key = args_dict.get(
-            self.key_from_attr, self._key_from_args(f, args, kwargs))
-        return cache_key
+        layout = _args_layout(self._layout, f)
+        if self.key_builder is not None:
+            return self.key_builder(f, layout.args_dict(args, kwargs))
+        if self.key_from_attr is not None:
+            cache_key = layout.get(self.key_from_attr, args, kwargs)
+            if cache_key is not _MISSING:
+                return cache_key
+        return self._key_from_args(f, args, kwargs)
 
     def _key_from_args(self, func, args, kwargs):
-        ordered_kwargs = sorted(kwargs.items())
-        return (func.__module__ or '') + func.__name__ + str(
-            args[1:] if self.noself else args) + str(ordered_kwargs)
+        layout = _args_layout(self._layout, func)
+        args_key = str(args[1:] if self.noself else args)
+        if not kwargs:
+            return layout.prefix + args_key + "[]"
+        return layout.prefix + args_key + str(sorted(kwargs.items()))
 
     async def get_from_cache(self, key):
         try:
-            value = await self.conn.get(key)
-            if value is not None:
-                asyncio.ensure_future(self.cache.close())
+            value = await self.conn.get(key, default=_MISSING)
+            if value is not _MISSING and self.refresh_ahead is not None:
+                self.refresh_ahead.hit((self, key))
             return value
         except Exception:
             logger.exception("Couldn't retrieve %s, unexpected error", key)
-
-    async def set_in_cache(self, key, value):
+            return _MISSING
+
+    def _set_kwargs(self, value, compute_time=None):
+        kwargs = {"ttl": self.ttl}
+        if value is None and self.negative_ttl is not None:
+            kwargs["ttl"] = self.negative_ttl
+        if self.soft_ttl is not None:
+            kwargs["soft_ttl"] = self.soft_ttl
+        if self.xfetch_beta is not None and compute_time is not None:
+            kwargs["compute_time"] = compute_time * self.xfetch_beta
+        return kwargs
+
+    async def set_in_cache(self, key, value, compute_time=None):
         try:
-            await self.conn.set(key, value, ttl=self.ttl)
+            await self.conn.set(key, value, **self._set_kwargs(value, compute_time))
         except Exception:
             logger.exception("Couldn't set %s in key %s, unexpected error", value, key)
 
@@ -126,16 +236,30 @@ class cached_stampede(cached):
     An example would be endpoint and port for the RedisCache. You can send those args as
     kwargs and they will be propagated accordingly.
 
-    This decorator doesn't reuse connections because it would lock the connection while its
-    locked waiting for the first call to finish calculating and this is counterproductive.
+    The ``get`` calls and the ``set`` done for a single function call share the timeout of the
+    cache, the time spent waiting for the lock or executing the decorated function is not
+    discounted from it.
 
     :param lease: int seconds to lock function call to avoid cache stampede effects.
         If 0 or None, no locking happens (default is 2). redis and memory backends support
         float ttls
     :param ttl: int seconds to store the function call. Default is None which means no expiration.
+    :param negative_ttl: int seconds to store ``None`` results. Default is None which means
+        using ``ttl``.
+    :param single_flight: bool to coalesce concurrent calls for the same key within the process
+        so only one of them goes through the lock. Default is False.
+    :param soft_ttl: int or float seconds after which a cached result is stale and refreshed in
+        the background. Default is None which disables it.
+    :param xfetch_beta: float enabling probabilistic early expiration (XFetch) when ``ttl`` is
+        set. Default is None which disables it.
+    :param refresh_ahead: :class:`aiocache.refresh.RefreshAhead` instance to recompute hot
+        results before they expire. Default is None which disables it.
     :param key: str value to set as key for the function return. Takes precedence over
-        key_from_attr param. If key and key_from_attr are not passed, it will use module_name
-        + function_name + args + kwargs
+        key_builder and key_from_attr params. If none of them are passed, it will use
+        module_name + function_name + args + kwargs
+    :param key_builder: Callable returning the key for a call. Receives the decorated function
+        and a dict with all the args of the call by name, defaults included. Takes precedence
+        over key_from_attr param.
     :param key_from_attr: str arg or kwarg name from the function to use as a key.
     :param cache: cache class to use when calling the ``set``/``get`` operations.
         Default is ``aiocache.SimpleMemoryCache``.
@@ -154,25 +278,40 @@ class cached_stampede(cached):
         super().__init__(**kwargs)
         self.lease = lease
 
-    @property
-    def conn(self):
-        return self.cache
-
     async def decorator(self, f, *args, **kwargs):
+        budget = _Deadline(self.cache.timeout)
+
         key = self.get_cache_key(f, args, kwargs)
+        if key in self._flights:
+            return await asyncio.shield(self._flights[key])
 
-        value = await self.get_from_cache(key)
-        if value is not None:
+        async with budget:
+            value = await self.get_from_cache(key)
+        if value is not _MISSING:
             return value
 
+        if not self.single_flight:
+            return await self._locked_call(key, f, args, kwargs, budget)
+        if key not in self._flights:
+            self._take_off(key, self._locked_call(key, f, args, kwargs, budget))
+        return await asyncio.shield(self._flights[key])
+
+    async def _locked_call(self, key, f, args, kwargs, budget):
         async with self.conn._redlock(key, self.lease):
-            value = await self.get_from_cache(key)
-            if value is not None:
+            async with budget:
+                value = await self.get_from_cache(key)
+            if value is not _MISSING:
                 return value
 
+            start = time.perf_counter()
             result = await f(*args, **kwargs)
+            compute_time = time.perf_counter() - start
 
-            await self.set_in_cache(key, result)
+            if self.soft_ttl is not None:
+                self._register_loader(key, f, args, kwargs)
+            async with budget:
+                await self.set_in_cache(key, result, compute_time=compute_time)
+            self._track_refresh(key, f, args, kwargs, result)
 
         return result
 
@@ -182,13 +321,48 @@ def _get_cache(
     return cache(serializer=serializer, plugins=plugins, **cache_kwargs)
 
 
-def _get_args_dict(func, args, kwargs):
-    defaults = {
-        arg_name: arg.default for arg_name, arg in inspect.signature(func).parameters.items()
-        if arg.default is not inspect._empty
-    }
-    args_names = func.__code__.co_varnames[:func.__code__.co_argcount]
-    return {**defaults, **dict(zip(args_names, args)), **kwargs}
+class _ArgsLayout:
+    """
+    Argument names, positions and defaults of a function plus the prefix of its default keys,
+    computed once when decorating it so calls don't inspect its signature again.
+    """
+
+    __slots__ = ("func", "prefix", "names", "positions", "defaults")
+
+    def __init__(self, func):
+        self.func = func
+        self.prefix = (func.__module__ or '') + func.__name__
+        self.names = func.__code__.co_varnames[:func.__code__.co_argcount]
+        self.positions = {name: index for index, name in enumerate(self.names)}
+        self.defaults = {
+            arg_name: arg.default
+            for arg_name, arg in inspect.signature(func).parameters.items()
+            if arg.default is not inspect.Parameter.empty
+        }
+
+    def args_dict(self, args, kwargs):
+        args_dict = dict(self.defaults)
+        args_dict.update(zip(self.names, args))
+        args_dict.update(kwargs)
+        return args_dict
+
+    def get(self, name, args, kwargs):
+        """
+        Returns the value of a single arg of the call without building the whole dict, or
+        ``_MISSING`` if it wasn't passed and has no default.
+        """
+        if name in kwargs:
+            return kwargs[name]
+        index = self.positions.get(name)
+        if index is not None and index < len(args):
+            return args[index]
+        return self.defaults.get(name, _MISSING)
+
+
+def _args_layout(layout, func):
+    if layout is not None and layout.func is func:
+        return layout
+    return _ArgsLayout(func)
 
 
 class multi_cached:
@@ -202,15 +376,28 @@ class multi_cached:
     If the attribute specified to be the key is an empty list, the cache will be ignored and
     the function will be called as expected.
 
-    Each call will use the same connection through all the cache calls. If you expect high
-    concurrency for the function you are decorating, it will be safer if you set high pool sizes
-    (in case of using memcached or redis).
+    The cache commands take a connection from the cache pool only for their own round trip,
+    no connection is held while the decorated function runs, so concurrent calls share the
+    pool of the cache (in case of using memcached or redis) and the cache is never closed
+    by the decorator.
+
+    The ``multi_get`` and ``multi_set`` calls done for a single function call share the timeout
+    of the cache, the time spent executing the decorated function is not discounted from it.
+
+    Pass ``ttl_jitter`` to spread the ttl of each stored key so keys returned by the same call
+    don't expire all at once (see :class:`aiocache.base.BaseCache`).
 
     :param keys_from_attr: arg or kwarg name from the function containing an iterable to use
         as keys to index in the cache.
     :param key_builder: Callable that allows to change the format of the keys before storing.
         Receives a dict with all the args of the function.
     :param ttl: int seconds to store the keys. Default is 0 which means no expiration.
+    :param negative_ttl: int seconds to store the keys with ``None`` values. Default is None
+        which means using ``ttl``.
+    :param xfetch_beta: float enabling probabilistic early expiration (XFetch) when ``ttl`` is
+        set. The time each call takes is stored with the results and reads recompute each key
+        before ``ttl`` expires with a probability that grows as expiration approaches. Values
+        above 1 favour earlier recomputations. Default is None which disables it.
     :param cache: cache class to use when calling the ``multi_set``/``multi_get`` operations.
         Default is ``aiocache.SimpleMemoryCache``.
     :param serializer: serializer instance to use when calling the ``dumps``/``loads``.
@@ -223,19 +410,26 @@ class multi_cached:
 
     def __init__(
             self, keys_from_attr, key_builder=None, ttl=0, cache=SimpleMemoryCache,
-            serializer=JsonSerializer, plugins=None, alias=None, **kwargs):
+            serializer=JsonSerializer, plugins=None, alias=None, negative_ttl=None,
+            xfetch_beta=None, **kwargs):
         self.keys_from_attr = keys_from_attr
         self.key_builder = key_builder
         self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.xfetch_beta = xfetch_beta
         self.alias = alias
         self.cache = None
-        self._conn = None
 
         self._cache = cache
         self._serializer = serializer
         self._plugins = plugins
         self._kwargs = kwargs
         self._key_builder = key_builder or (lambda x, args_dict: x)
+        self._layout = None
+
+    @property
+    def conn(self):
+        return self.cache
 
     def __call__(self, f):
         if self.alias:
@@ -244,6 +438,7 @@ class multi_cached:
             self.cache = _get_cache(
                 cache=self._cache, serializer=self._serializer,
                 plugins=self._plugins, **self._kwargs)
+        self._layout = _ArgsLayout(f)
 
         @functools.wraps(f)
         async def wrapper(*args, **kwargs):
@@ -251,31 +446,35 @@ class multi_cached:
         return wrapper
 
     async def decorator(self, f, *args, **kwargs):
-        self._conn = self.cache.get_connection()
-        async with self._conn:
-            missing_keys = []
-            partial = {}
-            keys = self.get_cache_keys(f, args, kwargs)
+        budget = _Deadline(self.cache.timeout)
 
-            values = await self.get_from_cache(*keys)
-            for key, value in zip(keys, values):
-                if value is None:
-                    missing_keys.append(key)
-                else:
-                    partial[key] = value
-            kwargs[self.keys_from_attr] = missing_keys
-            if values and None not in values:
-                return partial
-
-            result = await f(*args, **kwargs)
-            result.update(partial)
+        missing_keys = []
+        partial = {}
+        keys = self.get_cache_keys(f, args, kwargs)
 
-            await self.set_in_cache(result)
+        async with budget:
+            values = await self.get_from_cache(*keys)
+        for key, value in zip(keys, values):
+            if value is _MISSING:
+                missing_keys.append(key)
+            else:
+                partial[key] = value
+        kwargs[self.keys_from_attr] = missing_keys
+        if values and not missing_keys:
+            return partial
+
+        start = time.perf_counter()
+        result = await f(*args, **kwargs)
+        compute_time = time.perf_counter() - start
+        result.update(partial)
+
+        async with budget:
+            await self.set_in_cache(result, compute_time=compute_time)
 
         return result
 
     def get_cache_keys(self, f, args, kwargs):
-        args_dict = _get_args_dict(f, args, kwargs)
+        args_dict = _args_layout(self._layout, f).args_dict(args, kwargs)
         keys = args_dict[self.keys_from_attr]
         return [self._key_builder(key, args_dict) for key in keys]
 
@@ -283,16 +482,24 @@ class multi_cached:
         if not keys:
             return []
         try:
-            values = await self._conn.multi_get(keys)
-            if None not in values:
-                asyncio.ensure_future(self.cache.close())
-            return values
+            return await self.conn.multi_get(keys, default=_MISSING)
         except Exception:
             logger.exception("Couldn't retrieve %s, unexpected error", keys)
-            return [None] * len(keys)
+            return [_MISSING] * len(keys)
 
-    async def set_in_cache(self, result):
+    async def set_in_cache(self, result, compute_time=None):
+        pairs = [(k, v) for k, v in result.items()]
+        kwargs = {}
+        if self.xfetch_beta is not None and compute_time is not None:
+            kwargs["compute_time"] = compute_time * self.xfetch_beta
         try:
-            await self._conn.multi_set([(k, v) for k, v in result.items()], ttl=self.ttl)
+            if self.negative_ttl is not None:
+                negative_pairs = [(k, v) for k, v in pairs if v is None]
+                pairs = [(k, v) for k, v in pairs if v is not None]
+                if negative_pairs:
+                    await self.conn.multi_set(
+                        negative_pairs, ttl=self.negative_ttl, **kwargs)
+            if pairs:
+                await self.conn.multi_set(pairs, ttl=self.ttl, **kwargs)
         except Exception:
             logger.exception("Couldn't set %s, unexpected error", result)
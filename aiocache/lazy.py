@@ -0,0 +1,89 @@
+"""
+This module implements the proxy returned by ``get`` and ``multi_get`` when passing
+``lazy=True``, which defers deserializing the value until it's used.
+"""
+
+
+_UNLOADED = object()
+
+
+class LazyValue:
+    """
+    Holds a value as returned by the backend and deserializes it the first time it's accessed,
+    through any attribute, item, iteration, comparison or :attr:`value`. The result is kept so
+    it's deserialized once.
+
+    :attr:`raw` gives the serialized value as stored, i.e. to return a cached json directly as
+    an http body without a ``loads`` and ``dumps`` round trip.
+    """
+
+    __slots__ = ("_raw", "_loads", "_value")
+
+    def __init__(self, raw, loads):
+        self._raw = raw
+        self._loads = loads
+        self._value = _UNLOADED
+
+    @property
+    def raw(self):
+        """
+        The serialized value, str or bytes depending on the serializer encoding.
+        """
+        return self._raw
+
+    @property
+    def loaded(self):
+        """
+        Whether the value has been deserialized already.
+        """
+        return self._value is not _UNLOADED
+
+    @property
+    def value(self):
+        """
+        The deserialized value.
+        """
+        if self._value is _UNLOADED:
+            self._value = self._loads(self._raw)
+        return self._value
+
+    def __bytes__(self):
+        if isinstance(self._raw, str):
+            return self._raw.encode()
+        return bytes(self._raw)
+
+    def __getattr__(self, name):
+        return getattr(self.value, name)
+
+    def __getitem__(self, key):
+        return self.value[key]
+
+    def __contains__(self, item):
+        return item in self.value
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def __len__(self):
+        return len(self.value)
+
+    def __bool__(self):
+        return bool(self.value)
+
+    def __eq__(self, other):
+        if isinstance(other, LazyValue):
+            other = other.value
+        return self.value == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __str__(self):
+        return str(self.value)
+
+    def __repr__(self):
+        if self._value is _UNLOADED:
+            return "<LazyValue unloaded>"
+        return "<LazyValue {!r}>".format(self._value)
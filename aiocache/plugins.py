@@ -3,7 +3,11 @@ This module implements different plugins you can attach to your cache instance.
 are coded in a collaborative so you can use multiple inheritance.
 """
 
+import random
+import logging
+
 from aiocache.base import API
+from aiocache.log import logger
 
 
 class BasePlugin:
@@ -21,13 +25,19 @@ BasePlugin.add_hook(
     BasePlugin.do_nothing, ["pre_{}".format(method.__name__) for method in API.CMDS])
 BasePlugin.add_hook(
     BasePlugin.do_nothing, ["post_{}".format(method.__name__) for method in API.CMDS])
+BasePlugin.add_hook(
+    BasePlugin.do_nothing,
+    ["circuit_opened", "circuit_half_opened", "circuit_closed", "serialized"])
 
 
 class TimingPlugin(BasePlugin):
     """
     Calculates average, min and max times each command takes. The data is saved
     in the cache class as a dict attribute called ``profiling``. For example, to
-    access the average time of the operation get, you can do ``cache.profiling['get_avg']``
+    access the average time of the operation get, you can do ``cache.profiling['get_avg']``.
+
+    The time the loop was blocked serializing or deserializing the values of each command is
+    saved too, i.e. ``cache.profiling['get_serialization_max']``.
     """
 
     @classmethod
@@ -51,6 +61,9 @@ class TimingPlugin(BasePlugin):
 
         return do_save_time
 
+    async def serialized(self, client, command, took=0, **kwargs):
+        await self.save_time("{}_serialization".format(command))(self, client, took=took)
+
 
 for method in API.CMDS:
     TimingPlugin.add_hook(
@@ -64,20 +77,20 @@ class HitMissRatioPlugin(BasePlugin):
     you can do ``cache.hit_miss_ratio['hit_ratio']``. It also provides the "total" and "hits"
     keys.
     """
-    async def post_get(self, client, key, took=0, ret=None):
+    async def post_get(self, client, key, took=0, ret=None, default=None, **kwargs):
         if not hasattr(client, "hit_miss_ratio"):
             client.hit_miss_ratio = {}
             client.hit_miss_ratio["total"] = 0
             client.hit_miss_ratio["hits"] = 0
 
         client.hit_miss_ratio["total"] += 1
-        if ret is not None:
+        if ret is not default:
             client.hit_miss_ratio["hits"] += 1
 
         client.hit_miss_ratio['hit_ratio'] = \
             client.hit_miss_ratio["hits"] / client.hit_miss_ratio["total"]
 
-    async def post_multi_get(self, client, keys, took=0, ret=None):
+    async def post_multi_get(self, client, keys, took=0, ret=None, default=None, **kwargs):
         if not hasattr(client, "hit_miss_ratio"):
             client.hit_miss_ratio = {}
             client.hit_miss_ratio["total"] = 0
@@ -85,8 +98,55 @@ class HitMissRatioPlugin(BasePlugin):
 
         client.hit_miss_ratio["total"] += len(keys)
         for result in ret:
-            if result is not None:
+            if result is not default:
                 client.hit_miss_ratio["hits"] += 1
 
         client.hit_miss_ratio['hit_ratio'] = \
             client.hit_miss_ratio["hits"] / client.hit_miss_ratio["total"]
+
+
+class LoggingPlugin(BasePlugin):
+    """
+    Emits a structured log record for a sample of the commands executed. Nothing is built for
+    the commands that are not sampled so it can be left attached in production with a low
+    ``sample_rate``. The record message is ``"<CMD> <key> (<took>)s"`` and the fields are
+    available in the ``aiocache`` attribute of the ``logging.LogRecord`` as a dict with the
+    keys ``cmd``, ``key``, ``took`` and ``ret``. For ``get`` and ``multi_get``, ``ret`` is the
+    number of hits instead of the values retrieved.
+
+    :param sample_rate: float between 0 and 1 with the ratio of commands to log. Default is 1.
+    :param level: int logging level to use for the records. Default is ``logging.INFO``.
+    :param logger: ``logging.Logger`` to emit the records with. Default is ``aiocache.log.logger``.
+    """
+
+    def __init__(self, sample_rate=1, level=logging.INFO, logger=logger):
+        self.sample_rate = sample_rate
+        self.level = level
+        self.logger = logger
+
+    @classmethod
+    def log_record(cls, method):
+
+        async def do_log_record(self, client, *args, took=0, ret=None, **kwargs):
+            if random.random() >= self.sample_rate or not self.logger.isEnabledFor(self.level):
+                return
+
+            key = args[0] if args else None
+            if method == "multi_set" and key is not None:
+                key = [pair[0] for pair in key]
+            default = kwargs.get("default")
+            if method == "get":
+                ret = int(ret is not default)
+            elif method == "multi_get":
+                ret = len([value for value in ret if value is not default])
+            record = {"cmd": method, "key": key, "took": took, "ret": ret}
+            self.logger.log(
+                self.level, "%s %s (%.4f)s", method.upper(), key, took,
+                extra={"aiocache": record})
+
+        return do_log_record
+
+
+for method in API.CMDS:
+    LoggingPlugin.add_hook(
+        LoggingPlugin.log_record(method.__name__), ["post_{}".format(method.__name__)])
@@ -0,0 +1,100 @@
+"""
+This module implements a refresh-ahead scheduler you can pass to the ``cached`` decorators so
+popular results are recomputed before they expire.
+"""
+
+import asyncio
+
+from aiocache.log import logger
+
+
+class RefreshAhead:
+    """
+    Refreshes the tracked keys ``fraction`` of their ttl before they expire if they have been
+    read often enough since they were stored. Keys read less than ``min_rate`` times per second
+    (or never read) are left to expire.
+
+    Refreshes run in background tasks, at most ``max_concurrency`` at a time. A key stops being
+    tracked if its refresh fails and the next miss tracks it again.
+
+    :param fraction: float between 0 and 1 with the part of the ttl left when the key is
+        refreshed. Default is 0.2.
+    :param min_rate: int or float minimum reads per second since the key was stored for it to
+        be refreshed. Keys must have been read at least once. Default is 0.
+    :param max_concurrency: int max number of refreshes running at the same time. Default is 4.
+    """
+
+    def __init__(self, fraction=0.2, min_rate=0, max_concurrency=4):
+        self.fraction = fraction
+        self.min_rate = min_rate
+        self.max_concurrency = max_concurrency
+        self._entries = {}
+        self._tasks = set()
+        self._semaphore = None
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def track(self, key, refresh, ttl):
+        """
+        Starts tracking the key, replacing any previous tracking for it.
+
+        :param key: hashable identifying the key
+        :param refresh: coroutine function without arguments that recomputes and stores the
+            value, it's expected to call ``track`` again
+        :param ttl: int or float ttl the value was stored with. Keys without ttl are not
+            tracked
+        """
+        self.forget(key)
+        if not ttl:
+            return
+        loop = asyncio.get_event_loop()
+        handle = loop.call_later(ttl * (1 - self.fraction), self._due, key)
+        self._entries[key] = [0, loop.time(), handle, refresh]
+
+    def hit(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[0] += 1
+
+    def forget(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry[2].cancel()
+
+    def _due(self, key):
+        entry = self._entries[key]
+        hits, stored_at, _, _ = entry
+        elapsed = asyncio.get_event_loop().time() - stored_at
+        if not hits or hits / elapsed < self.min_rate:
+            del self._entries[key]
+            return
+
+        task = asyncio.ensure_future(self._refresh(key, entry))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key, entry):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        try:
+            async with self._semaphore:
+                if self._entries.get(key) is entry:
+                    await entry[3]()
+        except Exception:
+            logger.exception("Couldn't refresh ahead %s, unexpected error", key)
+        finally:
+            # Not tracked again by the refresh, let it expire
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+
+    async def close(self):
+        """
+        Stops tracking all the keys and cancels the running refreshes.
+        """
+        for key in list(self._entries):
+            self.forget(key)
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.wait(list(self._tasks))
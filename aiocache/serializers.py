@@ -7,7 +7,41 @@ except ImportError:
     logger.warning("ujson module not found, usin json")
     import json
 
+try:
+    import msgpack
+except ImportError:
+    logger.info("msgpack module not found, MsgPackSerializer unavailable")
+    msgpack = None
+
+import bz2
+import sys
+import zlib
+import uuid
 import pickle
+import decimal
+import datetime
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+try:
+    import numpy
+except ImportError:
+    logger.info("numpy module not found, NumpySerializer unavailable")
+    numpy = None
+
+import struct
+from collections import namedtuple
+
+from aiocache.factory import _class_from_string
+
+
+# msgpack>=0.6.1 only loads str and bytes map keys unless told otherwise
+_MSGPACK_LOADS_OPTIONS = {"raw": False}
+if msgpack is not None and msgpack.version >= (0, 6, 1):
+    _MSGPACK_LOADS_OPTIONS["strict_map_key"] = False
 
 
 class StringSerializer:
@@ -20,11 +54,52 @@ class StringSerializer:
 
     If you want to keep python types, use ``PickleSerializer``. ``JsonSerializer``
     may also be useful to keep type of symple python types.
+
+    All serializers accept these options to avoid blocking the loop with big values:
+
+    :param offload_threshold: int size in bytes from which values are serialized and
+        deserialized in ``executor`` instead of the event loop. The size of the values to
+        dump is estimated with :meth:`sizeof`. Default is None which disables it.
+    :param executor: :class:`concurrent.futures.Executor` to use. A ``ProcessPoolExecutor``
+        avoids the GIL with pure python serializers but the values, and the serializer for
+        the ones configured per instance, are pickled to send them to the workers. The
+        executor is left out of the pickled serializer. Default is None which uses the loop
+        default executor.
     """
     encoding = 'utf-8'
+    offload_threshold = None
+    executor = None
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, offload_threshold=None, executor=None, **kwargs):
         super().__init__(*args, **kwargs)
+        self.offload_threshold = offload_threshold
+        self.executor = executor
+
+    def __getstate__(self):
+        # Executors can't be pickled, the copies sent to process pool workers don't need it
+        state = self.__dict__.copy()
+        state.pop("executor", None)
+        return state
+
+    def sizeof(self, value):
+        """
+        Estimates the size in bytes of a value before dumping it. Uses the length of str and
+        bytes, ``nbytes`` for arrays and ``sys.getsizeof`` of the value and its items for
+        lists, tuples, sets and dicts. Override it for a better estimation of your values.
+
+        :param value: obj
+        :returns: int
+        """
+        if isinstance(value, (str, bytes, bytearray)):
+            return len(value)
+        if hasattr(value, "nbytes"):
+            return value.nbytes
+        size = sys.getsizeof(value)
+        if isinstance(value, dict):
+            size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            size += sum(map(sys.getsizeof, value))
+        return size
 
     @classmethod
     def dumps(cls, value):
@@ -44,6 +119,20 @@ class StringSerializer:
         return value
 
 
+class NullSerializer(StringSerializer):
+    """
+    Doesn't transform the values. Useful for the memory cache when you want to get back the
+    same object you stored or for caches composing others that serialize on their own.
+    """
+
+    @classmethod
+    def dumps(cls, value):
+        """
+        Returns value back without transformations
+        """
+        return value
+
+
 class PickleSerializer(StringSerializer):
     """
     Transform data to bytes using pickle.dumps and pickle.loads to retrieve it back.
@@ -100,3 +189,555 @@ class JsonSerializer(StringSerializer):
         if value is None:
             return None
         return json.loads(value)
+
+    @classmethod
+    def loads_many(cls, values):
+        """
+        Deserialize a list of values parsing them as a single json array, used by
+        ``multi_get``. Values that don't parse one element each, like ``"1, 2"``, make it fall
+        back to loading them one by one.
+
+        :param values: list of str
+        :returns: list of objs
+        """
+        loaded = json.loads("[{}]".format(",".join(values)))
+        if len(loaded) != len(values):
+            return [cls.loads(value) for value in values]
+        return loaded
+
+
+class MsgPackSerializer(StringSerializer):
+    """
+    Transform data to bytes using msgpack.packb and msgpack.unpackb to retrieve it back. Values
+    are kept as bytes end to end. Besides the msgpack types, ``datetime.datetime``,
+    ``datetime.date``, ``decimal.Decimal`` and ``uuid.UUID`` are stored as ext types and
+    loaded back with their type. Tuples are loaded back as lists. Dicts keep their int, float
+    or bool keys.
+
+    Needs the ``msgpack`` package. Subclasses can support more types extending
+    ``ext_dumps`` and ``ext_loads``.
+    """
+    encoding = None
+
+    EXT_DATETIME = 1
+    EXT_DATE = 2
+    EXT_DECIMAL = 3
+    EXT_UUID = 4
+
+    def __init__(self, *args, **kwargs):
+        if msgpack is None:
+            raise RuntimeError("msgpack module not found, needed by MsgPackSerializer")
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def dumps(cls, value):
+        """
+        Serialize the received value using ``msgpack.packb``.
+
+        :param value: obj
+        :returns: bytes
+        """
+        return msgpack.packb(value, use_bin_type=True, default=cls.ext_dumps)
+
+    @classmethod
+    def loads(cls, value):
+        """
+        Deserialize value using ``msgpack.unpackb``.
+
+        :param value: bytes
+        :returns: obj
+        """
+        if value is None:
+            return None
+        return msgpack.unpackb(value, ext_hook=cls.ext_loads, **_MSGPACK_LOADS_OPTIONS)
+
+    @classmethod
+    def dumps_many(cls, values):
+        """
+        Serialize a list of values reusing the same packer, used by ``multi_set``.
+
+        :param values: list of objs
+        :returns: list of bytes
+        """
+        packer = msgpack.Packer(use_bin_type=True, default=cls.ext_dumps)
+        return [packer.pack(value) for value in values]
+
+    @classmethod
+    def loads_many(cls, values):
+        """
+        Deserialize a list of values feeding them to a single unpacker, used by
+        ``multi_get``.
+
+        :param values: list of bytes
+        :returns: list of objs
+        """
+        unpacker = msgpack.Unpacker(ext_hook=cls.ext_loads, **_MSGPACK_LOADS_OPTIONS)
+        unpacker.feed(b"".join(values))
+        return list(unpacker)
+
+    @classmethod
+    def ext_dumps(cls, value):
+        """
+        Converts the values msgpack doesn't support to ``msgpack.ExtType``.
+
+        :param value: obj
+        :returns: :class:`msgpack.ExtType`
+        :raises: TypeError if the type is not supported
+        """
+        if isinstance(value, datetime.datetime):
+            offset = value.utcoffset()
+            return msgpack.ExtType(cls.EXT_DATETIME, msgpack.packb([
+                value.year, value.month, value.day, value.hour, value.minute, value.second,
+                value.microsecond, offset.total_seconds() if offset is not None else None]))
+        if isinstance(value, datetime.date):
+            return msgpack.ExtType(
+                cls.EXT_DATE, msgpack.packb([value.year, value.month, value.day]))
+        if isinstance(value, decimal.Decimal):
+            return msgpack.ExtType(cls.EXT_DECIMAL, str(value).encode())
+        if isinstance(value, uuid.UUID):
+            return msgpack.ExtType(cls.EXT_UUID, value.bytes)
+        raise TypeError("Can't serialize {!r} with msgpack".format(value))
+
+    @classmethod
+    def ext_loads(cls, code, data):
+        """
+        Converts the ext types back to their python type.
+
+        :param code: int ext type code
+        :param data: bytes
+        :returns: obj
+        """
+        if code == cls.EXT_DATETIME:
+            *fields, offset = msgpack.unpackb(data)
+            tzinfo = None
+            if offset is not None:
+                tzinfo = datetime.timezone(datetime.timedelta(seconds=offset))
+            return datetime.datetime(*fields, tzinfo=tzinfo)
+        if code == cls.EXT_DATE:
+            return datetime.date(*msgpack.unpackb(data))
+        if code == cls.EXT_DECIMAL:
+            return decimal.Decimal(data.decode())
+        if code == cls.EXT_UUID:
+            return uuid.UUID(bytes=data)
+        return msgpack.ExtType(code, data)
+
+
+def _create_serializer(serializer):
+    """
+    Returns the serializer as it is or creates it if it's a dict config with its ``class``.
+    """
+    if not isinstance(serializer, dict):
+        return serializer
+    serializer = dict(serializer)
+    cls = serializer.pop("class")
+    cls = _class_from_string(cls) if isinstance(cls, str) else cls
+    return cls(**serializer)
+
+
+def _dumps_bytes(serializer, value):
+    payload = serializer.dumps(value)
+    if isinstance(payload, str):
+        payload = payload.encode(serializer.encoding or "utf-8")
+    return payload
+
+
+def _loads_bytes(serializer, payload):
+    if serializer.encoding is not None:
+        payload = payload.decode(serializer.encoding)
+    return serializer.loads(payload)
+
+
+class CompressionSerializer(StringSerializer):
+    """
+    Wraps another serializer and compresses its output when it's bigger than ``min_size``
+    bytes. Each value is prefixed with a byte telling the codec used (or that it's not
+    compressed) so values written with any codec or threshold can always be read back.
+
+    Can be configured with ``caches.set_config`` passing the wrapped serializer config as a
+    dict::
+
+        'serializer': {
+            'class': "aiocache.serializers.CompressionSerializer",
+            'serializer': {'class': "aiocache.serializers.JsonSerializer"},
+            'codec': "zlib",
+            'level': 6,
+            'min_size': 1024
+        }
+
+    :param serializer: serializer instance or dict with its ``class`` and arguments. Default
+        is :class:`PickleSerializer`.
+    :param codec: str, one of ``"zlib"``, ``"lzma"`` or ``"bz2"``. Default is ``"zlib"``.
+    :param level: int compression level (``preset`` for lzma). Default is None which uses
+        the codec default.
+    :param min_size: int size in bytes from which values are compressed. Default is 1024.
+    """
+    encoding = None
+
+    RAW = b"\x00"
+    CODECS = {
+        "zlib": b"z",
+        "lzma": b"x",
+        "bz2": b"b",
+    }
+
+    def __init__(self, serializer=None, codec="zlib", level=None, min_size=1024, **kwargs):
+        super().__init__(**kwargs)
+        if codec not in self.CODECS:
+            raise ValueError("Unknown codec {}".format(codec))
+        if codec == "lzma" and lzma is None:
+            raise RuntimeError("lzma module not found")
+        self.serializer = _create_serializer(serializer) or PickleSerializer()
+        self.codec = codec
+        self.level = level
+        self.min_size = min_size
+
+    def dumps(self, value):
+        """
+        Serialize the value with the wrapped serializer and compress it if it's big enough.
+
+        :param value: obj
+        :returns: bytes
+        """
+        payload = self._encode(value)
+        if len(payload) < self.min_size:
+            return self.RAW + payload
+        return self.CODECS[self.codec] + self._compress(payload)
+
+    def loads(self, value):
+        """
+        Decompress the value if needed and deserialize it with the wrapped serializer.
+
+        :param value: bytes
+        :returns: obj
+        """
+        if value is None:
+            return None
+        return _loads_bytes(self.serializer, self._decompress(value[:1], value[1:]))
+
+    def _encode(self, value):
+        return _dumps_bytes(self.serializer, value)
+
+    def _compress(self, payload):
+        if self.codec == "zlib":
+            return zlib.compress(payload, -1 if self.level is None else self.level)
+        if self.codec == "lzma":
+            return lzma.compress(payload, preset=self.level)
+        return bz2.compress(payload, 9 if self.level is None else self.level)
+
+    def _decompress(self, marker, payload):
+        if marker == self.CODECS["zlib"]:
+            return zlib.decompress(payload)
+        if marker == self.CODECS["lzma"]:
+            return lzma.decompress(payload)
+        if marker == self.CODECS["bz2"]:
+            return bz2.decompress(payload)
+        if marker != self.RAW:
+            raise ValueError("Unknown compression marker {!r}".format(marker))
+        return payload
+
+
+class ZDictSerializer(CompressionSerializer):
+    """
+    Compresses each value with zlib primed with a preset dictionary, which works much better
+    than plain compression for small values sharing most of their content, like json objects
+    with the same keys. Build the dictionary from a sample of values with :meth:`train`.
+
+    Dictionaries are identified by a version number (0 to 255) stored in each value. Values are
+    written with ``version`` and read with the dictionary of the version they were written
+    with, so to replace a dictionary add a new version and keep the old ones until the values
+    using them expire. Every process must be configured with the same dictionaries, either
+    passing the bytes or the path of a file with them as saved by :meth:`save`::
+
+        'serializer': {
+            'class': "aiocache.serializers.ZDictSerializer",
+            'serializer': {'class': "aiocache.serializers.JsonSerializer"},
+            'dictionaries': {1: "/etc/myapp/cache-v1.zdict", 2: "/etc/myapp/cache-v2.zdict"},
+            'version': 2
+        }
+
+    Values written by :class:`CompressionSerializer` can be read too.
+
+    :param serializer: serializer instance or dict with its ``class`` and arguments. Default
+        is :class:`PickleSerializer`.
+    :param dictionaries: dict with int versions as keys and bytes or file paths as values.
+    :param version: int version of the dictionary used to write. Default is the highest one.
+    :param level: int zlib compression level. Default is None which uses the zlib default.
+    :param min_size: int size in bytes from which values are compressed. Default is 0.
+    """
+
+    ZDICT = b"d"
+
+    def __init__(
+            self, serializer=None, dictionaries=None, version=None, level=None, min_size=0,
+            **kwargs):
+        super().__init__(serializer=serializer, level=level, min_size=min_size, **kwargs)
+        self.dictionaries = {}
+        for number, dictionary in (dictionaries or {}).items():
+            if not 0 <= int(number) <= 255:
+                raise ValueError("Dictionary versions must be between 0 and 255")
+            if isinstance(dictionary, str):
+                with open(dictionary, "rb") as f:
+                    dictionary = f.read()
+            self.dictionaries[int(number)] = dictionary
+        if version is None and self.dictionaries:
+            version = max(self.dictionaries)
+        if version is not None and version not in self.dictionaries:
+            raise ValueError("Missing dictionary for version {}".format(version))
+        self.version = version
+
+    @classmethod
+    def train(cls, values, size=32768, serializer=None):
+        """
+        Builds a dictionary from a sample of values. The serialized values appearing more often
+        are put at the end of the dictionary, where zlib finds them cheaper to reference.
+
+        :param values: iterable with sample values, as passed to ``dumps``
+        :param size: int max size in bytes of the dictionary. zlib only uses the last 32KB.
+        :param serializer: serializer used to serialize the values. Default is
+            :class:`PickleSerializer`.
+        :returns: bytes
+        """
+        serializer = cls(serializer=serializer)
+        counts = {}
+        for value in values:
+            payload = serializer._encode(value)
+            counts[payload] = counts.get(payload, 0) + 1
+
+        dictionary = b""
+        for payload in sorted(counts, key=counts.get, reverse=True):
+            if len(dictionary) + len(payload) > size:
+                break
+            dictionary = payload + dictionary
+        return dictionary
+
+    @staticmethod
+    def save(dictionary, path):
+        """
+        Stores a dictionary in a file that can be passed in ``dictionaries``.
+
+        :param dictionary: bytes
+        :param path: str
+        """
+        with open(path, "wb") as f:
+            f.write(dictionary)
+
+    def dumps(self, value):
+        """
+        Serialize the value with the wrapped serializer and compress it with the dictionary
+        of ``version``.
+
+        :param value: obj
+        :returns: bytes
+        """
+        if self.version is None:
+            return super().dumps(value)
+        payload = self._encode(value)
+        if len(payload) < self.min_size:
+            return self.RAW + payload
+        compressor = zlib.compressobj(
+            -1 if self.level is None else self.level, zdict=self.dictionaries[self.version])
+        return (
+            self.ZDICT + bytes((self.version,)) + compressor.compress(payload) +
+            compressor.flush())
+
+    def _decompress(self, marker, payload):
+        if marker != self.ZDICT:
+            return super()._decompress(marker, payload)
+        version = payload[0]
+        if version not in self.dictionaries:
+            raise ValueError("Unknown compression dictionary version {}".format(version))
+        decompressor = zlib.decompressobj(zdict=self.dictionaries[version])
+        return decompressor.decompress(payload[1:]) + decompressor.flush()
+
+
+_ArrayRef = namedtuple("_ArrayRef", "index")
+
+
+class NumpySerializer(StringSerializer):
+    """
+    Stores numpy arrays as their raw buffer after a small header with their dtype, shape and
+    order, so they are copied once when dumping and not at all when loading: ``loads`` returns
+    read only ``numpy.frombuffer`` views over the received bytes. Copy them if you need to
+    modify them.
+
+    Lists, tuples and dicts (nested too) containing arrays are supported, the rest of the
+    value is pickled in the header. Arrays of objects are pickled too.
+
+    Needs the ``numpy`` package.
+    """
+    encoding = None
+
+    MAGIC = b"NPY\x00"
+    ALIGNMENT = 64
+    _HEADER = struct.Struct("<4sI")
+
+    def __init__(self, *args, **kwargs):
+        if numpy is None:
+            raise RuntimeError("numpy module not found, needed by NumpySerializer")
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def dumps(cls, value):
+        """
+        Serialize the value writing the buffers of its arrays after the header.
+
+        :param value: array, or list, tuple or dict containing arrays
+        :returns: bytes
+        """
+        arrays = []
+        skeleton = cls._extract(value, arrays)
+
+        metas, buffers = [], []
+        offset = 0
+        for array in arrays:
+            fortran = array.flags.f_contiguous and not array.flags.c_contiguous
+            if fortran:
+                buffer = array.T
+            else:
+                buffer = numpy.ascontiguousarray(array)
+            buffer = buffer.reshape(-1).view(numpy.uint8)
+            metas.append((array.dtype.str, array.shape, fortran, offset))
+            buffers.append(buffer)
+            offset += cls._aligned(buffer.nbytes)
+
+        header = pickle.dumps((skeleton, metas))
+        start = cls._aligned(cls._HEADER.size + len(header))
+        chunks = [cls._HEADER.pack(cls.MAGIC, len(header)), header]
+        chunks.append(b"\x00" * (start - cls._HEADER.size - len(header)))
+        for buffer in buffers:
+            chunks.append(buffer)
+            chunks.append(b"\x00" * (cls._aligned(buffer.nbytes) - buffer.nbytes))
+        return b"".join(chunks)
+
+    @classmethod
+    def loads(cls, value):
+        """
+        Deserialize the value returning views over ``value`` for its arrays.
+
+        :param value: bytes
+        :returns: obj
+        """
+        if value is None:
+            return None
+        magic, length = cls._HEADER.unpack_from(value)
+        if magic != cls.MAGIC:
+            raise ValueError("Value not serialized with NumpySerializer")
+        skeleton, metas = pickle.loads(value[cls._HEADER.size:cls._HEADER.size + length])
+        start = cls._aligned(cls._HEADER.size + length)
+
+        arrays = []
+        for dtype, shape, fortran, offset in metas:
+            dtype = numpy.dtype(dtype)
+            count = 1
+            for size in shape:
+                count *= size
+            array = numpy.frombuffer(value, dtype=dtype, count=count, offset=start + offset)
+            arrays.append(array.reshape(shape, order="F" if fortran else "C"))
+        return cls._inject(skeleton, arrays)
+
+    @classmethod
+    def _aligned(cls, size):
+        return -(-size // cls.ALIGNMENT) * cls.ALIGNMENT
+
+    @classmethod
+    def _extract(cls, value, arrays):
+        if isinstance(value, numpy.ndarray) and not value.dtype.hasobject:
+            arrays.append(value)
+            return _ArrayRef(len(arrays) - 1)
+        if isinstance(value, dict):
+            return {key: cls._extract(item, arrays) for key, item in value.items()}
+        if type(value) in (list, tuple):
+            return type(value)(cls._extract(item, arrays) for item in value)
+        return value
+
+    @classmethod
+    def _inject(cls, skeleton, arrays):
+        if isinstance(skeleton, _ArrayRef):
+            return arrays[skeleton.index]
+        if isinstance(skeleton, dict):
+            return {key: cls._inject(item, arrays) for key, item in skeleton.items()}
+        if type(skeleton) in (list, tuple):
+            return type(skeleton)(cls._inject(item, arrays) for item in skeleton)
+        return skeleton
+
+
+class VersionedSerializer(StringSerializer):
+    """
+    Prefixes each value with a header holding the id of the serializer that wrote it, so values
+    written with different serializers can live in the same cache. Values are written with
+    the ``write`` serializer and read with the one they were written with. This allows to
+    switch serializers without flushing the cache: register the new one, write with it and
+    remove the old one once the values written with it have expired::
+
+        'serializer': {
+            'class': "aiocache.serializers.VersionedSerializer",
+            'formats': {
+                1: {'class': "aiocache.serializers.PickleSerializer"},
+                2: {'class': "aiocache.serializers.MsgPackSerializer"}
+            },
+            'write': 2,
+            'legacy': {'class': "aiocache.serializers.PickleSerializer"}
+        }
+
+    The header is ``MAGIC``, the header ``VERSION`` byte and the format id byte. Use a new id
+    for a new serializer or for an incompatible change in the config of an existing one.
+
+    :param formats: dict with int ids (0 to 255) as keys and serializer instances or dicts with
+        their ``class`` and arguments as values.
+    :param write: int id of the serializer used to write. Default is the highest id.
+    :param legacy: serializer instance or dict config used to read values without header,
+        written before adopting this serializer. Default is None which raises ``ValueError``
+        for them.
+    """
+    encoding = None
+
+    MAGIC = b"\x00av"
+    VERSION = 1
+
+    def __init__(self, formats=None, write=None, legacy=None, **kwargs):
+        super().__init__(**kwargs)
+        if not formats:
+            raise ValueError("VersionedSerializer needs at least one format")
+        self.formats = {}
+        for format_id, serializer in formats.items():
+            if not 0 <= int(format_id) <= 255:
+                raise ValueError("Format ids must be between 0 and 255")
+            self.formats[int(format_id)] = _create_serializer(serializer)
+        self.write = max(self.formats) if write is None else int(write)
+        if self.write not in self.formats:
+            raise ValueError("Unknown format {} to write".format(self.write))
+        self.legacy = _create_serializer(legacy)
+        self._header = self.MAGIC + bytes((self.VERSION, self.write))
+
+    def dumps(self, value):
+        """
+        Serialize the value with the ``write`` serializer and prefix it with the header.
+
+        :param value: obj
+        :returns: bytes
+        """
+        return self._header + _dumps_bytes(self.formats[self.write], value)
+
+    def loads(self, value):
+        """
+        Deserialize the value with the serializer that wrote it.
+
+        :param value: bytes
+        :returns: obj
+        """
+        if value is None:
+            return None
+        if isinstance(value, str) or not value.startswith(self.MAGIC):
+            if self.legacy is None:
+                raise ValueError("Value without format header")
+            if isinstance(value, bytes) and self.legacy.encoding is not None:
+                value = value.decode(self.legacy.encoding)
+            return self.legacy.loads(value)
+
+        start = len(self.MAGIC)
+        version, format_id = value[start], value[start + 1]
+        if version != self.VERSION:
+            raise ValueError("Unknown format header version {}".format(version))
+        if format_id not in self.formats:
+            raise ValueError("Unknown format {}".format(format_id))
+        return _loads_bytes(self.formats[format_id], value[start + 2:])
@@ -26,6 +26,11 @@ class TestCache:
         await cache.set(pytest.KEY, "value")
         assert await cache.get(pytest.KEY) == "value"
 
+    @pytest.mark.asyncio
+    async def test_get_falsy(self, cache):
+        await cache.set(pytest.KEY, "")
+        assert await cache.get(pytest.KEY, default="default") == ""
+
     @pytest.mark.asyncio
     async def test_multi_get(self, cache):
         await cache.set(pytest.KEY, "value")
@@ -122,6 +127,27 @@ class TestCache:
     async def test_expire_missing(self, cache):
         assert await cache.expire(pytest.KEY, 1) is False
 
+    @pytest.mark.asyncio
+    async def test_ttl(self, cache):
+        await cache.set(pytest.KEY, "value", ttl=10)
+        await cache.set(pytest.KEY_1, "value")
+
+        assert 0 < await cache.ttl(pytest.KEY) <= 10
+        assert await cache.ttl(pytest.KEY_1) == 0
+        assert await cache.multi_ttl([pytest.KEY_1, "missing"]) == [0, None]
+
+    @pytest.mark.asyncio
+    async def test_touch_on_read(self, cache):
+        await cache.set(pytest.KEY, "value", ttl=1)
+        cache.touch_on_read = 10
+        try:
+            assert await cache.get(pytest.KEY) == "value"
+            assert await cache.multi_get([pytest.KEY, pytest.KEY_1]) == ["value", None]
+        finally:
+            cache.touch_on_read = None
+
+        assert await cache.ttl(pytest.KEY) > 1
+
     @pytest.mark.asyncio
     async def test_clear(self, cache):
         await cache.set(pytest.KEY, "value")
@@ -143,6 +169,24 @@ class TestCache:
             assert await conn.set(pytest.KEY, "value") is True
             assert await conn.get(pytest.KEY) == "value"
 
+    @pytest.mark.asyncio
+    async def test_pipeline(self, cache):
+        await cache.set(pytest.KEY, "value")
+
+        async with cache.pipeline() as p:
+            value = p.get(pytest.KEY)
+            exists = p.exists(pytest.KEY_1)
+            incremented = p.increment(pytest.KEY_1, 2)
+            expired = p.expire(pytest.KEY, 10)
+            added = p.add(pytest.KEY, "value")
+
+        assert value.result() == "value"
+        assert exists.result() is False
+        assert incremented.result() == 2
+        assert expired.result() is True
+        with pytest.raises(ValueError):
+            added.result()
+
 
 class TestMemoryCache:
 
@@ -307,3 +351,21 @@ class TestRedisCache:
         await redis_cache.set(pytest.KEY, "value")
         await redis_cache._close()
         assert redis_cache._pool.size == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("invalidation", ["tracking", "keyspace"])
+    async def test_near_cache_invalidated(self, redis_cache, event_loop, invalidation):
+        await redis_cache.raw("config_set", "notify-keyspace-events", "KA")
+        near = RedisCache(
+            namespace="test", near_cache=10, near_cache_invalidation=invalidation,
+            loop=event_loop)
+        await redis_cache.set(pytest.KEY, "value")
+
+        assert await near.get(pytest.KEY) == "value"
+        assert len(near._near) == 1
+
+        await redis_cache.set(pytest.KEY, "new")
+        await asyncio.sleep(0.1)
+        assert len(near._near) == 0
+        assert await near.get(pytest.KEY) == "new"
+        await near.close()
@@ -1,3 +1,4 @@
+import os
 import asyncio
 import pytest
 import random
@@ -41,6 +42,22 @@ class TestCached:
         await asyncio.sleep(1)
         assert await cache.get(pytest.KEY) is None
 
+    @pytest.mark.asyncio
+    async def test_cached_disabled(self, cache):
+        calls = []
+
+        @cached(key=pytest.KEY)
+        async def fn():
+            calls.append(1)
+            return "value"
+
+        with mock.patch.dict(os.environ, {'AIOCACHE_DISABLE': '1'}):
+            assert await fn() == "value"
+            assert await fn() == "value"
+
+        assert len(calls) == 2
+        assert await cache.get(pytest.KEY) is None
+
 
 class TestCachedStampede:
 
@@ -0,0 +1,53 @@
+import time
+import asyncio
+import pytest
+
+from aiocache import cached, SimpleMemoryCache, RedisCache, MemcachedCache
+
+
+CONCURRENCY = 500
+ROUNDS = 20
+
+
+@pytest.fixture(params=[
+    (SimpleMemoryCache, {}),
+    (RedisCache, {"pool_max_size": 10}),
+    (MemcachedCache, {"pool_size": 10}),
+], ids=["memory", "redis", "memcached"])
+def backend(request, event_loop):
+    cache, kwargs = request.param
+    if cache is not SimpleMemoryCache:
+        kwargs = dict(kwargs, loop=event_loop)
+    return cache, kwargs
+
+
+async def hits_per_second(fn):
+    start = time.time()
+    for _ in range(ROUNDS):
+        await asyncio.gather(*[fn() for _ in range(CONCURRENCY)])
+    return CONCURRENCY * ROUNDS / (time.time() - start)
+
+
+class TestCached:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_hits(self, backend):
+        cache, kwargs = backend
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return "value"
+
+        decorator = cached(cache=cache, namespace="test", key="hit", **kwargs)
+        fn = decorator(compute)
+        await fn()
+        cache_hits = await hits_per_second(lambda: decorator.cache.get("hit"))
+        decorator_hits = await hits_per_second(fn)
+        await decorator.cache.delete("hit")
+        await decorator.cache.close()
+
+        print("\n{}: {:0.0f} hits/s, cache get {:0.0f} hits/s, {} concurrent callers".format(
+            cache.__name__, decorator_hits, cache_hits, CONCURRENCY))
+        assert len(calls) == 1
+        assert cache_hits / decorator_hits < 2
@@ -1,13 +1,28 @@
 import pytest
+import asyncio
 import aiomcache
 
-from asynctest import MagicMock, patch, ANY
+from collections import namedtuple
+from asynctest import MagicMock, CoroutineMock, patch, ANY
 
 from aiocache import MemcachedCache
 from aiocache.base import BaseCache
 from aiocache.backends.memcached import MemcachedBackend
 
 
+class FakePool:
+
+    def __init__(self, response):
+        self.reader = asyncio.StreamReader()
+        self.reader.feed_data(response)
+        self.writer = MagicMock()
+        self.writer.drain = CoroutineMock()
+        self.release = MagicMock()
+
+    async def acquire(self):
+        return namedtuple("connection", "reader, writer")(self.reader, self.writer)
+
+
 @pytest.fixture
 def memcached(event_loop):
     memcached = MemcachedBackend(loop=event_loop)
@@ -103,6 +118,12 @@ class TestMemcachedBackend:
         memcached.client.set.assert_any_call(pytest.KEY_1, b"random", exptime=1)
         assert memcached.client.set.call_count == 4
 
+    @pytest.mark.asyncio
+    async def test_multi_set_per_key_ttl(self, memcached):
+        await memcached._multi_set([(pytest.KEY, "value"), (pytest.KEY_1, "random")], ttl=[1, 2])
+        memcached.client.set.assert_any_call(pytest.KEY, b"value", exptime=1)
+        memcached.client.set.assert_any_call(pytest.KEY_1, b"random", exptime=2)
+
     @pytest.mark.asyncio
     async def test_multi_set_float_ttl(self, memcached):
         memcached.client.set.side_effect = aiomcache.exceptions.ValidationException("msg")
@@ -215,6 +236,82 @@ class TestMemcachedBackend:
         await memcached._close()
         assert memcached.client.close.call_count == 1
 
+    @pytest.mark.asyncio
+    async def test_pipeline_single_write(self, memcached):
+        memcached.client._pool = FakePool(
+            b"VALUE key 0 5\r\nvalue\r\nEND\r\nSTORED\r\nDELETED\r\n3\r\n")
+
+        assert await memcached._pipeline([
+            ("get", (b"key", "utf-8")),
+            ("set", (b"key", "value", 1)),
+            ("delete", (b"key",)),
+            ("increment", (b"key", 2))]) == ["value", True, 1, 3]
+
+        memcached.client._pool.writer.write.assert_called_once_with(
+            b"get key\r\nset key 0 1 5\r\nvalue\r\ndelete key\r\nincr key 2\r\n")
+        assert memcached.client._pool.release.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_pipeline_errors_per_command(self, memcached):
+        memcached.client._pool = FakePool(b"NOT_STORED\r\nCLIENT_ERROR non-numeric\r\n")
+
+        results = await memcached._pipeline([
+            ("add", (b"key", "value", 0)),
+            ("set", (b"key", "value", 1.5)),
+            ("increment", (b"key", 2))])
+
+        assert isinstance(results[0], ValueError)
+        assert isinstance(results[1], TypeError)
+        assert isinstance(results[2], TypeError)
+
+    @pytest.mark.asyncio
+    async def test_pipeline_increment_missing(self, memcached):
+        memcached.client._pool = FakePool(b"NOT_FOUND\r\n")
+        memcached._set = CoroutineMock()
+
+        assert await memcached._pipeline([("increment", (b"key", 2))]) == [2]
+        memcached._set.assert_called_with(b"key", b"2")
+
+    @pytest.mark.asyncio
+    async def test_pipeline_multi_get(self, memcached):
+        memcached.client._pool = FakePool(b"VALUE a 0 1\r\n1\r\nEND\r\n")
+
+        assert await memcached._pipeline([("multi_get", ([b"a", b"b"], None))]) == [[b"1", None]]
+
+    @pytest.mark.asyncio
+    async def test_ttl(self, memcached):
+        memcached.client._pool = FakePool(b"HD t10\r\n")
+
+        assert await memcached._ttl(b"key") == 10
+        memcached.client._pool.writer.write.assert_called_once_with(b"mg key t\r\n")
+
+    @pytest.mark.asyncio
+    async def test_multi_ttl(self, memcached):
+        memcached.client._pool = FakePool(b"HD t10\r\nHD t-1\r\nEN\r\n")
+
+        assert await memcached._multi_ttl([b"a", b"b", b"c"]) == [10, 0, None]
+        memcached.client._pool.writer.write.assert_called_once_with(
+            b"mg a t\r\nmg b t\r\nmg c t\r\n")
+
+    @pytest.mark.asyncio
+    async def test_get_touch(self, memcached):
+        memcached.client._pool = FakePool(b"VALUE key 0 5\r\nvalue\r\nEND\r\n")
+
+        assert await memcached._get_touch(b"key", 10) == "value"
+        memcached.client._pool.writer.write.assert_called_once_with(b"gat 10 key\r\n")
+
+    @pytest.mark.asyncio
+    async def test_get_touch_float_ttl(self, memcached):
+        with pytest.raises(TypeError):
+            await memcached._get_touch(b"key", 0.5)
+
+    @pytest.mark.asyncio
+    async def test_multi_get_touch(self, memcached):
+        memcached.client._pool = FakePool(b"VALUE a 0 1\r\n1\r\nEND\r\n")
+
+        assert await memcached._multi_get_touch([b"a", b"b"], 10, encoding=None) == [b"1", None]
+        memcached.client._pool.writer.write.assert_called_once_with(b"gat 10 a b\r\n")
+
 
 class TestMemcachedCache:
 
@@ -240,3 +337,9 @@ class TestMemcachedCache:
 
     def test_build_key_no_spaces(self, memcached_cache):
         assert memcached_cache._build_key('hello world') == b'hello_world'
+
+    def test_build_key_long(self, memcached_cache):
+        assert len(memcached_cache._build_key("a" * 300)) == 250
+
+    def test_build_key_long_non_ascii(self, memcached_cache):
+        assert len(memcached_cache._build_key("ñ" * 200)) == 250
@@ -54,6 +54,13 @@ class TestSimpleMemoryBackend:
         SimpleMemoryBackend._cache.__setitem__.assert_any_call(pytest.KEY, "value")
         SimpleMemoryBackend._cache.__setitem__.assert_any_call(pytest.KEY_1, "random")
 
+    @pytest.mark.asyncio
+    async def test_multi_set_per_key_ttl(self, memory, mocker):
+        mocker.spy(memory, "_set")
+        await memory._multi_set([(pytest.KEY, "value"), (pytest.KEY_1, "random")], ttl=[1, 2])
+        memory._set.assert_any_call(pytest.KEY, "value", ttl=1)
+        memory._set.assert_any_call(pytest.KEY_1, "random", ttl=2)
+
     @pytest.mark.asyncio
     async def test_add(self, memory, mocker):
         mocker.spy(memory, "_set")
@@ -118,6 +125,54 @@ class TestSimpleMemoryBackend:
         SimpleMemoryBackend._cache.__contains__.return_value = False
         assert await memory._expire(pytest.KEY, 1) is False
 
+    @pytest.mark.asyncio
+    async def test_ttl_missing(self, memory):
+        SimpleMemoryBackend._cache.__contains__.return_value = False
+        assert await memory._ttl(pytest.KEY) is None
+
+    @pytest.mark.asyncio
+    async def test_ttl_no_handle(self, memory):
+        SimpleMemoryBackend._cache.__contains__.return_value = True
+        assert await memory._ttl(pytest.KEY) == 0
+
+    @pytest.mark.asyncio
+    async def test_ttl_handle(self, memory, event_loop):
+        fake = MagicMock()
+        fake.when.return_value = event_loop.time() + 10
+        SimpleMemoryBackend._handlers[pytest.KEY] = fake
+        SimpleMemoryBackend._cache.__contains__.return_value = True
+        assert 9 < await memory._ttl(pytest.KEY) <= 10
+
+    @pytest.mark.asyncio
+    async def test_multi_ttl(self, memory, mocker):
+        mocker.spy(memory, "_ttl")
+        await memory._multi_ttl([pytest.KEY, pytest.KEY_1])
+        memory._ttl.assert_any_call(pytest.KEY)
+        memory._ttl.assert_any_call(pytest.KEY_1)
+
+    @pytest.mark.asyncio
+    async def test_get_touch(self, memory):
+        fake = MagicMock()
+        SimpleMemoryBackend._handlers[pytest.KEY] = fake
+        SimpleMemoryBackend._cache.get.return_value = "value"
+        assert await memory._get_touch(pytest.KEY, 10) == "value"
+        assert fake.cancel.call_count == 1
+        assert isinstance(memory._handlers.get(pytest.KEY), asyncio.Handle)
+
+    @pytest.mark.asyncio
+    async def test_get_touch_missing(self, memory):
+        SimpleMemoryBackend._cache.get.return_value = None
+        assert await memory._get_touch(pytest.KEY, 10) is None
+        assert pytest.KEY not in memory._handlers
+
+    @pytest.mark.asyncio
+    async def test_set_without_ttl_cancels_handle(self, memory):
+        fake = MagicMock()
+        SimpleMemoryBackend._handlers[pytest.KEY] = fake
+        await memory._set(pytest.KEY, "value")
+        assert fake.cancel.call_count == 1
+        assert pytest.KEY not in memory._handlers
+
     @pytest.mark.asyncio
     async def test_delete(self, memory):
         fake = MagicMock()
@@ -1,11 +1,12 @@
 import pytest
+import asyncio
 import aioredis
 
 from asynctest import CoroutineMock, MagicMock, patch, ANY
 
 from aiocache import RedisCache
 from aiocache.base import BaseCache
-from aiocache.backends.redis import RedisBackend, conn
+from aiocache.backends.redis import RedisBackend, conn, _NearCache
 
 
 class FakePool:
@@ -39,6 +40,15 @@ class FakePool:
         return self
 
 
+def _done(result=None, exception=None):
+    future = asyncio.Future()
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+    return future
+
+
 @pytest.fixture
 def redis(event_loop):
     redis = RedisBackend()
@@ -182,6 +192,16 @@ class TestRedisBackend:
         pool.transaction.expire.assert_any_call(pytest.KEY_1, timeout=1)
         assert pool.transaction.execute.call_count == 1
 
+    @pytest.mark.asyncio
+    async def test_multi_set_with_per_key_ttl(self, redis):
+        cache, pool = redis
+        await cache._multi_set(
+            [(pytest.KEY, "value"), (pytest.KEY_1, "random")], ttl=[1, 0.5])
+        assert pool.conn.multi_exec.call_count == 1
+        pool.transaction.expire.assert_called_once_with(pytest.KEY, timeout=1)
+        pool.transaction.pexpire.assert_called_once_with(pytest.KEY_1, timeout=500)
+        assert pool.transaction.execute.call_count == 1
+
     @pytest.mark.asyncio
     async def test_add(self, redis):
         cache, pool = redis
@@ -275,6 +295,88 @@ class TestRedisBackend:
             "eval", cache.RELEASE_SCRIPT,
             [pytest.KEY], ["random"])
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("pttl, expected", [(-2, None), (-1, 0), (1500, 1.5)])
+    async def test_ttl(self, redis, pttl, expected):
+        redis, pool = redis
+        pool.conn.pttl.return_value = pttl
+        assert await redis._ttl(pytest.KEY) == expected
+        pool.conn.pttl.assert_called_with(pytest.KEY)
+
+    @pytest.mark.asyncio
+    async def test_multi_ttl(self, redis):
+        redis, pool = redis
+        pipe = pool.conn.pipeline.return_value
+        pipe.execute = CoroutineMock()
+        pipe.pttl.side_effect = [_done(-2), _done(1000)]
+
+        assert await redis._multi_ttl([pytest.KEY, pytest.KEY_1]) == [None, 1]
+        assert pipe.execute.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_get_touch(self, redis):
+        redis, pool = redis
+        pipe = pool.conn.pipeline.return_value
+        pipe.execute = CoroutineMock()
+        pipe.get.return_value = _done("value")
+
+        assert await redis._get_touch(pytest.KEY, 10) == "value"
+        pipe.get.assert_called_with(pytest.KEY, encoding="utf-8")
+        pipe.expire.assert_called_with(pytest.KEY, timeout=10)
+        assert pipe.execute.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_multi_get_touch_float_ttl(self, redis):
+        redis, pool = redis
+        pipe = pool.conn.pipeline.return_value
+        pipe.execute = CoroutineMock()
+        pipe.mget.return_value = _done(["value", None])
+
+        assert await redis._multi_get_touch([pytest.KEY, pytest.KEY_1], 0.5) == ["value", None]
+        pipe.pexpire.assert_any_call(pytest.KEY, timeout=500)
+        pipe.pexpire.assert_any_call(pytest.KEY_1, timeout=500)
+        assert pipe.execute.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_pipeline(self, redis):
+        redis, pool = redis
+        pipe = pool.conn.pipeline.return_value
+        pipe.execute = CoroutineMock()
+        pipe.get.return_value = _done("value")
+        pipe.exists.return_value = _done(1)
+
+        assert await redis._pipeline([
+            ("get", (pytest.KEY, "utf-8")),
+            ("exists", (pytest.KEY_1,))]) == ["value", True]
+
+        pipe.get.assert_called_with(pytest.KEY, encoding="utf-8")
+        pipe.exists.assert_called_with(pytest.KEY_1)
+        assert pipe.execute.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_pipeline_errors_per_command(self, redis):
+        redis, pool = redis
+        pipe = pool.conn.pipeline.return_value
+        pipe.execute = CoroutineMock()
+        pipe.set.return_value = _done(None)
+        pipe.incrby.return_value = _done(exception=aioredis.errors.ReplyError())
+
+        results = await redis._pipeline([
+            ("add", (pytest.KEY, "value")),
+            ("increment", (pytest.KEY, 2))])
+
+        assert isinstance(results[0], ValueError)
+        assert isinstance(results[1], TypeError)
+
+    def test_pipe_multi_set_ttl(self, redis):
+        redis, _ = redis
+        pipe = MagicMock()
+        redis._pipe_multi_set(pipe, [(pytest.KEY, "value"), (pytest.KEY_1, "random")], ttl=1)
+
+        pipe.mset.assert_called_with(pytest.KEY, "value", pytest.KEY_1, "random")
+        pipe.expire.assert_any_call(pytest.KEY, timeout=1)
+        pipe.expire.assert_any_call(pytest.KEY_1, timeout=1)
+
     @pytest.mark.asyncio
     async def test_close_when_connected(self, redis):
         cache, pool = redis
@@ -289,6 +391,114 @@ class TestRedisBackend:
         await cache._close()
         assert pool.clear.call_count == 0
 
+    def test_near_cache_wrong_invalidation(self):
+        with pytest.raises(ValueError):
+            RedisBackend(near_cache=10, near_cache_invalidation="wrong")
+
+    @pytest.mark.asyncio
+    async def test_get_near_cache(self, redis):
+        cache, pool = redis
+        cache._near = _NearCache(10)
+        cache._near_ready = CoroutineMock(return_value=True)
+        pool.conn.get.return_value = "value"
+
+        assert await cache._get(pytest.KEY) == "value"
+        assert await cache._get(pytest.KEY) == "value"
+        assert pool.conn.get.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_multi_get_near_cache_missing_only(self, redis):
+        cache, pool = redis
+        cache._near = _NearCache(10)
+        cache._near.put(pytest.KEY, "value", "utf-8", 0)
+        cache._near_ready = CoroutineMock(return_value=True)
+        pool.conn.mget.return_value = ["random"]
+
+        assert await cache._multi_get([pytest.KEY, pytest.KEY_1]) == ["value", "random"]
+        pool.conn.mget.assert_called_with(pytest.KEY_1, encoding="utf-8")
+
+    @pytest.mark.asyncio
+    async def test_set_forgets_near_cache(self, redis):
+        cache, pool = redis
+        cache._near = _NearCache(10)
+        cache._near.put(pytest.KEY, "value", "utf-8", 0)
+
+        await cache._set(pytest.KEY, "new")
+        assert cache._near.get(pytest.KEY, "utf-8") is None
+
+    @pytest.mark.asyncio
+    async def test_near_ready_start_fails(self, redis):
+        cache, _ = redis
+        cache._near = _NearCache(10)
+        cache._near_start = CoroutineMock(side_effect=OSError)
+
+        assert await cache._near_ready(pytest.KEY) is False
+        assert await cache._near_ready(pytest.KEY) is False
+        assert cache._near_start.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_near_ready_prefix(self, redis):
+        cache, _ = redis
+        cache._near = _NearCache(10)
+        cache._near_prefix = "test:"
+        cache._near_listener = asyncio.Future()
+
+        assert await cache._near_ready("test:key") is True
+        assert await cache._near_ready("test:key", "other:key") is False
+
+    @pytest.mark.asyncio
+    async def test_near_listen_tracking(self, redis):
+        cache, _ = redis
+        cache._near = _NearCache(10)
+        cache._near.put(pytest.KEY, "value", "utf-8", 0)
+        cache._near.put(pytest.KEY_1, "value", "utf-8", 0)
+        channel = MagicMock(is_pattern=False)
+        channel.wait_message = CoroutineMock(side_effect=[True, True, False])
+        channel.get = CoroutineMock(side_effect=[[pytest.KEY.encode()], None])
+
+        await cache._near_listen(channel)
+        assert len(cache._near) == 0
+
+    @pytest.mark.asyncio
+    async def test_near_listen_keyspace(self, redis):
+        cache, _ = redis
+        cache._near = _NearCache(10)
+        cache._near.put(pytest.KEY, "value", "utf-8", 0)
+        channel = MagicMock(is_pattern=True)
+        channel.wait_message = CoroutineMock(side_effect=[True, asyncio.CancelledError()])
+        channel.get = CoroutineMock(
+            return_value=("__keyspace@0__:{}".format(pytest.KEY).encode(), b"set"))
+
+        with pytest.raises(asyncio.CancelledError):
+            await cache._near_listen(channel)
+        assert cache._near.generation == 2
+
+
+class TestNearCache:
+
+    def test_lru(self):
+        near = _NearCache(2)
+        near.put("a", "1", "utf-8", 0)
+        near.put("b", "2", "utf-8", 0)
+        near.get("a", "utf-8")
+        near.put("c", "3", "utf-8", 0)
+
+        assert near.get("a", "utf-8") == "1"
+        assert near.get("b", "utf-8") is None
+        assert len(near) == 2
+
+    def test_put_skips_stale_generation(self):
+        near = _NearCache(2)
+        generation = near.generation
+        near.forget(["a"])
+        near.put("a", "1", "utf-8", generation)
+        assert near.get("a", "utf-8") is None
+
+    def test_get_other_encoding(self):
+        near = _NearCache(2)
+        near.put("a", "1", "utf-8", 0)
+        assert near.get("a", None) is None
+
 
 class TestConn:
 
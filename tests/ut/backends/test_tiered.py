@@ -0,0 +1,210 @@
+import pytest
+
+from aiocache import SimpleMemoryCache, TieredCache
+from aiocache.base import BaseCache
+from aiocache.backends.memory import SimpleMemoryBackend
+from aiocache.serializers import NullSerializer, JsonSerializer
+
+
+@pytest.fixture
+def tiers():
+    SimpleMemoryBackend._handlers = {}
+    SimpleMemoryBackend._cache = {}
+    return [SimpleMemoryCache(namespace="l1:"), SimpleMemoryCache(namespace="l2:")]
+
+
+@pytest.fixture
+def tiered(tiers):
+    return TieredCache(tiers, ttls=[10, 100])
+
+
+class TestTieredBackend:
+
+    @pytest.mark.asyncio
+    async def test_get_miss(self, tiered):
+        assert await tiered._get(pytest.KEY) is None
+        assert tiered.misses == 1
+        assert tiered.hits == [0, 0]
+
+    @pytest.mark.asyncio
+    async def test_get_upper_hit(self, tiered, tiers, mocker):
+        await tiers[0].set(pytest.KEY, "value")
+        mocker.spy(tiers[1], "get")
+
+        assert await tiered._get(pytest.KEY) == "value"
+        assert tiered.hits == [1, 0]
+        assert tiers[1].get.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_get_lower_hit_backfills(self, tiered, tiers, mocker):
+        await tiers[1].set(pytest.KEY, "value")
+        mocker.spy(tiers[0], "multi_set")
+
+        assert await tiered._get(pytest.KEY) == "value"
+        assert tiered.hits == [0, 1]
+        tiers[0].multi_set.assert_called_with([(pytest.KEY, "value")], ttl=10)
+        assert await tiers[0].get(pytest.KEY) == "value"
+
+    @pytest.mark.asyncio
+    async def test_multi_get_asks_missing_only(self, tiered, tiers, mocker):
+        await tiers[0].set(pytest.KEY, "value")
+        await tiers[1].set(pytest.KEY_1, "random")
+        mocker.spy(tiers[1], "multi_get")
+
+        assert await tiered._multi_get([pytest.KEY, pytest.KEY_1, "other"]) == [
+            "value", "random", None]
+        assert tiers[1].multi_get.call_args[0][0] == [pytest.KEY_1, "other"]
+        assert tiered.hits == [1, 1]
+        assert tiered.misses == 1
+        assert await tiers[0].get(pytest.KEY_1) == "random"
+
+    @pytest.mark.asyncio
+    async def test_set_through(self, tiered, tiers):
+        await tiered._set(pytest.KEY, "value")
+        assert await tiers[0].get(pytest.KEY) == "value"
+        assert await tiers[1].get(pytest.KEY) == "value"
+        assert 9 < await tiers[0].ttl(pytest.KEY) <= 10
+        assert 99 < await tiers[1].ttl(pytest.KEY) <= 100
+
+    @pytest.mark.asyncio
+    async def test_set_ttl(self, tiered, tiers):
+        await tiered._set(pytest.KEY, "value", ttl=5)
+        assert await tiers[0].ttl(pytest.KEY) <= 5
+        assert await tiers[1].ttl(pytest.KEY) <= 5
+
+    @pytest.mark.asyncio
+    async def test_set_around(self, tiers):
+        tiered = TieredCache(tiers, write_policy="around")
+        await tiers[0].set(pytest.KEY, "old")
+
+        await tiered._set(pytest.KEY, "value")
+        assert await tiers[0].exists(pytest.KEY) is False
+        assert await tiers[1].get(pytest.KEY) == "value"
+
+    @pytest.mark.asyncio
+    async def test_multi_set_around(self, tiers):
+        tiered = TieredCache(tiers, write_policy="around")
+        await tiers[0].set(pytest.KEY, "old")
+
+        await tiered._multi_set([(pytest.KEY, "value"), (pytest.KEY_1, "random")])
+        assert await tiers[0].multi_get([pytest.KEY, pytest.KEY_1]) == [None, None]
+        assert await tiers[1].multi_get([pytest.KEY, pytest.KEY_1]) == ["value", "random"]
+
+    @pytest.mark.asyncio
+    async def test_add_existing_in_lower_tier(self, tiered, tiers):
+        await tiers[1].set(pytest.KEY, "value")
+        with pytest.raises(ValueError):
+            await tiered._add(pytest.KEY, "value")
+        assert await tiers[0].exists(pytest.KEY) is False
+
+    @pytest.mark.asyncio
+    async def test_increment_invalidates_upper(self, tiered, tiers):
+        await tiered._set(pytest.KEY, 1)
+        assert await tiered._increment(pytest.KEY, 2) == 3
+        assert await tiers[0].exists(pytest.KEY) is False
+
+    @pytest.mark.asyncio
+    async def test_exists(self, tiered, tiers):
+        await tiers[1].set(pytest.KEY, "value")
+        assert await tiered._exists(pytest.KEY) is True
+        assert await tiered._exists(pytest.KEY_1) is False
+
+    @pytest.mark.asyncio
+    async def test_delete(self, tiered, tiers):
+        await tiers[1].set(pytest.KEY, "value")
+        assert await tiered._delete(pytest.KEY) == 1
+        assert await tiered._delete(pytest.KEY) == 0
+
+    @pytest.mark.asyncio
+    async def test_multi_ttl(self, tiered, tiers):
+        await tiers[0].set(pytest.KEY, "value", ttl=10)
+        await tiers[1].set(pytest.KEY_1, "value")
+        ttls = await tiered._multi_ttl([pytest.KEY, pytest.KEY_1, "other"])
+        assert 9 < ttls[0] <= 10
+        assert ttls[1:] == [0, None]
+
+    @pytest.mark.asyncio
+    async def test_get_touch(self, tiered, tiers):
+        await tiers[1].set(pytest.KEY, "value", ttl=100)
+
+        assert await tiered._get_touch(pytest.KEY, 5) == "value"
+        assert all([4 < await tier.ttl(pytest.KEY) <= 5 for tier in tiers])
+
+    @pytest.mark.asyncio
+    async def test_multi_get_touch(self, tiered, tiers):
+        await tiers[0].set(pytest.KEY, "value", ttl=100)
+
+        assert await tiered._multi_get_touch([pytest.KEY, "other"], 5) == ["value", None]
+        assert 4 < await tiers[0].ttl(pytest.KEY) <= 5
+        assert await tiers[0].exists("other") is False
+
+    @pytest.mark.asyncio
+    async def test_close(self, tiered, tiers, mocker):
+        for tier in tiers:
+            mocker.spy(tier, "close")
+        await tiered._close()
+        assert all(tier.close.call_count == 1 for tier in tiers)
+
+
+class TestTieredCache:
+
+    def test_inheritance(self, tiers):
+        assert isinstance(TieredCache(tiers), BaseCache)
+
+    def test_default_serializer(self, tiers):
+        assert isinstance(TieredCache(tiers).serializer, NullSerializer)
+
+    def test_no_tiers(self):
+        with pytest.raises(ValueError):
+            TieredCache([])
+
+    def test_wrong_ttls(self, tiers):
+        with pytest.raises(ValueError):
+            TieredCache(tiers, ttls=[1])
+
+    def test_wrong_write_policy(self, tiers):
+        with pytest.raises(ValueError):
+            TieredCache(tiers, write_policy="back")
+
+    @pytest.mark.asyncio
+    async def test_tiers_serialize(self, tiers):
+        tiered = TieredCache(tiers)
+        await tiers[1].set(pytest.KEY, 1)
+        assert await tiered.get(pytest.KEY) == "1"
+        await tiered.set(pytest.KEY_1, {"a": 1})
+        assert await tiered.get(pytest.KEY_1) == "{'a': 1}"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("serializer", [NullSerializer, JsonSerializer])
+    async def test_soft_ttl(self, serializer):
+        tiers = [SimpleMemoryCache(namespace="l1:", serializer=serializer()),
+                 SimpleMemoryCache(namespace="l2:", serializer=serializer())]
+        tiered = TieredCache(tiers)
+        await tiered.set(pytest.KEY, {"a": 1}, ttl=10, soft_ttl=5)
+        await tiered.set(pytest.KEY_1, {"a": 1}, ttl=10, compute_time=0.001)
+
+        assert await tiered.get(pytest.KEY) == {"a": 1}
+        assert await tiered.get(pytest.KEY_1) == {"a": 1}
+
+    @pytest.mark.asyncio
+    async def test_touch_on_read(self, tiers):
+        tiered = TieredCache(tiers, touch_on_read=5)
+        await tiered.set(pytest.KEY, "value", ttl=100)
+
+        assert await tiered.get(pytest.KEY) == "value"
+        assert await tiered.multi_get([pytest.KEY]) == ["value"]
+        assert 4 < await tiers[0].ttl(pytest.KEY) <= 5
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("serializer", [NullSerializer, JsonSerializer])
+    async def test_none_is_cached(self, serializer):
+        tiers = [SimpleMemoryCache(namespace="l1:", serializer=serializer()),
+                 SimpleMemoryCache(namespace="l2:", serializer=serializer())]
+        tiered = TieredCache(tiers)
+        default = object()
+        await tiered.set(pytest.KEY, None)
+
+        assert await tiered.get(pytest.KEY, default=default) is None
+        assert await tiered.multi_get([pytest.KEY, "other"], default=default) == [None, default]
+        await tiered.multi_set([(pytest.KEY_1, None)])
+        assert await tiered.get(pytest.KEY_1, default=default) is None
@@ -44,6 +44,10 @@ class MockCache(BaseCache):
         self._exists = asynctest.CoroutineMock()
         self._increment = asynctest.CoroutineMock()
         self._expire = asynctest.CoroutineMock()
+        self._ttl = asynctest.CoroutineMock()
+        self._multi_ttl = asynctest.CoroutineMock()
+        self._get_touch = asynctest.CoroutineMock()
+        self._multi_get_touch = asynctest.CoroutineMock(return_value=['a', 'b'])
         self._clear = asynctest.CoroutineMock()
         self._raw = asynctest.CoroutineMock()
         self._redlock_release = asynctest.CoroutineMock()
@@ -62,6 +66,7 @@ def mock_cache(mocker):
     mocker.spy(cache, "close")
     mocker.spy(cache, "_redlock")
     cache.serializer = asynctest.Mock(spec=StringSerializer)
+    cache.serializer.offload_threshold = None
     cache.plugins = [asynctest.Mock(spec=BasePlugin)]
     return cache
 
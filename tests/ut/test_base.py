@@ -1,12 +1,18 @@
 import os
+import time
 import pytest
 import asyncio
 import asynctest
 
 from unittest.mock import patch, MagicMock, ANY
 
-from aiocache.base import API, _Conn
+from aiocache import _envelope
+from aiocache.base import API, BaseCache, _Conn
+from aiocache.breaker import CircuitBreaker
 from aiocache._lock import _RedLock
+from aiocache.lazy import LazyValue
+from aiocache.serializers import JsonSerializer, MsgPackSerializer
+from aiocache._write_behind import _WriteBuffer
 
 
 class TestAPI:
@@ -51,6 +57,36 @@ class TestAPI:
         with patch.dict(os.environ, {'AIOCACHE_DISABLE': '1'}):
             assert await dummy() == []
 
+    @pytest.mark.asyncio
+    async def test_aiocache_enabled_disabled_callable(self):
+        @API.aiocache_enabled(fake_return=lambda key, default=None: default)
+        async def dummy(key, default=None):
+            return True
+
+        with patch.dict(os.environ, {'AIOCACHE_DISABLE': '1'}):
+            assert await dummy(pytest.KEY, default="default") == "default"
+
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_none(self):
+        @API.circuit_breaker(fallback=False)
+        async def dummy(self):
+            return True
+
+        assert await dummy(MagicMock(circuit_breaker=None)) is True
+
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_open(self):
+        @API.circuit_breaker(fallback=False)
+        async def dummy(self):
+            return True
+
+        breaker = MagicMock(call=asynctest.CoroutineMock(return_value="ret"))
+        client = MagicMock(circuit_breaker=breaker)
+
+        assert await dummy(client, 1, a=2) == "ret"
+        fallback = breaker.call.call_args[0][2]
+        assert fallback(client, 1, a=2) is False
+
     @pytest.mark.asyncio
     async def test_timeout_no_timeout(self):
         self = MagicMock()
@@ -124,6 +160,23 @@ class TestAPI:
         with pytest.raises(asyncio.TimeoutError):
             await dummy(self, timeout=0.003)
 
+    @pytest.mark.asyncio
+    async def test_timeout_nested_shares_deadline(self):
+        self = MagicMock()
+        self.timeout = 5
+
+        @API.timeout
+        async def dummy(self):
+            await asyncio.sleep(0.003)
+
+        @API.timeout
+        async def outer(self):
+            await dummy(self)
+            await dummy(self)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await outer(self, timeout=0.005)
+
     @pytest.mark.asyncio
     async def test_plugins(self):
         self = MagicMock()
@@ -187,6 +240,26 @@ class TestBaseCache:
         with pytest.raises(NotImplementedError):
             await base_cache._expire(pytest.KEY, 0)
 
+    @pytest.mark.asyncio
+    async def test_ttl(self, base_cache):
+        with pytest.raises(NotImplementedError):
+            await base_cache._ttl(pytest.KEY)
+
+    @pytest.mark.asyncio
+    async def test_multi_ttl(self, base_cache):
+        with pytest.raises(NotImplementedError):
+            await base_cache._multi_ttl([pytest.KEY])
+
+    @pytest.mark.asyncio
+    async def test_get_touch(self, base_cache):
+        with pytest.raises(NotImplementedError):
+            await base_cache._get_touch(pytest.KEY, 1, "utf-8")
+
+    @pytest.mark.asyncio
+    async def test_multi_get_touch(self, base_cache):
+        with pytest.raises(NotImplementedError):
+            await base_cache._multi_get_touch([pytest.KEY], 1, "utf-8")
+
     @pytest.mark.asyncio
     async def test_clear(self, base_cache):
         with pytest.raises(NotImplementedError):
@@ -228,6 +301,29 @@ class TestBaseCache:
     def test_build_key(self, set_test_namespace, base_cache, namespace, expected):
         assert base_cache._build_key(pytest.KEY, namespace=namespace) == expected
 
+    def test_build_key_long(self, base_cache):
+        base_cache.max_key_length = 50
+        key = base_cache._build_key("a" * 100, namespace="ns:")
+
+        assert len(key) == 50
+        assert key.startswith("ns:aaaa")
+        assert key == base_cache._build_key("a" * 100, namespace="ns:")
+        assert key != base_cache._build_key("a" * 99 + "b", namespace="ns:")
+
+    def test_build_key_short(self, base_cache):
+        base_cache.max_key_length = 50
+        assert base_cache._build_key(pytest.KEY) == pytest.KEY
+
+    def test_normalize_key_bytes(self, base_cache):
+        base_cache.max_key_length = 50
+        key = base_cache._normalize_key(b"\x00" * 100)
+        assert len(key) == 50
+        assert key.startswith(b"\x00")
+
+    def test_max_key_length_too_short(self):
+        with pytest.raises(ValueError):
+            BaseCache(max_key_length=32)
+
 
 class TestCache:
     """
@@ -250,6 +346,104 @@ class TestCache:
         assert mock_cache.plugins[0].pre_get.call_count == 1
         assert mock_cache.plugins[0].post_get.call_count == 1
 
+    @pytest.mark.asyncio
+    async def test_get_default_on_miss(self, mock_cache):
+        mock_cache._get = asynctest.CoroutineMock(return_value=None)
+        default = object()
+
+        assert await mock_cache.get(pytest.KEY, default=default) is default
+        assert mock_cache.serializer.loads.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_get_disabled_returns_default(self, mock_cache):
+        default = object()
+        with patch.dict(os.environ, {'AIOCACHE_DISABLE': '1'}):
+            assert await mock_cache.get(pytest.KEY, default=default) is default
+            assert await mock_cache.multi_get([pytest.KEY, pytest.KEY_1], default=0) == [0, 0]
+            assert await mock_cache.multi_ttl([pytest.KEY, pytest.KEY_1]) == [None, None]
+        assert mock_cache._get.call_count == 0
+        assert mock_cache._multi_ttl.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_get_falsy_value(self, mock_cache):
+        mock_cache._get = asynctest.CoroutineMock(return_value="0")
+        mock_cache.serializer.loads.return_value = 0
+
+        assert await mock_cache.get(pytest.KEY, default=1) == 0
+
+    @pytest.mark.asyncio
+    async def test_get_lazy(self, mock_cache):
+        mock_cache._get = asynctest.CoroutineMock(return_value="value")
+        mock_cache.serializer.loads.return_value = "loaded"
+        value = await mock_cache.get(pytest.KEY, lazy=True)
+
+        assert isinstance(value, LazyValue)
+        assert value.raw == "value"
+        assert mock_cache.serializer.loads.call_count == 0
+        assert value.value == "loaded"
+
+    @pytest.mark.asyncio
+    async def test_get_lazy_miss(self, mock_cache):
+        mock_cache._get = asynctest.CoroutineMock(return_value=None)
+        assert await mock_cache.get(pytest.KEY, default=1, lazy=True) == 1
+
+    @pytest.mark.asyncio
+    async def test_multi_get_lazy(self, mock_cache):
+        mock_cache._multi_get = asynctest.CoroutineMock(return_value=["a", None])
+        values = await mock_cache.multi_get([pytest.KEY, pytest.KEY_1], lazy=True)
+
+        assert [value.raw for value in values[:1]] == ["a"]
+        assert values[1] is None
+        assert mock_cache.serializer.loads.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_get_serialized_hook(self, mock_cache):
+        mock_cache._get = asynctest.CoroutineMock(return_value="value")
+        await mock_cache.get(pytest.KEY)
+
+        mock_cache.plugins[0].serialized.assert_called_with(
+            mock_cache, "get", took=ANY, offloaded=False)
+
+    @pytest.mark.asyncio
+    async def test_get_offloaded(self, mock_cache, mocker):
+        # The executor thread may take longer than the mock timeout to start
+        mock_cache.timeout = None
+        mock_cache._get = asynctest.CoroutineMock(return_value="value")
+        mock_cache.serializer.offload_threshold = 5
+        mock_cache.serializer.executor = None
+        mock_cache.serializer.loads.return_value = "loaded"
+        loop = asyncio.get_event_loop()
+        mocker.spy(loop, "run_in_executor")
+
+        assert await mock_cache.get(pytest.KEY) == "loaded"
+        assert loop.run_in_executor.call_count == 1
+        mock_cache.plugins[0].serialized.assert_called_with(
+            mock_cache, "get", took=ANY, offloaded=True)
+
+    @pytest.mark.asyncio
+    async def test_get_under_offload_threshold(self, mock_cache, mocker):
+        mock_cache._get = asynctest.CoroutineMock(return_value="value")
+        mock_cache.serializer.offload_threshold = 6
+        loop = asyncio.get_event_loop()
+        mocker.spy(loop, "run_in_executor")
+
+        await mock_cache.get(pytest.KEY)
+        assert loop.run_in_executor.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_multi_set_offloaded_at_once(self, mock_cache, mocker):
+        # The executor thread may take longer than the mock timeout to start
+        mock_cache.timeout = None
+        mock_cache.serializer.offload_threshold = 10
+        mock_cache.serializer.executor = None
+        mock_cache.serializer.sizeof.return_value = 5
+        loop = asyncio.get_event_loop()
+        mocker.spy(loop, "run_in_executor")
+
+        await mock_cache.multi_set([(pytest.KEY, "value"), (pytest.KEY_1, "value")])
+        assert loop.run_in_executor.call_count == 1
+        assert mock_cache.serializer.dumps.call_count == 2
+
     @pytest.mark.asyncio
     async def test_get_timeouts(self, mock_cache):
         mock_cache._get = self.asleep
@@ -266,6 +460,129 @@ class TestCache:
         assert mock_cache.plugins[0].pre_set.call_count == 1
         assert mock_cache.plugins[0].post_set.call_count == 1
 
+    @pytest.mark.asyncio
+    async def test_set_ttl_jitter(self, mock_cache):
+        mock_cache.ttl_jitter = 0.5
+        for _ in range(10):
+            await mock_cache.set(pytest.KEY, "value", ttl=10)
+            ttl = mock_cache._set.call_args[0][2]
+            assert isinstance(ttl, int)
+            assert 5 <= ttl <= 15
+
+    @pytest.mark.asyncio
+    async def test_set_ttl_jitter_without_ttl(self, mock_cache):
+        mock_cache.ttl_jitter = 0.5
+        await mock_cache.set(pytest.KEY, "value")
+        mock_cache._set.assert_called_with(mock_cache._build_key(pytest.KEY), ANY, None, _conn=ANY)
+
+    @pytest.mark.asyncio
+    async def test_mset_ttl_jitter(self, mock_cache):
+        mock_cache.ttl_jitter = 0.5
+        await mock_cache.multi_set([[pytest.KEY, "value"], [pytest.KEY_1, "value1"]], ttl=2.0)
+
+        ttls = mock_cache._multi_set.call_args[0][1]
+        assert len(ttls) == 2
+        assert all(isinstance(ttl, float) and 1 <= ttl <= 3 for ttl in ttls)
+
+    @pytest.mark.asyncio
+    async def test_set_soft_ttl(self, mock_cache):
+        mock_cache.serializer.dumps.return_value = "value"
+        await mock_cache.set(pytest.KEY, "value", ttl=10, soft_ttl=2)
+
+        value, meta = _envelope.unwrap(mock_cache._set.call_args[0][1])
+        assert value == "value"
+        assert list(meta) == ["soft"]
+
+    @pytest.mark.asyncio
+    async def test_get_stale_refreshes_once(self, mock_cache):
+        mock_cache._get = asynctest.CoroutineMock(return_value=_envelope.wrap("stale", soft=0))
+        mock_cache.serializer.loads.side_effect = lambda value: value
+        mock_cache.serializer.dumps.side_effect = lambda value: value
+        loader = asynctest.CoroutineMock(return_value="fresh")
+        mock_cache.register_loader(pytest.KEY, loader, ttl=10, soft_ttl=2)
+
+        assert await mock_cache.get(pytest.KEY) == "stale"
+        assert await mock_cache.get(pytest.KEY) == "stale"
+        await asyncio.sleep(0.001)
+
+        assert loader.call_count == 1
+        mock_cache._set.assert_called_with(
+            mock_cache._build_key(pytest.KEY), ANY, 10, _conn=ANY)
+        assert mock_cache._refreshing == {}
+
+    def test_register_loader_drops_expired(self, mock_cache):
+        for i in range(10):
+            mock_cache.register_loader(str(i), asynctest.CoroutineMock(), ttl=0.001)
+
+        time.sleep(0.002)
+        mock_cache.register_loader(pytest.KEY, asynctest.CoroutineMock(), ttl=10)
+        assert list(mock_cache._loaders) == [mock_cache._build_key(pytest.KEY)]
+
+    def test_register_loader_max_loaders(self, mock_cache):
+        mock_cache.max_loaders = 2
+        for key in ["a", "b", "c"]:
+            mock_cache.register_loader(key, asynctest.CoroutineMock())
+
+        assert list(mock_cache._loaders) == [
+            mock_cache._build_key("b"), mock_cache._build_key("c")]
+
+    @pytest.mark.asyncio
+    async def test_get_stale_expired_loader(self, mock_cache):
+        mock_cache._get = asynctest.CoroutineMock(return_value=_envelope.wrap("stale", soft=0))
+        mock_cache.serializer.loads.side_effect = lambda value: value
+        loader = asynctest.CoroutineMock(return_value="fresh")
+        mock_cache.register_loader(pytest.KEY, loader, ttl=0.001, soft_ttl=2)
+
+        # Not patching time.monotonic, the event loop clock uses it too
+        time.sleep(0.002)
+        assert await mock_cache.get(pytest.KEY) == "stale"
+        await asyncio.sleep(0.001)
+
+        assert loader.call_count == 0
+        assert mock_cache._loaders == {}
+
+    @pytest.mark.asyncio
+    async def test_delete_unregisters_loader(self, mock_cache):
+        mock_cache.register_loader(pytest.KEY, asynctest.CoroutineMock())
+        await mock_cache.delete(pytest.KEY)
+
+        assert mock_cache._loaders == {}
+
+    @pytest.mark.asyncio
+    async def test_set_compute_time(self, mock_cache):
+        mock_cache.serializer.dumps.return_value = "value"
+        await mock_cache.set(pytest.KEY, "value", ttl=10, compute_time=0.5)
+
+        value, meta = _envelope.unwrap(mock_cache._set.call_args[0][1])
+        assert value == "value"
+        assert meta["ct"] == 0.5
+        assert "exp" in meta
+
+    @pytest.mark.asyncio
+    async def test_set_compute_time_without_ttl(self, mock_cache):
+        mock_cache.serializer.dumps.return_value = "value"
+        await mock_cache.set(pytest.KEY, "value", compute_time=0.5)
+
+        assert mock_cache._set.call_args[0][1] == "value"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("compute_time, found", [(1000, False), (0.001, True)])
+    async def test_get_xfetch(self, mocker, mock_cache, compute_time, found):
+        mocker.patch("aiocache.base.random.random", return_value=0.5)
+        mock_cache._get = asynctest.CoroutineMock(
+            return_value=_envelope.wrap("value", exp=time.time() + 10, ct=compute_time))
+        mock_cache.serializer.loads.side_effect = lambda value: value
+
+        assert (await mock_cache.get(pytest.KEY) == "value") is found
+
+    @pytest.mark.asyncio
+    async def test_get_stale_without_loader(self, mock_cache):
+        mock_cache._get = asynctest.CoroutineMock(return_value=_envelope.wrap("stale", soft=0))
+        mock_cache.serializer.loads.side_effect = lambda value: value
+
+        assert await mock_cache.get(pytest.KEY) == "stale"
+        assert mock_cache._refreshing == {}
+
     @pytest.mark.asyncio
     async def test_set_timeouts(self, mock_cache):
         mock_cache._set = self.asleep
@@ -283,6 +600,60 @@ class TestCache:
         assert mock_cache.plugins[0].pre_add.call_count == 1
         assert mock_cache.plugins[0].post_add.call_count == 1
 
+    @pytest.mark.asyncio
+    async def test_multi_get_loads_many(self, mock_cache):
+        mock_cache._multi_get = asynctest.CoroutineMock(return_value=["a", None, "b"])
+        mock_cache.serializer.loads_many = MagicMock(return_value=[1, 2])
+
+        assert await mock_cache.multi_get([pytest.KEY, "other", pytest.KEY_1]) == [1, None, 2]
+        mock_cache.serializer.loads_many.assert_called_with(["a", "b"])
+        assert mock_cache.serializer.loads.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_multi_get_subclass_loads_over_loads_many(self, mock_cache):
+        class CustomSerializer(JsonSerializer):
+            @classmethod
+            def loads(cls, value):
+                return ("custom", super().loads(value))
+
+        mock_cache.serializer = CustomSerializer()
+        mock_cache._get = asynctest.CoroutineMock(return_value="1")
+        mock_cache._multi_get = asynctest.CoroutineMock(return_value=["1", "2"])
+
+        assert await mock_cache.get(pytest.KEY) == ("custom", 1)
+        assert await mock_cache.multi_get([pytest.KEY, pytest.KEY_1]) == [
+            ("custom", 1), ("custom", 2)]
+
+    @pytest.mark.asyncio
+    async def test_multi_set_subclass_dumps_over_dumps_many(self, mock_cache):
+        class CustomSerializer(MsgPackSerializer):
+            @classmethod
+            def dumps(cls, value):
+                return b"custom"
+
+        mock_cache.serializer = CustomSerializer()
+        await mock_cache.multi_set([(pytest.KEY, 1), (pytest.KEY_1, 2)])
+
+        mock_cache._multi_set.assert_called_with([
+            (mock_cache._build_key(pytest.KEY), b"custom"),
+            (mock_cache._build_key(pytest.KEY_1), b"custom")], None, _conn=ANY)
+
+    @pytest.mark.asyncio
+    async def test_multi_get_loads_fn_over_loads_many(self, mock_cache):
+        mock_cache.serializer.loads_many = MagicMock()
+        await mock_cache.multi_get([pytest.KEY, pytest.KEY_1], loads_fn=str)
+        assert mock_cache.serializer.loads_many.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_multi_set_dumps_many(self, mock_cache):
+        mock_cache.serializer.dumps_many = MagicMock(return_value=["1", "2"])
+        await mock_cache.multi_set([(pytest.KEY, 1), (pytest.KEY_1, 2)])
+
+        mock_cache.serializer.dumps_many.assert_called_with([1, 2])
+        mock_cache._multi_set.assert_called_with([
+            (mock_cache._build_key(pytest.KEY), "1"),
+            (mock_cache._build_key(pytest.KEY_1), "2")], None, _conn=ANY)
+
     @pytest.mark.asyncio
     async def test_add_timeouts(self, mock_cache):
         mock_cache._add = self.asleep
@@ -300,6 +671,15 @@ class TestCache:
         assert mock_cache.plugins[0].pre_multi_get.call_count == 1
         assert mock_cache.plugins[0].post_multi_get.call_count == 1
 
+    @pytest.mark.asyncio
+    async def test_mget_default_on_miss(self, mock_cache):
+        mock_cache._multi_get = asynctest.CoroutineMock(return_value=["a", None])
+        mock_cache.serializer.loads.return_value = ""
+        default = object()
+
+        assert await mock_cache.multi_get(
+            [pytest.KEY, pytest.KEY_1], default=default) == ["", default]
+
     @pytest.mark.asyncio
     async def test_mget_timeouts(self, mock_cache):
         mock_cache._multi_get = self.asleep
@@ -383,6 +763,114 @@ class TestCache:
         with pytest.raises(asyncio.TimeoutError):
             await mock_cache.expire(pytest.KEY, 0)
 
+    @pytest.mark.asyncio
+    async def test_ttl(self, mock_cache):
+        await mock_cache.ttl(pytest.KEY)
+        mock_cache._ttl.assert_called_with(mock_cache._build_key(pytest.KEY), _conn=ANY)
+        assert mock_cache.plugins[0].pre_ttl.call_count == 1
+        assert mock_cache.plugins[0].post_ttl.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_ttl_timeouts(self, mock_cache):
+        mock_cache._ttl = self.asleep
+
+        with pytest.raises(asyncio.TimeoutError):
+            await mock_cache.ttl(pytest.KEY)
+
+    @pytest.mark.asyncio
+    async def test_multi_ttl(self, mock_cache):
+        await mock_cache.multi_ttl([pytest.KEY, pytest.KEY_1])
+        mock_cache._multi_ttl.assert_called_with([
+            mock_cache._build_key(pytest.KEY), mock_cache._build_key(pytest.KEY_1)], _conn=ANY)
+        assert mock_cache.plugins[0].pre_multi_ttl.call_count == 1
+        assert mock_cache.plugins[0].post_multi_ttl.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_opens(self, mock_cache):
+        mock_cache.circuit_breaker = CircuitBreaker(failure_threshold=2)
+        mock_cache._get = self.asleep
+
+        for _ in range(2):
+            with pytest.raises(asyncio.TimeoutError):
+                await mock_cache.get(pytest.KEY)
+
+        assert await mock_cache.get(pytest.KEY, default="default") == "default"
+        assert mock_cache.plugins[0].circuit_opened.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_open_fallbacks(self, mock_cache):
+        mock_cache.circuit_breaker = CircuitBreaker()
+        mock_cache.circuit_breaker.state = "open"
+        mock_cache.circuit_breaker._opened_at = time.monotonic()
+
+        assert await mock_cache.get(pytest.KEY, "default") == "default"
+        assert await mock_cache.multi_get([pytest.KEY, pytest.KEY_1], default=0) == [0, 0]
+        assert await mock_cache.set(pytest.KEY, "value") is False
+        assert await mock_cache.multi_set([(pytest.KEY, "value")]) is False
+        assert await mock_cache.delete(pytest.KEY) == 0
+        assert await mock_cache.increment(pytest.KEY) is None
+        assert await mock_cache.multi_ttl([pytest.KEY]) == [None]
+        assert mock_cache._get.call_count == 0
+        assert mock_cache._set.call_count == 0
+        assert mock_cache.plugins[0].pre_get.call_count == 0
+        assert mock_cache.circuit_breaker.counters["rejected"] == 7
+
+    @pytest.mark.asyncio
+    async def test_write_behind_buffers(self, mock_cache):
+        mock_cache._write_buffer = _WriteBuffer(mock_cache, 10, 100)
+
+        assert await mock_cache.set(pytest.KEY, "value") is True
+        assert await mock_cache.delete(pytest.KEY_1) == 1
+        assert await mock_cache.increment("counter", 2) is None
+        assert mock_cache._set.call_count == 0
+        assert mock_cache._delete.call_count == 0
+        assert mock_cache._increment.call_count == 0
+        assert mock_cache.plugins[0].post_set.call_count == 1
+
+        await mock_cache.close()
+        assert mock_cache._multi_set.call_count == 1
+        assert mock_cache._delete.call_count == 1
+        assert mock_cache._increment.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_write_behind_read_flushes_key(self, mock_cache):
+        mock_cache._write_buffer = _WriteBuffer(mock_cache, 10, 100)
+        await mock_cache.set(pytest.KEY, "value")
+
+        await mock_cache.get(pytest.KEY_1)
+        assert mock_cache._multi_set.call_count == 0
+
+        await mock_cache.get(pytest.KEY)
+        assert mock_cache._multi_set.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_get_touch_on_read(self, mock_cache):
+        mock_cache.touch_on_read = 10
+        await mock_cache.get(pytest.KEY)
+
+        mock_cache._get_touch.assert_called_with(
+            mock_cache._build_key(pytest.KEY), 10, encoding=ANY, _conn=ANY)
+        assert mock_cache._get.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_get_touch_on_read_ignores_xfetch(self, mock_cache):
+        mock_cache.touch_on_read = 10
+        mock_cache._get_touch = asynctest.CoroutineMock(
+            return_value=_envelope.wrap("value", exp=time.time() - 1, ct=0.5))
+        mock_cache.serializer.loads.side_effect = lambda value: value
+
+        assert await mock_cache.get(pytest.KEY) == "value"
+
+    @pytest.mark.asyncio
+    async def test_mget_touch_on_read(self, mock_cache):
+        mock_cache.touch_on_read = 10
+        await mock_cache.multi_get([pytest.KEY, pytest.KEY_1])
+
+        mock_cache._multi_get_touch.assert_called_with([
+            mock_cache._build_key(pytest.KEY), mock_cache._build_key(pytest.KEY_1)],
+            10, encoding=ANY, _conn=ANY)
+        assert mock_cache._multi_get.call_count == 0
+
     @pytest.mark.asyncio
     async def test_clear(self, mock_cache):
         await mock_cache.clear(pytest.KEY)
@@ -412,6 +900,66 @@ class TestCache:
         with pytest.raises(asyncio.TimeoutError):
             await mock_cache.raw("clear")
 
+    @pytest.mark.asyncio
+    async def test_pipeline(self, mock_cache):
+        mock_cache._get.return_value = "value"
+        mock_cache._increment.return_value = 3
+        mock_cache.serializer.loads.side_effect = lambda value: value
+
+        async with mock_cache.pipeline() as p:
+            value = p.get(pytest.KEY)
+            incremented = p.increment(pytest.KEY_1, 2)
+            assert mock_cache._get.call_count == 0
+
+        assert value.result() == "value"
+        assert incremented.result() == 3
+        mock_cache._get.assert_called_with(mock_cache._build_key(pytest.KEY), ANY, _conn=None)
+        mock_cache._increment.assert_called_with(
+            mock_cache._build_key(pytest.KEY_1), 2, _conn=None)
+
+    @pytest.mark.asyncio
+    async def test_pipeline_serializes(self, mock_cache):
+        async with mock_cache.pipeline() as p:
+            p.set(pytest.KEY, "value", ttl=2)
+
+        mock_cache.serializer.dumps.assert_called_with("value")
+        mock_cache._set.assert_called_with(
+            mock_cache._build_key(pytest.KEY), mock_cache.serializer.dumps.return_value, 2,
+            _conn=None)
+
+    @pytest.mark.asyncio
+    async def test_pipeline_command_error(self, mock_cache):
+        mock_cache._add.side_effect = ValueError
+
+        async with mock_cache.pipeline() as p:
+            added = p.add(pytest.KEY, "value")
+            deleted = p.delete(pytest.KEY)
+
+        with pytest.raises(ValueError):
+            added.result()
+        assert deleted.result() == mock_cache._delete.return_value
+
+    @pytest.mark.asyncio
+    async def test_pipeline_exception_cancels(self, mock_cache):
+        with pytest.raises(KeyError):
+            async with mock_cache.pipeline() as p:
+                value = p.get(pytest.KEY)
+                raise KeyError
+
+        assert value.cancelled()
+        assert mock_cache._get.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_pipeline_timeouts(self, mock_cache):
+        mock_cache._get = self.asleep
+
+        with pytest.raises(asyncio.TimeoutError):
+            async with mock_cache.pipeline() as p:
+                value = p.get(pytest.KEY)
+
+        with pytest.raises(asyncio.TimeoutError):
+            value.result()
+
     @pytest.mark.asyncio
     async def test_get_connection(self, mock_cache):
         async with mock_cache.get_connection():
@@ -0,0 +1,158 @@
+import asyncio
+import pytest
+import asynctest
+
+from unittest.mock import MagicMock
+
+from aiocache.breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from aiocache.plugins import BasePlugin
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.plugins = [asynctest.Mock(spec=BasePlugin)]
+    return client
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker(failure_threshold=2, window=10, recovery_timeout=0.01)
+
+
+async def fail(client):
+    raise asyncio.TimeoutError()
+
+
+async def succeed(client):
+    return "value"
+
+
+def fallback(client):
+    return "fallback"
+
+
+async def open_circuit(breaker, client):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(client, fail, fallback)
+
+
+class TestCircuitBreaker:
+
+    @pytest.mark.asyncio
+    async def test_closed_calls_func(self, breaker, client):
+        assert await breaker.call(client, succeed, fallback) == "value"
+        assert breaker.state == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_opens_after_threshold(self, breaker, client):
+        await open_circuit(breaker, client)
+
+        assert breaker.state == OPEN
+        assert breaker.counters["opened"] == 1
+        assert breaker.counters["failures"] == 2
+        client.plugins[0].circuit_opened.assert_called_with(client)
+
+    @pytest.mark.asyncio
+    async def test_success_resets_failures(self, breaker, client):
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(client, fail, fallback)
+        await breaker.call(client, succeed, fallback)
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(client, fail, fallback)
+
+        assert breaker.state == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_failures_out_of_window(self, breaker, client):
+        breaker.window = 0.001
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(client, fail, fallback)
+        await asyncio.sleep(0.005)
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(client, fail, fallback)
+
+        assert breaker.state == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_excluded_dont_count(self, breaker, client):
+        async def add_existing(client):
+            raise ValueError()
+
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                await breaker.call(client, add_existing, fallback)
+
+        assert breaker.state == CLOSED
+        assert breaker.counters["failures"] == 0
+
+    @pytest.mark.asyncio
+    async def test_open_returns_fallback(self, breaker, client):
+        func = asynctest.CoroutineMock()
+        await open_circuit(breaker, client)
+
+        assert await breaker.call(client, func, fallback) == "fallback"
+        assert func.call_count == 0
+        assert breaker.counters["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe_closes(self, breaker, client):
+        await open_circuit(breaker, client)
+        await asyncio.sleep(0.02)
+
+        assert await breaker.call(client, succeed, fallback) == "value"
+        assert breaker.state == CLOSED
+        assert breaker.counters["half_opened"] == 1
+        assert breaker.counters["closed"] == 1
+        client.plugins[0].circuit_half_opened.assert_called_with(client)
+        client.plugins[0].circuit_closed.assert_called_with(client)
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe_fails(self, breaker, client):
+        await open_circuit(breaker, client)
+        await asyncio.sleep(0.02)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(client, fail, fallback)
+        assert breaker.state == OPEN
+        assert breaker.counters["opened"] == 2
+
+    @pytest.mark.asyncio
+    async def test_half_open_limits_probes(self, breaker, client):
+        await open_circuit(breaker, client)
+        await asyncio.sleep(0.02)
+        probe_started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow(client):
+            probe_started.set()
+            await release.wait()
+            return "value"
+
+        probe = asyncio.ensure_future(breaker.call(client, slow, fallback))
+        await probe_started.wait()
+
+        assert breaker.state == HALF_OPEN
+        assert await breaker.call(client, succeed, fallback) == "fallback"
+
+        release.set()
+        assert await probe == "value"
+        assert breaker.state == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_cancelled_releases_probe(self, breaker, client):
+        await open_circuit(breaker, client)
+        await asyncio.sleep(0.02)
+
+        async def hang(client):
+            await asyncio.sleep(1)
+
+        probe = asyncio.ensure_future(breaker.call(client, hang, fallback))
+        await asyncio.sleep(0)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        assert breaker.state == HALF_OPEN
+        assert await breaker.call(client, succeed, fallback) == "value"
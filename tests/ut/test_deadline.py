@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+
+from aiocache._deadline import _Deadline
+
+
+class TestDeadline:
+
+    @pytest.mark.asyncio
+    async def test_no_timeout(self):
+        async with _Deadline(0.01):
+            await asyncio.sleep(0)
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        with pytest.raises(asyncio.TimeoutError):
+            async with _Deadline(0.002):
+                await asyncio.sleep(0.01)
+
+    @pytest.mark.asyncio
+    async def test_doesnt_create_tasks(self, mocker):
+        mocker.spy(asyncio, "ensure_future")
+        async with _Deadline(0.01):
+            await asyncio.sleep(0)
+        assert asyncio.ensure_future.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_none_is_unbounded(self):
+        async with _Deadline(None) as deadline:
+            await asyncio.sleep(0.005)
+        assert deadline.when is None
+        assert deadline.timeout is None
+
+    @pytest.mark.asyncio
+    async def test_budget_shared_between_blocks(self):
+        budget = _Deadline(0.01)
+        async with budget:
+            await asyncio.sleep(0.006)
+
+        with pytest.raises(asyncio.TimeoutError):
+            async with budget:
+                await asyncio.sleep(0.006)
+
+    @pytest.mark.asyncio
+    async def test_nested_gets_remaining_budget(self):
+        async with _Deadline(0.01) as outer:
+            async with _Deadline(5) as inner:
+                assert inner.when == outer.when
+                assert inner._handle is None
+
+    @pytest.mark.asyncio
+    async def test_nested_tighter_deadline(self):
+        async with _Deadline(5) as outer:
+            with pytest.raises(asyncio.TimeoutError):
+                async with _Deadline(0.002) as inner:
+                    assert inner.when < outer.when
+                    await asyncio.sleep(0.01)
+            await asyncio.sleep(0)
+
+    @pytest.mark.asyncio
+    async def test_nested_raises_when_outer_expires(self):
+        with pytest.raises(asyncio.TimeoutError):
+            async with _Deadline(0.002):
+                async with _Deadline(5):
+                    await asyncio.sleep(0.01)
+
+    @pytest.mark.asyncio
+    async def test_cancel_not_converted(self):
+        async def cancel_me():
+            async with _Deadline(5):
+                await asyncio.sleep(1)
+
+        task = asyncio.ensure_future(cancel_me())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
@@ -8,7 +8,8 @@ import asynctest
 from asynctest import Mock, CoroutineMock, ANY
 
 from aiocache import cached, cached_stampede, multi_cached, SimpleMemoryCache
-from aiocache.base import _Conn
+from aiocache.decorators import _MISSING
+from aiocache.refresh import RefreshAhead
 from aiocache.serializers import JsonSerializer
 
 
@@ -29,7 +30,6 @@ class TestCached:
     @pytest.fixture
     def decorator_call(self, decorator):
         d = decorator(stub)
-        decorator._conn = decorator.cache.get_connection()
         yield d
 
     @pytest.fixture(autouse=True)
@@ -46,7 +46,6 @@ class TestCached:
         assert c.key == "key"
         assert c.key_from_attr == "key_attr"
         assert c.cache is None
-        assert c._conn is None
         assert c._cache == SimpleMemoryCache
         assert c._serializer == JsonSerializer
         assert c._kwargs == {'namespace': 'test'}
@@ -85,13 +84,52 @@ class TestCached:
         assert decorator.get_cache_key(
             stub, ('self', 1, 2), {'a': 1, 'b': 2}) == "stub(1, 2)[('a', 1), ('b', 2)]"
 
+    def test_get_cache_key_with_key_attr_positional(self, decorator):
+        async def fn(user_id, full=False):
+            pass
+
+        decorator.key_from_attr = "user_id"
+        assert decorator.get_cache_key(fn, (1,), {}) == 1
+
+    def test_get_cache_key_with_key_attr_default(self, decorator):
+        async def fn(user_id, full=False):
+            pass
+
+        decorator.key_from_attr = "full"
+        assert decorator.get_cache_key(fn, (1,), {}) is False
+
+    def test_get_cache_key_with_key_attr_missing(self, decorator):
+        decorator.key_from_attr = "pick_me"
+        assert decorator.get_cache_key(stub, (1, 2), {}) == "stub(1, 2)[]"
+
+    def test_get_cache_key_with_key_builder(self, decorator):
+        async def fn(user_id, full=False):
+            pass
+
+        decorator.key_builder = Mock(return_value="key")
+        decorator.key_from_attr = "ignore_me"
+
+        assert decorator.get_cache_key(fn, (1,), {}) == "key"
+        decorator.key_builder.assert_called_with(fn, {"user_id": 1, "full": False})
+
+    def test_get_cache_key_inspects_once(self, decorator, mocker):
+        async def fn(user_id, full=False):
+            pass
+
+        decorator(fn)
+        signature = mocker.spy(inspect, "signature")
+        decorator.key_from_attr = "full"
+
+        assert decorator.get_cache_key(fn, (1,), {}) is False
+        assert signature.call_count == 0
+
     @pytest.mark.asyncio
     async def test_calls_get_and_returns(self, decorator, decorator_call):
         decorator.cache.get = CoroutineMock(return_value=1)
 
         await decorator_call()
 
-        decorator.cache.get.assert_called_with('stub()[]', _conn=ANY)
+        decorator.cache.get.assert_called_with('stub()[]', default=_MISSING)
         assert decorator.cache.set.call_count == 0
         assert stub.call_count == 0
 
@@ -103,35 +141,41 @@ class TestCached:
     @pytest.mark.asyncio
     async def test_get_from_cache_exception(self, decorator, decorator_call):
         decorator.cache.get = CoroutineMock(side_effect=Exception)
-        assert await decorator.get_from_cache("key") is None
+        assert await decorator.get_from_cache("key") is _MISSING
 
     @pytest.mark.asyncio
     async def test_get_from_cache_none(self, decorator, decorator_call):
-        decorator.cache.get = CoroutineMock(return_value=None)
-        assert await decorator.get_from_cache("key") is None
+        decorator.cache.get = CoroutineMock(return_value=_MISSING)
+        assert await decorator.get_from_cache("key") is _MISSING
+
+    @pytest.mark.asyncio
+    async def test_get_from_cache_falsy(self, decorator, decorator_call):
+        decorator.cache.get = CoroutineMock(return_value=0)
+        assert await decorator.get_from_cache("key") == 0
 
     @pytest.mark.asyncio
-    async def test_get_from_cache_conn(self, decorator, decorator_call):
+    async def test_get_from_cache_doesnt_close(self, decorator, decorator_call):
         decorator.cache.get = CoroutineMock(return_value=1)
-        decorator._conn._conn = Mock()
         await decorator.get_from_cache("key")
-        decorator.cache.get.assert_called_with(pytest.KEY, _conn=decorator._conn._conn)
+        await asyncio.sleep(0)
+        assert decorator.cache.close.call_count == 0
 
     @pytest.mark.asyncio
     async def test_calls_fn_set_when_get_none(self, mocker, decorator, decorator_call):
         mocker.spy(decorator, 'get_from_cache')
         mocker.spy(decorator, 'set_in_cache')
-        decorator.cache.get = CoroutineMock(return_value=None)
+        decorator.cache.get = CoroutineMock(return_value=_MISSING)
 
         await decorator_call(value="value")
 
         assert decorator.get_from_cache.call_count == 1
-        decorator.set_in_cache.assert_called_with("stub()[('value', 'value')]", "value")
+        decorator.set_in_cache.assert_called_with(
+            "stub()[('value', 'value')]", "value", compute_time=ANY)
         stub.assert_called_once_with(value="value")
 
     @pytest.mark.asyncio
     async def test_calls_fn_raises_exception(self, mocker, decorator, decorator_call):
-        decorator.cache.get = CoroutineMock(return_value=None)
+        decorator.cache.get = CoroutineMock(return_value=_MISSING)
         stub.side_effect = Exception()
         with pytest.raises(Exception):
             assert await decorator_call()
@@ -139,13 +183,13 @@ class TestCached:
     @pytest.mark.asyncio
     async def test_set_calls_set(self, decorator, decorator_call):
         await decorator.set_in_cache("key", "value")
-        decorator.cache.set.assert_called_with("key", "value", _conn=ANY, ttl=None)
+        decorator.cache.set.assert_called_with("key", "value", ttl=None)
 
     @pytest.mark.asyncio
     async def test_set_calls_set_ttl(self, decorator, decorator_call):
         decorator.ttl = 10
         await decorator.set_in_cache("key", "value")
-        decorator.cache.set.assert_called_with("key", "value", _conn=ANY, ttl=decorator.ttl)
+        decorator.cache.set.assert_called_with("key", "value", ttl=decorator.ttl)
 
     @pytest.mark.asyncio
     async def test_set_catches_exception(self, decorator, decorator_call):
@@ -153,15 +197,139 @@ class TestCached:
         assert await decorator.set_in_cache("key", "value") is None
 
     @pytest.mark.asyncio
-    async def test_set_with_conn(self, decorator, decorator_call):
-        decorator._conn._conn = Mock()
-        await decorator.set_in_cache("key", "value")
+    async def test_set_none_uses_negative_ttl(self, decorator, decorator_call):
+        decorator.ttl = 10
+        decorator.negative_ttl = 1
+        await decorator.set_in_cache("key", None)
+        decorator.cache.set.assert_called_with("key", None, ttl=1)
+
+    @pytest.mark.asyncio
+    async def test_set_falsy_uses_ttl(self, decorator, decorator_call):
+        decorator.ttl = 10
+        decorator.negative_ttl = 1
+        await decorator.set_in_cache("key", 0)
+        decorator.cache.set.assert_called_with("key", 0, ttl=10)
+
+    @pytest.mark.asyncio
+    async def test_returns_cached_falsy(self, decorator, decorator_call):
+        decorator.cache.get = CoroutineMock(return_value=[])
+
+        assert await decorator_call() == []
+        assert decorator.cache.set.call_count == 0
+        assert stub.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_single_flight(self, decorator, decorator_call):
+        decorator.single_flight = True
+        decorator.cache.get = CoroutineMock(return_value=_MISSING)
+
+        results = await asyncio.gather(
+            *[decorator_call(value="value", seconds=0.01) for _ in range(5)])
+
+        assert results == ["value"] * 5
+        assert stub.call_count == 1
+        assert decorator.cache.set.call_count == 1
+        assert decorator._flights == {}
+
+    @pytest.mark.asyncio
+    async def test_single_flight_lasts_until_stored(self, decorator, decorator_call):
+        async def set(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return True
+
+        decorator.cache.timeout = None
+        decorator.single_flight = True
+        decorator.cache.get = CoroutineMock(return_value=_MISSING)
+        decorator.cache.set = CoroutineMock(side_effect=set)
+
+        first = asyncio.ensure_future(decorator_call(value="value"))
+        await asyncio.sleep(0.005)
+        assert decorator.cache.set.call_count == 1
+        second = await decorator_call(value="value")
+
+        assert await first == second == "value"
+        assert stub.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_single_flight_propagates_exception(self, decorator, decorator_call):
+        decorator.single_flight = True
+        decorator.cache.get = CoroutineMock(return_value=_MISSING)
+        stub.side_effect = ValueError()
+
+        results = await asyncio.gather(
+            *[decorator_call() for _ in range(3)], return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert stub.call_count == 1
+        assert decorator.cache.set.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_single_flight_disabled(self, decorator, decorator_call):
+        decorator.cache.get = CoroutineMock(return_value=_MISSING)
+
+        await asyncio.gather(*[decorator_call(value="value", seconds=0.01) for _ in range(3)])
+
+        assert stub.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_set_xfetch_compute_time(self, decorator, decorator_call):
+        decorator.ttl = 10
+        decorator.xfetch_beta = 2
+        await decorator.set_in_cache("key", "value", compute_time=0.5)
         decorator.cache.set.assert_called_with(
-            "key", "value", _conn=decorator._conn._conn, ttl=None)
+            "key", "value", ttl=10, compute_time=1.0)
+
+    @pytest.mark.asyncio
+    async def test_set_without_xfetch_ignores_compute_time(self, decorator, decorator_call):
+        await decorator.set_in_cache("key", "value", compute_time=0.5)
+        decorator.cache.set.assert_called_with("key", "value", ttl=None)
+
+    @pytest.mark.asyncio
+    async def test_soft_ttl_registers_loader(self, decorator, decorator_call):
+        decorator.ttl = 10
+        decorator.soft_ttl = 2
+        decorator.cache.get = CoroutineMock(return_value=_MISSING)
+
+        await decorator_call(value="value")
+
+        key = "stub()[('value', 'value')]"
+        decorator.cache.set.assert_called_with(key, "value", ttl=10, soft_ttl=2)
+        entry = decorator.cache._loaders[key]
+        assert (entry.ttl, entry.soft_ttl) == (10, 2)
+        assert await entry.loader() == "value"
+
+    @pytest.mark.asyncio
+    async def test_refresh_ahead_tracks(self, decorator, decorator_call):
+        decorator.ttl = 10
+        decorator.refresh_ahead = RefreshAhead()
+        decorator.cache.get = CoroutineMock(return_value=_MISSING)
+
+        await decorator_call(value="value")
+
+        key = "stub()[('value', 'value')]"
+        assert (decorator, key) in decorator.refresh_ahead
+        await decorator.refresh_ahead.close()
+
+    @pytest.mark.asyncio
+    async def test_refresh_ahead_hit(self, decorator, decorator_call):
+        decorator.refresh_ahead = Mock(spec=RefreshAhead)
+        decorator.cache.get = CoroutineMock(return_value="value")
+
+        await decorator_call(value="value")
+        decorator.refresh_ahead.hit.assert_called_with((decorator, "stub()[('value', 'value')]"))
+
+    @pytest.mark.asyncio
+    async def test_refresh_ahead_refresh(self, decorator, decorator_call):
+        decorator.ttl = 10
+        decorator.refresh_ahead = Mock(spec=RefreshAhead)
+
+        await decorator._refresh_ahead("key", stub, (), {"value": "new"})
+        decorator.cache.set.assert_called_with("key", "new", ttl=10)
+        decorator.refresh_ahead.track.assert_called_with((decorator, "key"), ANY, 10)
 
     @pytest.mark.asyncio
     async def test_decorate(self, mock_cache):
-        mock_cache.get = CoroutineMock(return_value=None)
+        mock_cache.get = CoroutineMock(return_value=_MISSING)
         with asynctest.patch("aiocache.decorators._get_cache", return_value=mock_cache):
             @cached()
             async def fn(n):
@@ -182,32 +350,35 @@ class TestCached:
             assert inspect.getfullargspec(what.__wrapped__).args == ['self', 'a', 'b']
 
     @pytest.mark.asyncio
-    async def test_reuses_connection(self, mocker, decorator, decorator_call):
-        decorator.cache.get = CoroutineMock(return_value=None)
+    async def test_uses_cache_pool(self, mocker, decorator, decorator_call):
+        mocker.spy(decorator.cache, "get_connection")
+        decorator.cache.get = CoroutineMock(return_value=_MISSING)
         await decorator_call(value="value")
 
-        assert decorator._conn._conn is not None
+        assert decorator.conn is decorator.cache
+        assert decorator.cache.get_connection.call_count == 0
         decorator.cache.get.assert_called_with(
-            "stub()[('value', 'value')]", _conn=decorator._conn._conn)
+            "stub()[('value', 'value')]", default=_MISSING)
         decorator.cache.set.assert_called_with(
-            "stub()[('value', 'value')]", 'value',  _conn=decorator._conn._conn, ttl=None)
+            "stub()[('value', 'value')]", 'value', ttl=None)
 
     @pytest.mark.asyncio
-    async def test_different_connection_per_call(self, mocker, decorator, decorator_call):
-        decorator.cache.get = CoroutineMock(return_value=None)
-        conn1, conn2 = _Conn(decorator.cache), _Conn(decorator.cache)
-        mocker.spy(conn1, 'get')
-        mocker.spy(conn1, 'set')
-        mocker.spy(conn2, 'get')
-        mocker.spy(conn2, 'set')
-        decorator.cache.get_connection = Mock(side_effect=[conn1, conn2])
-        await decorator_call(value="value")
-        await decorator_call(value="value")
+    async def test_hit_doesnt_close(self, decorator, decorator_call):
+        decorator.cache.get = CoroutineMock(return_value="value")
+        await decorator_call()
+        await asyncio.sleep(0)
+
+        assert decorator.cache.close.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_keep_their_keys(self, decorator, decorator_call):
+        decorator.cache.get = CoroutineMock(return_value=_MISSING)
+        await asyncio.gather(
+            decorator_call(value="a", seconds=0.01), decorator_call(value="b"))
 
-        conn1.get.call_count = 1
-        conn1.set.call_count = 1
-        conn2.get.call_count = 1
-        conn2.set.call_count = 1
+        decorator.cache.set.assert_any_call(
+            "stub()[('seconds', 0.01), ('value', 'a')]", "a", ttl=None)
+        decorator.cache.set.assert_any_call("stub()[('value', 'b')]", "b", ttl=None)
 
 
 class TestCachedStampede:
@@ -248,20 +419,33 @@ class TestCachedStampede:
 
         await decorator_call()
 
-        decorator.cache.get.assert_called_with('stub()[]')
+        decorator.cache.get.assert_called_with('stub()[]', default=_MISSING)
         assert decorator.cache.set.call_count == 0
         assert stub.call_count == 0
 
     @pytest.mark.asyncio
     async def test_calls_fn_raises_exception(self, mocker, decorator, decorator_call):
-        decorator.cache.get = CoroutineMock(return_value=None)
+        decorator.cache.get = CoroutineMock(return_value=_MISSING)
         stub.side_effect = Exception()
         with pytest.raises(Exception):
             assert await decorator_call()
 
+    @pytest.mark.asyncio
+    async def test_cache_calls_share_timeout(self, decorator, decorator_call):
+        async def get(key, default=None):
+            await asyncio.sleep(0.003)
+            return default
+
+        decorator.cache.timeout = 0.005
+        decorator.cache.get = get
+
+        with pytest.raises(asyncio.TimeoutError):
+            await decorator_call(value="value")
+        assert stub.call_count == 0
+
     @pytest.mark.asyncio
     async def test_calls_redlock(self, decorator, decorator_call):
-        decorator.cache.get = CoroutineMock(return_value=None)
+        decorator.cache.get = CoroutineMock(return_value=_MISSING)
 
         await decorator_call(value="value")
 
@@ -273,7 +457,7 @@ class TestCachedStampede:
 
     @pytest.mark.asyncio
     async def test_calls_locked_client(self, decorator, decorator_call):
-        decorator.cache.get = CoroutineMock(side_effect=[None, None, None, "value"])
+        decorator.cache.get = CoroutineMock(side_effect=[_MISSING, _MISSING, _MISSING, "value"])
         decorator.cache._add = CoroutineMock(side_effect=[True, ValueError])
         decorator.cache._redlock_release = CoroutineMock(side_effect=[1, 0])
 
@@ -286,13 +470,25 @@ class TestCachedStampede:
         assert stub.call_count == 1
 
     @pytest.mark.asyncio
-    async def test_doesnt_reuse_connection(self, mocker, decorator, decorator_call):
-        decorator.cache.get = CoroutineMock(return_value=None)
+    async def test_single_flight(self, decorator, decorator_call):
+        decorator.single_flight = True
+        decorator.cache.get = CoroutineMock(return_value=_MISSING)
+
+        results = await asyncio.gather(
+            *[decorator_call(value="value", seconds=0.01) for _ in range(5)])
+
+        assert results == ["value"] * 5
+        assert stub.call_count == 1
+        assert decorator.cache._redlock.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_uses_cache_pool(self, mocker, decorator, decorator_call):
+        decorator.cache.get = CoroutineMock(return_value=_MISSING)
         await decorator_call(value="value")
 
-        assert decorator._conn is None
+        assert decorator.conn is decorator.cache
         decorator.cache.get.assert_called_with(
-            "stub()[('value', 'value')]")
+            "stub()[('value', 'value')]", default=_MISSING)
         decorator.cache.set.assert_called_with(
             "stub()[('value', 'value')]", 'value', ttl=None)
 
@@ -316,7 +512,6 @@ class TestMultiCached:
     @pytest.fixture
     def decorator_call(self, decorator):
         d = decorator(stub_dict)
-        decorator._conn = decorator.cache.get_connection()
         yield d
 
     @pytest.fixture(autouse=True)
@@ -374,7 +569,8 @@ class TestMultiCached:
         decorator.cache.multi_get = CoroutineMock(return_value=[1, 2, 3])
 
         assert await decorator.get_from_cache('a', 'b', 'c') == [1, 2, 3]
-        decorator.cache.multi_get.assert_called_with(('a', 'b', 'c'), _conn=ANY)
+        decorator.cache.multi_get.assert_called_with(
+            ('a', 'b', 'c'), default=_MISSING)
 
     @pytest.mark.asyncio
     async def test_get_from_cache_no_keys(self, decorator, decorator_call):
@@ -385,16 +581,16 @@ class TestMultiCached:
     async def test_get_from_cache_exception(self, decorator, decorator_call):
         decorator.cache.multi_get = CoroutineMock(side_effect=Exception)
 
-        assert await decorator.get_from_cache('a', 'b', 'c') == [None, None, None]
-        decorator.cache.multi_get.assert_called_with(('a', 'b', 'c'), _conn=ANY)
+        assert await decorator.get_from_cache('a', 'b', 'c') == [_MISSING, _MISSING, _MISSING]
+        decorator.cache.multi_get.assert_called_with(
+            ('a', 'b', 'c'), default=_MISSING)
 
     @pytest.mark.asyncio
-    async def test_get_from_cache_conn(self, decorator, decorator_call):
-        decorator._conn._conn = Mock()
+    async def test_get_from_cache_doesnt_close(self, decorator, decorator_call):
         decorator.cache.multi_get = CoroutineMock(return_value=[1, 2, 3])
-
-        assert await decorator.get_from_cache('a', 'b', 'c') == [1, 2, 3]
-        decorator.cache.multi_get.assert_called_with(('a', 'b', 'c'), _conn=decorator._conn._conn)
+        await decorator.get_from_cache('a', 'b', 'c')
+        await asyncio.sleep(0)
+        assert decorator.cache.close.call_count == 0
 
     @pytest.mark.asyncio
     async def test_calls_no_keys(self, decorator, decorator_call):
@@ -417,27 +613,27 @@ class TestMultiCached:
     async def test_calls_fn_multi_set_when_multi_get_none(self, mocker, decorator, decorator_call):
         mocker.spy(decorator, 'get_from_cache')
         mocker.spy(decorator, 'set_in_cache')
-        decorator.cache.multi_get = CoroutineMock(return_value=[None, None])
+        decorator.cache.multi_get = CoroutineMock(return_value=[_MISSING, _MISSING])
 
         ret = await decorator_call(1, keys=['a', 'b'], value='value')
 
         decorator.get_from_cache.assert_called_once_with('a', 'b')
-        decorator.set_in_cache.assert_called_with(ret)
+        decorator.set_in_cache.assert_called_with(ret, compute_time=ANY)
         stub_dict.assert_called_once_with(1, keys=['a', 'b'], value="value")
 
     @pytest.mark.asyncio
     async def test_calls_fn_with_only_missing_keys(self, mocker, decorator, decorator_call):
         mocker.spy(decorator, 'set_in_cache')
-        decorator.cache.multi_get = CoroutineMock(return_value=[1, None])
+        decorator.cache.multi_get = CoroutineMock(return_value=[1, _MISSING])
 
         assert await decorator_call(1, keys=['a', 'b'], value='value') == {'a': ANY, 'b': ANY}
 
-        decorator.set_in_cache.assert_called_once_with({'a': ANY, 'b': ANY})
+        decorator.set_in_cache.assert_called_once_with({'a': ANY, 'b': ANY}, compute_time=ANY)
         stub_dict.assert_called_once_with(1, keys=['b'], value="value")
 
     @pytest.mark.asyncio
     async def test_calls_fn_raises_exception(self, mocker, decorator, decorator_call):
-        decorator.cache.multi_get = CoroutineMock(return_value=[None])
+        decorator.cache.multi_get = CoroutineMock(return_value=[_MISSING])
         stub_dict.side_effect = Exception()
         with pytest.raises(Exception):
             assert await decorator_call(keys=[])
@@ -458,6 +654,31 @@ class TestMultiCached:
 
         assert decorator.cache.multi_set.call_args[1]['ttl'] == decorator.ttl
 
+    @pytest.mark.asyncio
+    async def test_set_in_cache_xfetch(self, decorator, decorator_call):
+        decorator.ttl = 10
+        decorator.xfetch_beta = 1
+        await decorator.set_in_cache({'a': 1}, compute_time=0.5)
+
+        decorator.cache.multi_set.assert_called_with(
+            [('a', 1)], ttl=10, compute_time=0.5)
+
+    @pytest.mark.asyncio
+    async def test_set_in_cache_negative_ttl(self, decorator, decorator_call):
+        decorator.ttl = 10
+        decorator.negative_ttl = 1
+        await decorator.set_in_cache({'a': 1, 'b': None})
+
+        decorator.cache.multi_set.assert_any_call([('b', None)], ttl=1)
+        decorator.cache.multi_set.assert_called_with([('a', 1)], ttl=10)
+
+    @pytest.mark.asyncio
+    async def test_returns_cached_none(self, mocker, decorator, decorator_call):
+        decorator.cache.multi_get = CoroutineMock(return_value=[None, 0])
+
+        assert await decorator_call(1, keys=['a', 'b']) == {'a': None, 'b': 0}
+        assert stub_dict.call_count == 0
+
     @pytest.mark.asyncio
     async def test_set_in_cache_exception(self, decorator, decorator_call):
         decorator.cache.multi_set = CoroutineMock(side_effect=Exception)
@@ -466,7 +687,7 @@ class TestMultiCached:
 
     @pytest.mark.asyncio
     async def test_decorate(self, mock_cache):
-        mock_cache.multi_get = CoroutineMock(return_value=[None])
+        mock_cache.multi_get = CoroutineMock(return_value=[_MISSING])
         with asynctest.patch("aiocache.decorators._get_cache", return_value=mock_cache):
 
             @multi_cached(keys_from_attr="keys")
@@ -487,29 +708,12 @@ class TestMultiCached:
         assert inspect.getfullargspec(what.__wrapped__).args == ['self', 'keys', 'what']
 
     @pytest.mark.asyncio
-    async def test_reuses_connection(self, mocker, decorator, decorator_call):
-        decorator.cache.multi_get = CoroutineMock(return_value=[None])
-        await decorator_call(keys=[pytest.KEY])
-
-        assert decorator._conn._conn is not None
-        decorator.cache.multi_get.assert_called_with(
-            ('key',), _conn=decorator._conn._conn)
-        decorator.cache.multi_set.assert_called_with(
-            [('key', None)],  _conn=decorator._conn._conn, ttl=0)
-
-    @pytest.mark.asyncio
-    async def test_different_connection_per_call(self, mocker, decorator, decorator_call):
-        decorator.cache.get = CoroutineMock(return_value=None)
-        conn1, conn2 = _Conn(decorator.cache), _Conn(decorator.cache)
-        mocker.spy(conn1, 'multi_get')
-        mocker.spy(conn1, 'multi_set')
-        mocker.spy(conn2, 'multi_get')
-        mocker.spy(conn2, 'multi_set')
-        decorator.cache.get_connection = Mock(side_effect=[conn1, conn2])
-        await decorator_call(keys=[pytest.KEY])
+    async def test_uses_cache_pool(self, mocker, decorator, decorator_call):
+        mocker.spy(decorator.cache, "get_connection")
+        decorator.cache.multi_get = CoroutineMock(return_value=[_MISSING])
         await decorator_call(keys=[pytest.KEY])
 
-        conn1.multi_get.call_count = 1
-        conn1.multi_set.call_count = 1
-        conn2.multi_get.call_count = 1
-        conn2.multi_set.call_count = 1
+        assert decorator.conn is decorator.cache
+        assert decorator.cache.get_connection.call_count == 0
+        decorator.cache.multi_get.assert_called_with(('key',), default=_MISSING)
+        decorator.cache.multi_set.assert_called_with([('key', None)], ttl=0)
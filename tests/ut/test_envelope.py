@@ -0,0 +1,40 @@
+import json
+import pytest
+
+from aiocache import _envelope
+
+
+class TestEnvelope:
+
+    @pytest.mark.parametrize("payload", ["value", b"value", "", b"", "a\x00b"])
+    def test_wrap_unwrap(self, payload):
+        raw = _envelope.wrap(payload, soft=1.5)
+
+        assert type(raw) is type(payload)
+        assert _envelope.unwrap(raw) == (payload, {"soft": 1.5})
+
+    @pytest.mark.parametrize("raw", ["value", b"value", 1, None, "\x00ac:soft=1.5"])
+    def test_unwrap_without_envelope(self, raw):
+        assert _envelope.unwrap(raw) == (raw, {})
+
+    def test_multiple_fields(self):
+        raw = _envelope.wrap("value", soft=1, exp=2.25)
+        assert _envelope.unwrap(raw) == ("value", {"soft": 1.0, "exp": 2.25})
+
+    @pytest.mark.parametrize("payload", [{"a": 1}, [1, 2], 1, None])
+    def test_wrap_unwrap_object(self, payload):
+        raw = _envelope.wrap(payload, soft=1)
+
+        assert isinstance(raw, dict)
+        assert _envelope.unwrap(raw) == (payload, {"soft": 1.0})
+
+    def test_unwrap_object_after_json(self):
+        raw = json.loads(json.dumps(_envelope.wrap({"a": 1}, exp=2.25, ct=0.5)))
+        assert _envelope.unwrap(raw) == ({"a": 1}, {"exp": 2.25, "ct": 0.5})
+
+    @pytest.mark.parametrize("payload", ["value", b"value", {"a": 1}])
+    def test_other_mark(self, payload):
+        raw = _envelope.wrap(payload, mark="\x00act", soft=1)
+
+        assert _envelope.unwrap(raw) == (raw, {})
+        assert _envelope.unwrap(raw, mark="\x00act") == (payload, {"soft": 1.0})
@@ -0,0 +1,61 @@
+import pytest
+
+from unittest.mock import MagicMock
+
+from aiocache.lazy import LazyValue
+
+
+@pytest.fixture
+def loads():
+    return MagicMock(return_value={"key": "value"})
+
+
+@pytest.fixture
+def lazy(loads):
+    return LazyValue('{"key": "value"}', loads)
+
+
+class TestLazyValue:
+
+    def test_raw_doesnt_load(self, lazy, loads):
+        assert lazy.raw == '{"key": "value"}'
+        assert lazy.loaded is False
+        assert loads.call_count == 0
+
+    def test_bytes(self, lazy):
+        assert bytes(lazy) == b'{"key": "value"}'
+
+    def test_bytes_raw(self, loads):
+        assert bytes(LazyValue(b"value", loads)) == b"value"
+
+    def test_value(self, lazy, loads):
+        assert lazy.value == {"key": "value"}
+        assert lazy.loaded is True
+        loads.assert_called_with('{"key": "value"}')
+
+    def test_loads_once(self, lazy, loads):
+        lazy.value
+        lazy["key"]
+        assert loads.call_count == 1
+
+    def test_getitem(self, lazy):
+        assert lazy["key"] == "value"
+
+    def test_getattr(self, lazy):
+        assert list(lazy.keys()) == ["key"]
+
+    def test_container(self, lazy):
+        assert "key" in lazy
+        assert len(lazy) == 1
+        assert list(lazy) == ["key"]
+        assert bool(lazy) is True
+
+    def test_eq(self, lazy, loads):
+        assert lazy == {"key": "value"}
+        assert lazy == LazyValue("other", loads)
+        assert lazy != {"key": "other"}
+
+    def test_repr(self, lazy):
+        assert repr(lazy) == "<LazyValue unloaded>"
+        lazy.value
+        assert repr(lazy) == "<LazyValue {'key': 'value'}>"
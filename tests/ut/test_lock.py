@@ -48,6 +48,13 @@ class TestLock:
             pytest.KEY + '-lock',
             lock._value)
 
+    @pytest.mark.asyncio
+    async def test_context_manager_propagates_errors(self, mock_cache, lock):
+        mock_cache._redlock_release.return_value = True
+        with pytest.raises(asyncio.TimeoutError):
+            async with lock:
+                raise asyncio.TimeoutError()
+
     @pytest.mark.asyncio
     async def test_acquire_block_timeouts(self, mock_cache, lock):
         await lock._acquire()
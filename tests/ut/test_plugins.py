@@ -1,8 +1,9 @@
 import pytest
+import logging
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, ANY
 
-from aiocache.plugins import BasePlugin, TimingPlugin, HitMissRatioPlugin
+from aiocache.plugins import BasePlugin, TimingPlugin, HitMissRatioPlugin, LoggingPlugin
 from aiocache.base import API, BaseCache
 
 
@@ -13,6 +14,8 @@ class TestBasePlugin:
         for method in API.CMDS:
             assert await getattr(BasePlugin, "pre_{}".format(method.__name__))(MagicMock()) is None
             assert await getattr(BasePlugin, "post_{}".format(method.__name__))(MagicMock()) is None
+        for hook in ["circuit_opened", "circuit_half_opened", "circuit_closed", "serialized"]:
+            assert await getattr(BasePlugin, hook)(MagicMock()) is None
 
     @pytest.mark.asyncio
     async def test_do_nothing(self):
@@ -42,6 +45,15 @@ class TestTimingPlugin:
         assert mock_cache.profiling["set_min"] == 1
         assert mock_cache.profiling["set_avg"] == 1.5
 
+    @pytest.mark.asyncio
+    async def test_serialized(self, mock_cache):
+        await TimingPlugin().serialized(mock_cache, "get", took=1, offloaded=False)
+        await TimingPlugin().serialized(mock_cache, "get", took=3, offloaded=True)
+
+        assert mock_cache.profiling["get_serialization_total"] == 2
+        assert mock_cache.profiling["get_serialization_max"] == 3
+        assert mock_cache.profiling["get_serialization_avg"] == 2
+
     @pytest.mark.asyncio
     async def test_interface_methods(self):
         for method in API.CMDS:
@@ -69,6 +81,15 @@ class TestHitMissRatioPlugin:
         assert client.hit_miss_ratio["total"] == 2
         assert client.hit_miss_ratio['hit_ratio'] == 0.5
 
+    @pytest.mark.asyncio
+    async def test_post_get_falsy_and_default(self, plugin):
+        client = MagicMock(spec=BaseCache)
+        await plugin.post_get(client, pytest.KEY, ret=0)
+        await plugin.post_get(client, pytest.KEY, ret=1, default=1)
+
+        assert client.hit_miss_ratio['hits'] == 1
+        assert client.hit_miss_ratio["total"] == 2
+
     @pytest.mark.asyncio
     async def test_post_multi_get(self, plugin):
         client = MagicMock(spec=BaseCache)
@@ -82,3 +103,48 @@ class TestHitMissRatioPlugin:
         assert client.hit_miss_ratio['hits'] == 2
         assert client.hit_miss_ratio["total"] == 4
         assert client.hit_miss_ratio['hit_ratio'] == 0.5
+
+
+class TestLoggingPlugin:
+
+    @pytest.fixture
+    def logger(self):
+        logger = MagicMock()
+        logger.isEnabledFor.return_value = True
+        return logger
+
+    @pytest.mark.asyncio
+    async def test_post_get(self, logger):
+        plugin = LoggingPlugin(logger=logger)
+        await plugin.post_get(MagicMock(), pytest.KEY, took=1, ret="value")
+
+        logger.log.assert_called_with(
+            logging.INFO, ANY, "GET", pytest.KEY, 1,
+            extra={"aiocache": {"cmd": "get", "key": pytest.KEY, "took": 1, "ret": 1}})
+
+    @pytest.mark.asyncio
+    async def test_post_multi_set_logs_keys(self, logger):
+        plugin = LoggingPlugin(logger=logger)
+        await plugin.post_multi_set(MagicMock(), [(pytest.KEY, "v"), (pytest.KEY_1, "v")])
+
+        assert logger.log.call_args[1]["extra"]["aiocache"]["key"] == [pytest.KEY, pytest.KEY_1]
+
+    @pytest.mark.asyncio
+    async def test_not_sampled(self, logger):
+        plugin = LoggingPlugin(sample_rate=0, logger=logger)
+        await plugin.post_get(MagicMock(), pytest.KEY, took=1, ret="value")
+
+        assert logger.log.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_level_disabled(self, logger):
+        logger.isEnabledFor.return_value = False
+        plugin = LoggingPlugin(logger=logger)
+        await plugin.post_get(MagicMock(), pytest.KEY, took=1, ret="value")
+
+        assert logger.log.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_interface_methods(self):
+        for method in API.CMDS:
+            assert hasattr(LoggingPlugin, "post_{}".format(method.__name__))
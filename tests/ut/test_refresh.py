@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+import asynctest
+
+from aiocache.refresh import RefreshAhead
+
+
+@pytest.fixture
+def refresh_ahead():
+    return RefreshAhead(fraction=0.5, max_concurrency=1)
+
+
+class TestRefreshAhead:
+
+    def test_track_without_ttl(self, refresh_ahead):
+        refresh_ahead.track(pytest.KEY, asynctest.CoroutineMock(), None)
+        assert pytest.KEY not in refresh_ahead
+
+    @pytest.mark.asyncio
+    async def test_hot_key_refreshed(self, refresh_ahead):
+        refresh = asynctest.CoroutineMock()
+        refresh_ahead.track(pytest.KEY, refresh, 0.01)
+        refresh_ahead.hit(pytest.KEY)
+
+        await asyncio.sleep(0.02)
+        assert refresh.call_count == 1
+        assert pytest.KEY not in refresh_ahead
+
+    @pytest.mark.asyncio
+    async def test_cold_key_lapses(self, refresh_ahead):
+        refresh = asynctest.CoroutineMock()
+        refresh_ahead.track(pytest.KEY, refresh, 0.01)
+
+        await asyncio.sleep(0.02)
+        assert refresh.call_count == 0
+        assert pytest.KEY not in refresh_ahead
+
+    @pytest.mark.asyncio
+    async def test_min_rate(self, refresh_ahead):
+        refresh_ahead.min_rate = 1000
+        refresh = asynctest.CoroutineMock()
+        refresh_ahead.track(pytest.KEY, refresh, 0.01)
+        refresh_ahead.hit(pytest.KEY)
+
+        await asyncio.sleep(0.02)
+        assert refresh.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_refresh_tracks_again(self, refresh_ahead):
+        async def refresh():
+            refresh_ahead.track(pytest.KEY, refresh, 10)
+
+        refresh_ahead.track(pytest.KEY, refresh, 0.01)
+        refresh_ahead.hit(pytest.KEY)
+
+        await asyncio.sleep(0.02)
+        assert pytest.KEY in refresh_ahead
+
+    @pytest.mark.asyncio
+    async def test_refresh_error_lapses(self, refresh_ahead, mocker):
+        logger = mocker.patch("aiocache.refresh.logger")
+        refresh_ahead.track(pytest.KEY, asynctest.CoroutineMock(side_effect=OSError), 0.01)
+        refresh_ahead.hit(pytest.KEY)
+
+        await asyncio.sleep(0.02)
+        assert logger.exception.call_count == 1
+        assert pytest.KEY not in refresh_ahead
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency(self, refresh_ahead):
+        running = []
+        release = asyncio.Event()
+
+        async def refresh():
+            running.append(1)
+            await release.wait()
+
+        for key in [pytest.KEY, pytest.KEY_1]:
+            refresh_ahead.track(key, refresh, 0.01)
+            refresh_ahead.hit(key)
+
+        await asyncio.sleep(0.02)
+        assert len(running) == 1
+        release.set()
+        await asyncio.sleep(0.01)
+        assert len(running) == 2
+
+    @pytest.mark.asyncio
+    async def test_close(self, refresh_ahead):
+        refresh_ahead.track(pytest.KEY, asynctest.CoroutineMock(), 0.01)
+        await refresh_ahead.close()
+        assert pytest.KEY not in refresh_ahead
+
+    @pytest.mark.asyncio
+    async def test_forget(self, refresh_ahead):
+        refresh = asynctest.CoroutineMock()
+        refresh_ahead.track(pytest.KEY, refresh, 0.01)
+        refresh_ahead.hit(pytest.KEY)
+        refresh_ahead.forget(pytest.KEY)
+
+        await asyncio.sleep(0.02)
+        assert refresh.call_count == 0
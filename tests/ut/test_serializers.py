@@ -1,12 +1,21 @@
+import sys
+import uuid
+import pickle
+import numpy
 import pytest
+import decimal
+import datetime
 try:
     import ujson as json
 except ImportError:
     import json
 
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
-from aiocache.serializers import StringSerializer, PickleSerializer, JsonSerializer
+from aiocache.serializers import (
+    StringSerializer, NullSerializer, PickleSerializer, JsonSerializer, MsgPackSerializer,
+    CompressionSerializer, ZDictSerializer, NumpySerializer, VersionedSerializer)
 
 
 Dummy = namedtuple("Dummy", "a, b")
@@ -22,6 +31,55 @@ class TestStringSerializer:
     def test_loads(self):
         assert StringSerializer().loads("hi") == "hi"
 
+    def test_offload_options(self):
+        executor = object()
+        serializer = StringSerializer(offload_threshold=10, executor=executor)
+        assert serializer.offload_threshold == 10
+        assert serializer.executor is executor
+
+    def test_offload_disabled(self):
+        assert StringSerializer().offload_threshold is None
+
+    @pytest.mark.parametrize("serializer_class", [
+        StringSerializer, CompressionSerializer, ZDictSerializer, VersionedSerializer])
+    def test_pickle_without_executor(self, serializer_class):
+        kwargs = {"formats": {1: "aiocache.serializers.JsonSerializer"}} if (
+            serializer_class is VersionedSerializer) else {}
+        serializer = serializer_class(
+            offload_threshold=10, executor=ThreadPoolExecutor(1), **kwargs)
+
+        copy = pickle.loads(pickle.dumps(serializer))
+        assert copy.executor is None
+        assert copy.offload_threshold == 10
+        assert serializer.executor is not None
+
+    def test_process_pool(self):
+        with ProcessPoolExecutor(1) as executor:
+            serializer = CompressionSerializer(min_size=0, executor=executor)
+            dumped = executor.submit(serializer.dumps, {"key": "value"}).result()
+            assert executor.submit(serializer.loads, dumped).result() == {"key": "value"}
+
+    @pytest.mark.parametrize("obj, size", [
+        ("hi", 2), (b"hi", 2), (Dummy(1, 2), sys.getsizeof(Dummy(1, 2)) + 2 * sys.getsizeof(1))])
+    def test_sizeof(self, obj, size):
+        assert StringSerializer().sizeof(obj) == size
+
+    def test_sizeof_dict(self):
+        obj = {"key": "value" * 100}
+        assert StringSerializer().sizeof(obj) > 500
+
+
+class TestNullSerializer:
+
+    @pytest.mark.parametrize("obj", [
+        1, 2.0, "hi", True, ["1", 1], {"key": "value"}, Dummy(1, 2)])
+    def test_set_types(self, obj):
+        assert NullSerializer().dumps(obj) is obj
+
+    def test_loads(self):
+        obj = Dummy(1, 2)
+        assert NullSerializer().loads(obj) is obj
+
 
 class TestPickleSerializer:
 
@@ -74,3 +132,303 @@ class TestJsonSerializer:
         obj = {"hi": 1}
         serializer = JsonSerializer()
         assert serializer.loads(serializer.dumps(obj)) == obj
+
+    def test_loads_many(self):
+        assert JsonSerializer().loads_many(['{"hi": 1}', "null", "[1]"]) == [{"hi": 1}, None, [1]]
+
+    def test_loads_many_empty(self):
+        assert JsonSerializer().loads_many([]) == []
+
+    def test_loads_many_falls_back_to_loads(self):
+        with pytest.raises(ValueError):
+            JsonSerializer().loads_many(["1, 2", "3"])
+
+
+class TestMsgPackSerializer:
+
+    @pytest.mark.parametrize("obj", [
+        1, 2.0, "hi", True, None, b"bytes", ["1", 1], {"key": "value"}])
+    def test_set_types(self, obj):
+        serializer = MsgPackSerializer()
+        assert serializer.loads(serializer.dumps(obj)) == obj
+
+    def test_encoding(self):
+        assert MsgPackSerializer.encoding is None
+
+    def test_non_str_keys(self):
+        serializer = MsgPackSerializer()
+        value = {1: "a", 2.5: "b", -3: {4: "c"}}
+
+        assert serializer.loads(serializer.dumps(value)) == value
+        assert serializer.loads_many(serializer.dumps_many([value, value])) == [value, value]
+
+    def test_dumps(self):
+        assert MsgPackSerializer().dumps({"hi": 1}) == b"\x81\xa2hi\x01"
+
+    def test_loads_with_none(self):
+        assert MsgPackSerializer().loads(None) is None
+
+    @pytest.mark.parametrize("obj", [
+        datetime.datetime(2017, 6, 1, 10, 30, 15, 123),
+        datetime.datetime(2017, 6, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=-3))),
+        datetime.date(2017, 6, 1),
+        decimal.Decimal("1.10"),
+        uuid.UUID("12345678123456781234567812345678")])
+    def test_ext_types(self, obj):
+        serializer = MsgPackSerializer()
+        loaded = serializer.loads(serializer.dumps({"value": obj}))["value"]
+        assert loaded == obj
+        assert type(loaded) is type(obj)
+
+    def test_unsupported_type(self):
+        with pytest.raises(TypeError):
+            MsgPackSerializer().dumps(Dummy)
+
+    def test_dumps_many(self):
+        serializer = MsgPackSerializer()
+        values = [1, "hi", {"key": decimal.Decimal("1.1")}]
+        assert serializer.dumps_many(values) == [serializer.dumps(value) for value in values]
+
+    def test_loads_many(self):
+        serializer = MsgPackSerializer()
+        values = [1, None, "hi", {"key": datetime.date(2017, 6, 1)}]
+        assert serializer.loads_many(serializer.dumps_many(values)) == values
+
+    def test_no_msgpack(self, mocker):
+        mocker.patch("aiocache.serializers.msgpack", None)
+        with pytest.raises(RuntimeError):
+            MsgPackSerializer()
+
+
+class TestCompressionSerializer:
+
+    def test_default_serializer(self):
+        assert isinstance(CompressionSerializer().serializer, PickleSerializer)
+
+    def test_serializer_from_config(self):
+        serializer = CompressionSerializer(
+            serializer={"class": "aiocache.serializers.JsonSerializer"})
+        assert isinstance(serializer.serializer, JsonSerializer)
+
+    def test_unknown_codec(self):
+        with pytest.raises(ValueError):
+            CompressionSerializer(codec="zstd")
+
+    def test_small_not_compressed(self):
+        serializer = CompressionSerializer(JsonSerializer())
+        assert serializer.dumps({"hi": 1}) == b'\x00' + json.dumps({"hi": 1}).encode()
+
+    @pytest.mark.parametrize("codec", ["zlib", "lzma", "bz2"])
+    def test_dumps_and_loads(self, codec):
+        obj = {"key": "value" * 1000}
+        serializer = CompressionSerializer(JsonSerializer(), codec=codec)
+        dumped = serializer.dumps(obj)
+
+        assert dumped[:1] == CompressionSerializer.CODECS[codec]
+        assert len(dumped) < len(json.dumps(obj))
+        assert serializer.loads(dumped) == obj
+
+    def test_loads_other_codec(self):
+        obj = "value" * 1000
+        dumped = CompressionSerializer(codec="bz2").dumps(obj)
+        assert CompressionSerializer(codec="zlib").loads(dumped) == obj
+
+    def test_loads_with_none(self):
+        assert CompressionSerializer().loads(None) is None
+
+    def test_loads_unknown_marker(self):
+        with pytest.raises(ValueError):
+            CompressionSerializer().loads(b"?value")
+
+
+class TestZDictSerializer:
+
+    @pytest.fixture
+    def values(self):
+        return [{"id": i, "name": "name{}".format(i), "active": True} for i in range(100)]
+
+    @pytest.fixture
+    def dictionary(self, values):
+        return ZDictSerializer.train(values, serializer=JsonSerializer())
+
+    def test_train(self, dictionary, values):
+        assert json.dumps(values[0]).encode() in dictionary
+
+    def test_train_size(self, values):
+        assert len(ZDictSerializer.train(values, size=100, serializer=JsonSerializer())) <= 100
+
+    def test_default_version(self, dictionary):
+        serializer = ZDictSerializer(dictionaries={1: b"a", 2: dictionary})
+        assert serializer.version == 2
+
+    def test_missing_version(self, dictionary):
+        with pytest.raises(ValueError):
+            ZDictSerializer(dictionaries={1: dictionary}, version=2)
+
+    def test_wrong_version(self, dictionary):
+        with pytest.raises(ValueError):
+            ZDictSerializer(dictionaries={256: dictionary})
+
+    def test_dictionary_from_file(self, dictionary, tmpdir):
+        path = str(tmpdir.join("cache.zdict"))
+        ZDictSerializer.save(dictionary, path)
+        assert ZDictSerializer(dictionaries={1: path}).dictionaries == {1: dictionary}
+
+    def test_dumps_and_loads(self, dictionary):
+        obj = {"id": 1000, "name": "other", "active": False}
+        serializer = ZDictSerializer(JsonSerializer(), dictionaries={7: dictionary})
+        dumped = serializer.dumps(obj)
+
+        assert dumped[:2] == b"d\x07"
+        assert len(dumped) < len(CompressionSerializer(JsonSerializer(), min_size=0).dumps(obj))
+        assert serializer.loads(dumped) == obj
+
+    def test_loads_old_version(self, dictionary):
+        old = ZDictSerializer(dictionaries={1: dictionary})
+        new = ZDictSerializer(dictionaries={1: dictionary, 2: b"other"})
+        assert new.loads(old.dumps("value")) == "value"
+
+    def test_loads_unknown_version(self, dictionary):
+        dumped = ZDictSerializer(dictionaries={1: dictionary}).dumps("value")
+        with pytest.raises(ValueError):
+            ZDictSerializer(dictionaries={2: dictionary}).loads(dumped)
+
+    def test_loads_compressed(self):
+        dumped = CompressionSerializer(min_size=0).dumps("value")
+        assert ZDictSerializer().loads(dumped) == "value"
+
+    def test_no_dictionaries(self):
+        serializer = ZDictSerializer()
+        assert serializer.loads(serializer.dumps("value")) == "value"
+
+
+class TestNumpySerializer:
+
+    @pytest.fixture
+    def array(self):
+        return numpy.arange(12, dtype="float32").reshape(3, 4)
+
+    def test_encoding(self):
+        assert NumpySerializer.encoding is None
+
+    def test_loads_with_none(self):
+        assert NumpySerializer().loads(None) is None
+
+    def test_loads_wrong_value(self):
+        with pytest.raises(ValueError):
+            NumpySerializer().loads(PickleSerializer().dumps("value") + b"\x00" * 8)
+
+    @pytest.mark.parametrize("obj", [
+        numpy.arange(10),
+        numpy.array(3.5),
+        numpy.array([], dtype="int8"),
+        numpy.array(["2017-06-01"], dtype="datetime64[D]"),
+        numpy.arange(4, dtype=">i4"),
+        numpy.array([1, "a"], dtype=object)])
+    def test_dumps_and_loads(self, obj):
+        serializer = NumpySerializer()
+        loaded = serializer.loads(serializer.dumps(obj))
+        assert loaded.dtype == obj.dtype
+        assert numpy.array_equal(loaded, obj)
+
+    def test_loads_is_view(self, array):
+        serializer = NumpySerializer()
+        dumped = serializer.dumps(array)
+        loaded = serializer.loads(dumped)
+
+        assert loaded.base is not None
+        assert not loaded.flags.writeable
+
+    def test_small_overhead(self):
+        array = numpy.zeros(10000)
+        assert len(NumpySerializer().dumps(array)) - array.nbytes <= 256
+
+    def test_fortran_order(self, array):
+        serializer = NumpySerializer()
+        loaded = serializer.loads(serializer.dumps(numpy.asfortranarray(array)))
+        assert loaded.flags.f_contiguous
+        assert numpy.array_equal(loaded, array)
+
+    def test_not_contiguous(self, array):
+        serializer = NumpySerializer()
+        assert numpy.array_equal(serializer.loads(serializer.dumps(array[:, ::2])), array[:, ::2])
+
+    def test_containers(self, array):
+        serializer = NumpySerializer()
+        obj = {"a": array, "b": [array * 2, (array, "text")], "c": 1}
+        loaded = serializer.loads(serializer.dumps(obj))
+
+        assert numpy.array_equal(loaded["a"], array)
+        assert numpy.array_equal(loaded["b"][0], array * 2)
+        assert isinstance(loaded["b"][1], tuple)
+        assert numpy.array_equal(loaded["b"][1][0], array)
+        assert loaded["b"][1][1] == "text"
+        assert loaded["c"] == 1
+
+    def test_no_numpy(self, mocker):
+        mocker.patch("aiocache.serializers.numpy", None)
+        with pytest.raises(RuntimeError):
+            NumpySerializer()
+
+
+class TestVersionedSerializer:
+
+    @pytest.fixture
+    def serializer(self):
+        return VersionedSerializer({1: PickleSerializer(), 2: JsonSerializer()})
+
+    def test_no_formats(self):
+        with pytest.raises(ValueError):
+            VersionedSerializer()
+
+    def test_wrong_format_id(self):
+        with pytest.raises(ValueError):
+            VersionedSerializer({256: PickleSerializer()})
+
+    def test_unknown_write(self):
+        with pytest.raises(ValueError):
+            VersionedSerializer({1: PickleSerializer()}, write=2)
+
+    def test_default_write(self, serializer):
+        assert serializer.write == 2
+
+    def test_formats_from_config(self):
+        serializer = VersionedSerializer(
+            {"1": {"class": "aiocache.serializers.JsonSerializer"}},
+            legacy={"class": "aiocache.serializers.PickleSerializer"})
+        assert isinstance(serializer.formats[1], JsonSerializer)
+        assert isinstance(serializer.legacy, PickleSerializer)
+
+    def test_dumps(self, serializer):
+        assert serializer.dumps({"hi": 1}) == b"\x00av\x01\x02" + json.dumps({"hi": 1}).encode()
+
+    def test_dumps_and_loads(self, serializer):
+        assert serializer.loads(serializer.dumps({"hi": 1})) == {"hi": 1}
+
+    def test_loads_other_format(self, serializer):
+        old = VersionedSerializer({1: PickleSerializer()})
+        assert serializer.loads(old.dumps(Dummy(1, 2))) == Dummy(1, 2)
+
+    def test_loads_unknown_format(self, serializer):
+        with pytest.raises(ValueError):
+            serializer.loads(VersionedSerializer({3: PickleSerializer()}).dumps("value"))
+
+    def test_loads_unknown_version(self, serializer):
+        with pytest.raises(ValueError):
+            serializer.loads(b"\x00av\x02\x01value")
+
+    def test_loads_legacy(self):
+        serializer = VersionedSerializer({2: JsonSerializer()}, legacy=PickleSerializer())
+        assert serializer.loads(PickleSerializer().dumps("value")) == "value"
+
+    def test_loads_legacy_str(self):
+        serializer = VersionedSerializer({2: JsonSerializer()}, legacy=StringSerializer())
+        assert serializer.loads(b"value") == "value"
+        assert serializer.loads("value") == "value"
+
+    def test_loads_no_legacy(self, serializer):
+        with pytest.raises(ValueError):
+            serializer.loads(PickleSerializer().dumps("value"))
+
+    def test_loads_with_none(self, serializer):
+        assert serializer.loads(None) is None
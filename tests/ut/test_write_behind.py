@@ -0,0 +1,135 @@
+import asyncio
+import pytest
+import asynctest
+
+from unittest.mock import MagicMock
+
+from aiocache._write_behind import _WriteBuffer
+
+
+@pytest.fixture
+def cache():
+    cache = MagicMock(timeout=1)
+    cache._pipeline = asynctest.CoroutineMock(return_value=[])
+    return cache
+
+
+@pytest.fixture
+def buffer(cache):
+    return _WriteBuffer(cache, 10, 3)
+
+
+class TestWriteBuffer:
+
+    @pytest.mark.asyncio
+    async def test_coalesces_sets(self, buffer):
+        await buffer.set(pytest.KEY, "a", None)
+        await buffer.set(pytest.KEY, "b", 10)
+
+        assert len(buffer) == 1
+        assert buffer._ops(buffer._writes) == [("multi_set", ([(pytest.KEY, "b")], [10]))]
+
+    @pytest.mark.asyncio
+    async def test_sums_increments(self, buffer):
+        await buffer.increment(pytest.KEY, 1)
+        await buffer.increment(pytest.KEY, 2)
+
+        assert buffer._ops(buffer._writes) == [("increment", (pytest.KEY, 3))]
+
+    @pytest.mark.asyncio
+    async def test_increment_after_delete(self, buffer):
+        await buffer.set(pytest.KEY, "a", None)
+        await buffer.delete(pytest.KEY)
+        await buffer.increment(pytest.KEY, 2)
+
+        assert buffer._ops(buffer._writes) == [
+            ("delete", (pytest.KEY,)), ("increment", (pytest.KEY, 2))]
+
+    @pytest.mark.asyncio
+    async def test_set_after_increment(self, buffer):
+        await buffer.increment(pytest.KEY, 2)
+        await buffer.set(pytest.KEY, "a", None)
+
+        assert buffer._ops(buffer._writes) == [("multi_set", ([(pytest.KEY, "a")], None))]
+
+    @pytest.mark.asyncio
+    async def test_flush(self, buffer, cache):
+        await buffer.set(pytest.KEY, "a", None)
+        await buffer.flush()
+
+        cache._pipeline.assert_called_with([("multi_set", ([(pytest.KEY, "a")], None))])
+        assert len(buffer) == 0
+        assert pytest.KEY not in buffer
+
+    @pytest.mark.asyncio
+    async def test_flush_empty(self, buffer, cache):
+        await buffer.flush()
+        assert cache._pipeline.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_flush_error_logged(self, buffer, cache, mocker):
+        logger = mocker.patch("aiocache._write_behind.logger")
+        cache._pipeline.side_effect = OSError()
+        await buffer.set(pytest.KEY, "a", None)
+
+        await buffer.flush()
+        assert logger.exception.call_count == 1
+        assert len(buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_interval(self, cache):
+        buffer = _WriteBuffer(cache, 0.001, 3)
+        await buffer.set(pytest.KEY, "a", None)
+        await asyncio.sleep(0.01)
+
+        assert cache._pipeline.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_full_flushes_on_new_key(self, buffer, cache):
+        for key in ["a", "b", "c", "c"]:
+            await buffer.set(key, "value", None)
+        assert cache._pipeline.call_count == 0
+
+        await buffer.set("d", "value", None)
+        assert cache._pipeline.call_count == 1
+        assert len(buffer) == 1
+
+    @pytest.mark.asyncio
+    async def test_full_keeps_concurrent_writes(self, cache):
+        flushed = []
+
+        async def pipeline(ops):
+            await asyncio.sleep(0.01)
+            flushed.extend(ops)
+            return []
+        cache._pipeline.side_effect = pipeline
+        buffer = _WriteBuffer(cache, 10, 2)
+        await buffer.set("a", "value", None)
+        await buffer.set("b", "value", None)
+
+        await asyncio.gather(*[buffer.increment("x", 1) for _ in range(3)])
+        await asyncio.gather(buffer.set("y", "1", None), buffer.set("y", "2", None))
+        await buffer.close()
+
+        assert sum(args[1] for cmd, args in flushed if cmd == "increment") == 3
+        assert [args for cmd, args in flushed if cmd == "multi_set"][-1] == (
+            [("y", "2")], None)
+
+    @pytest.mark.asyncio
+    async def test_in_flight_keys_are_contained(self, buffer, cache):
+        async def pipeline(ops):
+            assert pytest.KEY in buffer
+            return []
+        cache._pipeline.side_effect = pipeline
+        await buffer.set(pytest.KEY, "a", None)
+
+        await buffer.flush()
+        assert pytest.KEY not in buffer
+
+    @pytest.mark.asyncio
+    async def test_close_drains(self, buffer, cache):
+        await buffer.set(pytest.KEY, "a", None)
+        await buffer.close()
+
+        assert cache._pipeline.call_count == 1
+        assert buffer._flusher is None